@@ -0,0 +1,81 @@
+"""
+Result cache on a campaign-sized workload: a previous campaign is cached,
+a new one with a given overlap is checked against it and the fresh results
+are stored.
+
+Run from the repository root:
+    python -m benchmarks.cache_bench
+"""
+from time import perf_counter
+
+import os
+import random
+import tempfile
+
+from bulkemailverifier import Record, ResultCache
+
+
+def _record(email: str) -> Record:
+    record = Record(None)
+    record.email_address = email
+    record.format_check = True
+    record.smtp_check = True
+    record.dns_check = True
+    record.free_check = False
+    record.disposable_check = False
+    record.mx_records = ('mx1.example.com', 'mx2.example.com')
+    record.result = 'ok'
+    return record
+
+
+def run(count: int = 1000000, overlap: float = 0.3) -> dict:
+    previous = ['user{}@example.com'.format(i) for i in range(count)]
+    repeated = random.Random(0).sample(previous, int(count * overlap))
+    campaign = repeated + ['new{}@example.org'.format(i)
+                           for i in range(count - len(repeated))]
+    random.Random(1).shuffle(campaign)
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'cache.sqlite')
+    try:
+        with ResultCache(path) as cache:
+            started = perf_counter()
+            cache.put_many(_record(e) for e in previous)
+            fill_time = perf_counter() - started
+
+            started = perf_counter()
+            misses = list(cache.iter_misses(campaign))
+            lookup_time = perf_counter() - started
+
+            started = perf_counter()
+            cache.put_many(_record(e) for e in misses)
+            store_time = perf_counter() - started
+
+            started = perf_counter()
+            found = cache.lookup(ResultCache.key(e) for e in campaign)
+            merge_time = perf_counter() - started
+
+            hit_ratio = cache.hits / (cache.hits + cache.misses)
+            size = os.path.getsize(path)
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    return {
+        'addresses': count,
+        'overlap': overlap,
+        'hit_ratio': hit_ratio,
+        'submitted': len(misses),
+        'merged': len(found),
+        'fill_us_per_record': fill_time / count * 1e6,
+        'lookup_us_per_address': lookup_time / count * 1e6,
+        'store_us_per_record': store_time / max(len(misses), 1) * 1e6,
+        'merge_us_per_address': merge_time / count * 1e6,
+        'database_bytes_per_record': size / (count + len(misses)),
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
@@ -0,0 +1,145 @@
+"""
+Model construction from parsed JSON: the inlined decoders compared to
+the previous per-field helper calls, and lazy records reading only the
+address and the result.
+
+Run from the repository root:
+    python -m benchmarks.decode_bench
+"""
+from time import perf_counter
+
+import gc
+
+from bulkemailverifier import BulkRequest, LazyRecord, Record, \
+    ResponseRequests
+from bulkemailverifier.models.base import BaseModel
+from bulkemailverifier.models.response import _bool_value, _int_value, \
+    _string_value, _timestamp2datetime, _tuple_value
+
+from benchmarks.models_bench import sample
+
+
+class _HelperRecord(Record):
+    __slots__ = ()
+
+    def __init__(self, values):
+        BaseModel.__init__(self)
+        self.email_address = _string_value(values, 'emailAddress')
+        self.format_check = _bool_value(values, 'formatCheck')
+        self.smtp_check = _bool_value(values, 'smtpCheck')
+        self.dns_check = _bool_value(values, 'dnsCheck')
+        self.free_check = _bool_value(values, 'freeCheck')
+        self.disposable_check = _bool_value(values, 'disposableCheck')
+        self.catch_all_check = _bool_value(values, 'catchAllCheck')
+        self.mx_records = _tuple_value(values, 'mxRecords')
+        self.result = _string_value(values, 'result')
+        self.error = _string_value(values, 'error')
+
+
+class _HelperBulkRequest(BulkRequest):
+    __slots__ = ()
+
+    def __init__(self, values):
+        BaseModel.__init__(self)
+        self.id = _int_value(values, 'id')
+        self.date_start = None
+        if 'date_start' in values:
+            self.date_start = _timestamp2datetime(
+                _int_value(values, 'date_start'))
+        self.total_emails = _int_value(values, 'total_emails')
+        self.invalid_emails = _int_value(values, 'invalid_emails')
+        self.processed_emails = _int_value(values, 'processed_emails')
+        self.failed_emails = _int_value(values, 'failed_emails')
+        self.ready = _bool_value(values, 'ready')
+
+
+class _HelperResponseRequests(ResponseRequests):
+
+    def __init__(self, values):
+        BaseModel.__init__(self)
+        # Stands in for the previous globals()[classname] lookup
+        classes = {'BulkRequest': _HelperBulkRequest}
+
+        response = values['response']
+        self.current_page = _int_value(response, 'current_page')
+        self.from_requests = _int_value(response, 'from')
+        self.last_page = _int_value(response, 'last_page')
+        self.per_page = _int_value(response, 'per_page')
+        self.to_requests = _int_value(response, 'to')
+        self.total = _int_value(response, 'total')
+        self.data = [classes['BulkRequest'](x) for x in response['data']]
+
+
+def _requests_sample(count: int) -> dict:
+    return {'response': {
+        'current_page': 1,
+        'last_page': 1,
+        'per_page': count,
+        'total': count,
+        'data': [
+            {
+                'id': i,
+                'date_start': 1642412278 + i,
+                'total_emails': 100,
+                'invalid_emails': 1,
+                'processed_emails': 50,
+                'failed_emails': 0,
+                'ready': 0
+            } for i in range(1, count + 1)
+        ]
+    }}
+
+
+def _read_two(record_class):
+    def create(values):
+        record = record_class(values)
+        return record.email_address, record.result
+    return create
+
+
+def _time(function, items, repeat: int = 5) -> float:
+    """Best time per item, with the garbage collector off like timeit"""
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = perf_counter()
+            for item in items:
+                function(item)
+            elapsed = perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best / len(items)
+
+
+def run(count: int = 100000) -> dict:
+    records = sample(count)
+    requests = _requests_sample(50)
+    pages = [requests] * max(count // 50, 1)
+
+    helper_record = _time(_HelperRecord, records)
+    fast_record = _time(Record, records)
+    eager_read = _time(_read_two(Record), records)
+    lazy_read = _time(_read_two(LazyRecord), records)
+    lazy_record = _time(LazyRecord, records)
+    helper_requests = _time(_HelperResponseRequests, pages)
+    fast_requests = _time(ResponseRequests, pages)
+
+    return {
+        'records': count,
+        'helper_us_per_record': helper_record * 1e6,
+        'inlined_us_per_record': fast_record * 1e6,
+        'record_speedup': helper_record / fast_record,
+        'lazy_us_per_record': lazy_record * 1e6,
+        'eager_us_per_2_fields_read': eager_read * 1e6,
+        'lazy_us_per_2_fields_read': lazy_read * 1e6,
+        'helper_us_per_page': helper_requests * 1e6,
+        'inlined_us_per_page': fast_requests * 1e6,
+        'requests_speedup': helper_requests / fast_requests,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
@@ -0,0 +1,74 @@
+"""
+Arrow and Parquet export: columnar batches built from attribute tuples
+compared with converting the records row by row.
+
+Requires pyarrow. Run from the repository root:
+    python -m benchmarks.export_bench
+"""
+from time import perf_counter
+
+import os
+import tempfile
+
+import pyarrow
+
+from bulkemailverifier import Record, iter_record_batches, record_schema, \
+    write_parquet
+
+
+def _record(i: int) -> Record:
+    return Record({
+        'emailAddress': 'user{}@example.com'.format(i),
+        'formatCheck': 'true',
+        'smtpCheck': ['true', 'false', 'null'][i % 3],
+        'dnsCheck': 'true',
+        'freeCheck': 'false',
+        'disposableCheck': 'false',
+        'catchAllCheck': 'null',
+        'mxRecords': ['mx1.example.com', 'mx2.example.com'],
+        'result': ['ok', 'smtp-failed', 'unknown'][i % 3],
+    })
+
+
+def _row_by_row(records: list) -> pyarrow.Table:
+    rows = [{name: getattr(r, name) for name in Record.__slots__}
+            for r in records]
+    return pyarrow.Table.from_pylist(rows, schema=record_schema())
+
+
+def run(count: int = 1000000) -> dict:
+    records = [_record(i) for i in range(count)]
+
+    started = perf_counter()
+    _row_by_row(records)
+    row_time = perf_counter() - started
+
+    started = perf_counter()
+    for _ in iter_record_batches(records):
+        pass
+    batch_time = perf_counter() - started
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'result.parquet')
+    try:
+        started = perf_counter()
+        write_parquet(records, path)
+        write_time = perf_counter() - started
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+        os.rmdir(directory)
+
+    return {
+        'records': count,
+        'row_by_row_us_per_record': row_time / count * 1e6,
+        'batches_us_per_record': batch_time / count * 1e6,
+        'batch_speedup': row_time / batch_time,
+        'parquet_us_per_record': write_time / count * 1e6,
+        'parquet_bytes_per_record': size / count,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
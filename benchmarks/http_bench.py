@@ -0,0 +1,52 @@
+"""
+Sequential API call latency: one-shot connections vs the pooled requester.
+
+Run from the repository root:
+    python -m benchmarks.http_bench
+"""
+from time import perf_counter
+
+import requests
+
+from bulkemailverifier import ApiRequester
+
+from tests.stub import StubApiServer
+
+
+def _one_shot(base_url: str, calls: int) -> float:
+    started = perf_counter()
+    for _ in range(calls):
+        requests.request(
+            'POST',
+            base_url + '/request/status',
+            json={'ids': [1]},
+            headers={'Connection': 'close'},
+            timeout=(10, 30)
+        ).content.decode('UTF-8')
+    return perf_counter() - started
+
+
+def _pooled(base_url: str, calls: int) -> float:
+    started = perf_counter()
+    with ApiRequester(base_url=base_url) as requester:
+        for _ in range(calls):
+            requester.post('/request/status', {'ids': [1]})
+    return perf_counter() - started
+
+
+def run(calls: int = 500) -> dict:
+    with StubApiServer() as server:
+        one_shot = _one_shot(server.base_url, calls)
+        pooled = _pooled(server.base_url, calls)
+
+    return {
+        'calls': calls,
+        'one_shot_ms_per_call': one_shot / calls * 1000,
+        'pooled_ms_per_call': pooled / calls * 1000,
+        'speedup': one_shot / pooled,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<24}{:.3f}'.format(key, value))
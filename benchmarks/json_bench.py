@@ -0,0 +1,63 @@
+"""
+Parse time and peak memory of a large get_records response: the previous
+decode-then-parse path compared to every installed JSON backend parsing
+the raw bytes.
+
+Run from the repository root:
+    python -m benchmarks.json_bench
+"""
+from json import dumps, loads
+from time import perf_counter
+
+import gc
+import tracemalloc
+
+from bulkemailverifier import json_backend
+
+from benchmarks.models_bench import sample
+
+
+def _legacy(content: bytes):
+    return loads(str(content.decode('UTF-8')))
+
+
+def _measure(parse, content: bytes) -> tuple:
+    gc.collect()
+    started = perf_counter()
+    parse(content)
+    elapsed = perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    result = parse(content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+
+    return elapsed, peak
+
+
+def run(count: int = 200000) -> dict:
+    content = dumps({'response': sample(count)}).encode('UTF-8')
+    default = json_backend.get_backend()
+
+    results = {'records': count, 'payload_mb': len(content) / 2 ** 20}
+    elapsed, peak = _measure(_legacy, content)
+    results['legacy_ms'] = elapsed * 1000
+    results['legacy_peak_mb'] = peak / 2 ** 20
+
+    try:
+        for name in json_backend.available_backends():
+            json_backend.set_backend(name)
+            elapsed, peak = _measure(json_backend.loads, content)
+            results[name + '_ms'] = elapsed * 1000
+            results[name + '_peak_mb'] = peak / 2 ** 20
+    finally:
+        json_backend.set_backend(default)
+
+    return results
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
@@ -0,0 +1,84 @@
+"""
+Memory and construction time of the slotted models compared to the
+previous __dict__ based Record.
+
+Run from the repository root:
+    python -m benchmarks.models_bench
+"""
+from time import perf_counter
+
+import copy
+import gc
+import tracemalloc
+
+from bulkemailverifier import Record
+from bulkemailverifier.models.response import _bool_value, _string_value
+
+
+class _LegacyRecord:
+    """Record as it was implemented before __slots__"""
+
+    def __init__(self, values):
+        self.email_address = _string_value(values, 'emailAddress')
+        self.format_check = _bool_value(values, 'formatCheck')
+        self.smtp_check = _bool_value(values, 'smtpCheck')
+        self.dns_check = _bool_value(values, 'dnsCheck')
+        self.free_check = _bool_value(values, 'freeCheck')
+        self.disposable_check = _bool_value(values, 'disposableCheck')
+        self.catch_all_check = _bool_value(values, 'catchAllCheck')
+        self.mx_records = copy.deepcopy(values['mxRecords'])
+        self.result = _string_value(values, 'result')
+        self.error = _string_value(values, 'error')
+
+
+def sample(count: int) -> list:
+    return [
+        {
+            'emailAddress': 'user{}@example.com'.format(i),
+            'formatCheck': 'true',
+            'smtpCheck': 'false',
+            'dnsCheck': 'true',
+            'freeCheck': 'false',
+            'disposableCheck': 'false',
+            'catchAllCheck': 'null',
+            'mxRecords': ['mx1.example.com', 'mx2.example.com'],
+            'result': 'smtp-failed'
+        } for i in range(count)
+    ]
+
+
+def _measure(cls, values: list) -> tuple:
+    gc.collect()
+    started = perf_counter()
+    objects = [cls(v) for v in values]
+    elapsed = perf_counter() - started
+
+    del objects
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls(v) for v in values]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+
+    return elapsed, size
+
+
+def run(count: int = 100000) -> dict:
+    values = sample(count)
+
+    legacy_time, legacy_size = _measure(_LegacyRecord, values)
+    slotted_time, slotted_size = _measure(Record, values)
+
+    return {
+        'records': count,
+        'legacy_us_per_record': legacy_time / count * 1e6,
+        'slotted_us_per_record': slotted_time / count * 1e6,
+        'legacy_bytes_per_record': legacy_size / count,
+        'slotted_bytes_per_record': slotted_size / count,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
@@ -0,0 +1,49 @@
+"""
+Cost of instrumentation per API call: no observers, an empty `Observer`
+and the `MetricsRecorder` aggregator, with calls answered in-process by
+`FakeApi` so that only the client overhead is measured.
+
+Run from the repository root:
+    python -m benchmarks.observer_bench
+"""
+from time import perf_counter
+
+from bulkemailverifier import Client, FakeApi, FakeTransport, \
+    MetricsRecorder, Observer
+
+_API_KEY = 'at_00000000000000000000000000000'
+
+
+def _time(observers: list, calls: int) -> float:
+    api = FakeApi()
+    client = Client(_API_KEY, transport=FakeTransport(api),
+                    observers=observers)
+    request_id = client.create_request(emails=['user@example.com'])
+
+    best = None
+    for _ in range(3):
+        started = perf_counter()
+        for _ in range(calls):
+            client.get_status(request_ids=[request_id])
+        elapsed = perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / calls
+
+
+def run(calls: int = 20000) -> dict:
+    bare = _time([], calls)
+    empty = _time([Observer()], calls)
+    recorder = _time([MetricsRecorder()], calls)
+
+    return {
+        'calls': calls,
+        'no_observers_us_per_call': bare * 1e6,
+        'empty_observer_us_per_call': empty * 1e6,
+        'recorder_us_per_call': recorder * 1e6,
+        'recorder_overhead_us': (recorder - bare) * 1e6,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
@@ -0,0 +1,85 @@
+"""
+Reading a downloaded results CSV: opening (row indexing), iterating,
+random access and lookups by email with and without the sidecar index.
+
+Run from the repository root:
+    python -m benchmarks.reader_bench
+"""
+from time import perf_counter
+
+import os
+import random
+import tempfile
+
+from bulkemailverifier import RecordFileReader
+
+_HEADER = '"Email Address","Format Check","SMTP Check","DNS Check",' \
+          '"Free Check","Disposable Check","Catch All Check","MX Records",' \
+          '"Result","Error"\n'
+
+
+def _write(path: str, count: int):
+    with open(path, 'w') as f:
+        f.write(_HEADER)
+        for i in range(count):
+            f.write('"user{}@example.com","true","true","true","false",'
+                    '"false","null","mx1.example.com,mx2.example.com",'
+                    '"ok",""\n'.format(i))
+
+
+def run(count: int = 1000000, lookups: int = 10000) -> dict:
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'result.csv')
+    index = path + '.idx'
+    try:
+        _write(path, count)
+        emails = ['user{}@example.com'.format(i)
+                  for i in random.Random(0).sample(range(count), lookups)]
+
+        started = perf_counter()
+        with RecordFileReader(path) as reader:
+            open_time = perf_counter() - started
+
+            started = perf_counter()
+            for _ in reader:
+                pass
+            iterate_time = perf_counter() - started
+
+            started = perf_counter()
+            for i in random.Random(1).sample(range(count), lookups):
+                reader.record(i)
+            random_time = perf_counter() - started
+
+        started = perf_counter()
+        with RecordFileReader(path, index=index) as reader:
+            build_time = perf_counter() - started
+
+        started = perf_counter()
+        with RecordFileReader(path, index=index) as reader:
+            reopen_time = perf_counter() - started
+
+            started = perf_counter()
+            for email in emails:
+                reader.find(email)
+            find_time = perf_counter() - started
+        index_size = os.path.getsize(index)
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    return {
+        'rows': count,
+        'open_us_per_row': open_time / count * 1e6,
+        'iterate_us_per_row': iterate_time / count * 1e6,
+        'random_access_us': random_time / lookups * 1e6,
+        'index_build_us_per_row': build_time / count * 1e6,
+        'index_reopen_ms': reopen_time * 1e3,
+        'find_us': find_time / lookups * 1e6,
+        'index_bytes_per_row': index_size / count,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
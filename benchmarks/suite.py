@@ -0,0 +1,199 @@
+"""
+Client hot paths end to end against a local stub server: request payload
+building and email validation, response decoding and `ResponseRecords`
+construction at several sizes, download throughput and status polling
+overhead.
+
+Results are printed and optionally written as JSON. With --check every
+metric is compared with its limit in benchmarks/thresholds.json and the
+exit code is 1 when one of them is exceeded. Run from the repository root:
+    python -m benchmarks.suite [--quick] [--output FILE] [--check]
+"""
+from json import dumps, load
+from time import perf_counter
+
+import argparse
+import gc
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+from bulkemailverifier import Client, ResponseRecords
+
+from benchmarks.models_bench import sample
+from tests.stub import StubApiServer
+
+THRESHOLDS = os.path.join(os.path.dirname(__file__), 'thresholds.json')
+
+_API_KEY = 'at_00000000000000000000000000000'
+
+_SIZES = {
+    'emails': (10000, 100000, 1000000),
+    'records': (1000, 10000, 100000),
+    'download_mb': 50,
+    'poll_requests': 10000,
+}
+
+_QUICK_SIZES = {
+    'emails': (10000,),
+    'records': (1000, 10000),
+    'download_mb': 5,
+    'poll_requests': 1000,
+}
+
+_CSV_ROW = '"user{}@example.com","true","true","true","false","false",' \
+           '"false","mx1.example.com,mx2.example.com","ok",""\n'
+
+
+def _time(function, repeat: int = 3) -> float:
+    """Best of `repeat` calls in seconds, with the garbage collector off"""
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = perf_counter()
+            function()
+            elapsed = perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def _csv(size: int) -> bytes:
+    rows = ['"Email Address","Result"\n']
+    length, i = 0, 0
+    while length < size:
+        rows.append(_CSV_ROW.format(i))
+        length += len(rows[-1])
+        i += 1
+    return ''.join(rows).encode('UTF-8')
+
+
+def _emails(client: Client, sizes: tuple) -> dict:
+    results = {}
+    for size in sizes:
+        emails = ['user{}@example.com'.format(i) for i in range(size)]
+        validate = _time(lambda: Client._validate_emails(emails))
+        payload = _time(lambda: client._create_request_args(
+            {'emails': emails}))
+        create = _time(lambda: client.create_request(emails=emails), 1)
+
+        prefix = 'emails_{}.'.format(size)
+        results[prefix + 'validate_ns_per_email'] = validate / size * 1e9
+        results[prefix + 'payload_ns_per_email'] = payload / size * 1e9
+        results[prefix + 'create_request_us_per_email'] = create / size * 1e6
+    return results
+
+
+def _records(sizes: tuple) -> dict:
+    results = {}
+    for size in sizes:
+        content = dumps({'response': sample(size)}).encode('UTF-8')
+        parsed = Client._parse_response(content)
+        decode = _time(lambda: Client._parse_response(content))
+        build = _time(lambda: ResponseRecords(parsed))
+
+        prefix = 'records_{}.'.format(size)
+        results[prefix + 'decode_us_per_record'] = decode / size * 1e6
+        results[prefix + 'construct_us_per_record'] = build / size * 1e6
+    return results
+
+
+def _download(client: Client, server: StubApiServer, size_mb: int) -> dict:
+    content = _csv(size_mb * 2 ** 20)
+    server.routes['/request/completed'] = lambda p, h: (200, content, None)
+
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'result.csv')
+        elapsed = _time(lambda: client.download(
+            filename=filename, request_id=1))
+    finally:
+        shutil.rmtree(directory)
+
+    return {'download.ms_per_mb': elapsed / len(content) * 2 ** 20 * 1000}
+
+
+def _poll(client: Client, count: int) -> dict:
+    request_ids = list(range(1, count + 1))
+    elapsed = _time(lambda: client.wait_for_requests(
+        request_ids=request_ids, batch_size=100).run())
+
+    return {'poll.us_per_request': elapsed / count * 1e6}
+
+
+def run(quick: bool = False) -> dict:
+    """
+    :param quick: Measure only the smaller sizes
+    :return: dict. Metric name to value, lower is better for every metric
+    """
+    sizes = _QUICK_SIZES if quick else _SIZES
+
+    with StubApiServer() as server:
+        with Client(_API_KEY, base_url=server.base_url) as client:
+            results = _emails(client, sizes['emails'])
+            results.update(_records(sizes['records']))
+            results.update(_download(client, server, sizes['download_mb']))
+            results.update(_poll(client, sizes['poll_requests']))
+
+    return results
+
+
+def check(results: dict, thresholds: dict, tolerance: float = 1.0) -> list:
+    """
+    :param results: Metrics returned by `run`
+    :param thresholds: Metric name to max value. Metrics without
+            a threshold are not checked
+    :param tolerance: Multiplier applied to every threshold
+    :return: list. (name, value, limit) of every exceeded threshold
+    """
+    exceeded = []
+    for name, value in sorted(results.items()):
+        if name in thresholds and value > thresholds[name] * tolerance:
+            exceeded.append((name, value, thresholds[name] * tolerance))
+    return exceeded
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='measure only the smaller sizes')
+    parser.add_argument('--output', help='write the results to a JSON file')
+    parser.add_argument('--check', action='store_true',
+                        help='fail when a threshold is exceeded')
+    parser.add_argument('--thresholds', default=THRESHOLDS,
+                        help='JSON file of metric limits')
+    parser.add_argument('--tolerance', type=float, default=1.0,
+                        help='multiplier applied to every threshold')
+    args = parser.parse_args(argv)
+
+    results = run(args.quick)
+    for key, value in results.items():
+        print('{:<48}{:.3f}'.format(key, value))
+
+    exceeded = []
+    if args.check:
+        with open(args.thresholds) as file:
+            exceeded = check(results, load(file), args.tolerance)
+        for name, value, limit in exceeded:
+            print('{} is {:.3f}, the threshold is {:.3f}'.format(
+                name, value, limit), file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(dumps({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'quick': args.quick,
+                'results': results,
+                'exceeded': [name for name, _, _ in exceeded],
+            }, indent=2, sort_keys=True))
+
+    return 1 if exceeded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
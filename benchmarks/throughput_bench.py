@@ -0,0 +1,61 @@
+"""
+End-to-end client throughput against the in-process `FakeApi`: a whole
+`verify` pipeline, batched status checks and the paginated request list,
+with a simulated network latency, processing speed and error rate.
+
+The fake is seeded, so repeated runs send the same calls. Run from the
+repository root:
+    python -m benchmarks.throughput_bench
+"""
+from time import perf_counter
+
+from bulkemailverifier import Client, FakeApi, FakeTransport, RetryPolicy
+
+_API_KEY = 'at_00000000000000000000000000000'
+
+
+def _client(api: FakeApi) -> Client:
+    policy = RetryPolicy(backoff_factor=0.01, max_backoff=0.05,
+                         idempotent_paths=FakeApi.PATHS)
+    return Client(_API_KEY, transport=FakeTransport(api),
+                  retry_policy=policy)
+
+
+def run(emails: int = 200000, latency: tuple = (0.01, 0.03),
+        emails_per_second: int = 100000, error_rate: float = 0.01) -> dict:
+    api = FakeApi(latency=latency, emails_per_second=emails_per_second,
+                  error_rate=error_rate, invalid_rate=0.02, seed=1)
+    client = _client(api)
+
+    started = perf_counter()
+    count = 0
+    for _ in client.verify(
+            emails=('user{}@example.com'.format(i) for i in range(emails)),
+            chunk_size=5000, include_failed=True, min_interval=0.05,
+            max_interval=0.5):
+        count += 1
+    verify_time = perf_counter() - started
+    calls = sum(api.calls.values())
+
+    started = perf_counter()
+    statuses = client.get_status_bulk(
+        request_ids=list(range(1, emails // 5000 + 1)), batch_size=5)
+    status_time = perf_counter() - started
+
+    started = perf_counter()
+    listed = sum(1 for _ in client.iter_requests(per_page=10, only_ids=True))
+    list_time = perf_counter() - started
+    client.close()
+
+    return {
+        'emails': count,
+        'verify_emails_per_s': count / verify_time,
+        'verify_api_calls': calls,
+        'status_requests_per_s': len(statuses) / status_time,
+        'list_requests_per_s': listed / list_time,
+    }
+
+
+if __name__ == '__main__':
+    for key, value in run().items():
+        print('{:<28}{:.3f}'.format(key, value))
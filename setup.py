@@ -70,6 +70,15 @@ setup(
         'requests',
     ],
     extras_require={
+        'async': [
+            'aiohttp',
+        ],
+        'fast': [
+            'orjson',
+        ],
+        'arrow': [
+            'pyarrow',
+        ],
         'dev': [
             'tox',
             'flake8',
@@ -1,16 +1,46 @@
-__all__ = ['ApiAuthError', 'ApiRequester', 'BadRequestError', 'BulkRequest',
-           'BulkEmailVerificationApiError', 'Client', 'EmptyApiKeyError',
-           'ErrorMessage', 'FileError', 'HttpApiError', 'ParameterError',
-           'Record', 'ResponseError', 'ResponseRecords', 'ResponseRequests',
-           'ResponseStatus', 'UnparsableApiResponseError']
+__all__ = ['AiohttpTransport', 'ApiAuthError', 'ApiConnectionError',
+           'ApiRequester', 'AsyncApiRequester', 'AsyncClient',
+           'AsyncFakeTransport', 'AsyncRequestPoller', 'AsyncTransport',
+           'BadRequestError',
+           'BulkEmailVerificationApiError', 'BulkRequest', 'Client',
+           'EmptyApiKeyError', 'ErrorMessage', 'FakeApi', 'FakeTransport',
+           'FileError', 'FileRateLimiter', 'Histogram', 'HttpApiError',
+           'JobJournal', 'LazyRecord', 'MetricsRecorder', 'Observer',
+           'ParameterError', 'PreparedEmails', 'RateLimiter',
+           'Record', 'RecordFileReader', 'RecordTable', 'RequestPoller',
+           'RequestsTransport', 'ResponseError', 'ResponseRecords',
+           'ResponseRequests', 'ResponseStatus', 'ResultCache', 'RetryPolicy',
+           'TokenBucketRateLimiter', 'Transport', 'UnparsableApiResponseError',
+           'VerificationPipeline', 'iter_record_batches', 'iter_unique_emails',
+           'normalize_email', 'prepare_emails', 'record_schema',
+           'write_parquet']
 
+from .cache import ResultCache
 from .client import Client
+from .export import iter_record_batches, record_schema, write_parquet
+from .async_client import AsyncClient
+from .journal import JobJournal
+from .pipeline import VerificationPipeline
+from .poller import AsyncRequestPoller, RequestPoller
+from .preprocess import PreparedEmails, iter_unique_emails, \
+    normalize_email, prepare_emails
+from .reader import RecordFileReader
 
-from .models.response import BulkRequest, Record, ErrorMessage, \
+from .models.response import BulkRequest, LazyRecord, Record, ErrorMessage, \
     ResponseRecords, ResponseRequests, ResponseStatus
+from .models.table import RecordTable
 
 from .net.http import ApiRequester
+from .net.async_http import AsyncApiRequester
+from .net.fake import AsyncFakeTransport, FakeApi, FakeTransport
+from .net.observer import Histogram, MetricsRecorder, Observer
+from .net.ratelimit import FileRateLimiter, RateLimiter, \
+    TokenBucketRateLimiter
+from .net.retry import RetryPolicy
+from .net.transport import AiohttpTransport, AsyncTransport, \
+    RequestsTransport, Transport
 
-from .exceptions.error import ApiAuthError, BadRequestError, \
-    BulkEmailVerificationApiError, EmptyApiKeyError, FileError, HttpApiError,\
-    ParameterError, ResponseError, UnparsableApiResponseError
+from .exceptions.error import ApiAuthError, ApiConnectionError, \
+    BadRequestError, BulkEmailVerificationApiError, EmptyApiKeyError, \
+    FileError, HttpApiError, ParameterError, ResponseError, \
+    UnparsableApiResponseError
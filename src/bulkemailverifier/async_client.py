@@ -0,0 +1,326 @@
+from collections import deque
+
+import asyncio
+
+from .client import Client
+from .exceptions.error import BadRequestError, HttpApiError, ParameterError
+from .models.response import Record, ResponseRecords, ResponseRequests, \
+    ResponseStatus
+from .models.stream import JsonArrayParser
+from .net.async_http import AsyncApiRequester
+from .poller import AsyncRequestPoller
+
+
+class AsyncClient(Client):
+    """
+    asyncio version of `Client`. Every API method is a coroutine, the
+    parameters, validation and returned models are the same.
+
+    Requires the optional `aiohttp` dependency
+    (pip install bulk-email-verifier[async]).
+    A `ResultCache` is local and is queried synchronously.
+    """
+
+    _api_requester: AsyncApiRequester or None
+
+    _requester_class = AsyncApiRequester
+
+    def __enter__(self):
+        raise TypeError('Use "async with" instead')
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Release pooled HTTP connections
+        """
+
+        await self._api_requester.close()
+
+    async def create_request(self, **kwargs) -> int:
+        """
+        Create bulk emails processing request
+        See `Client.create_request`
+        """
+
+        options = self._filter_cached(kwargs)
+        if options is None:
+            return None
+
+        response = await self._api_requester.post_bytes(
+            *self._create_request_args(options, Client._PARSABLE_FORMAT))
+
+        return Client._parse_request_id(response)
+
+    async def create_requests_chunked(self, **kwargs) -> dict:
+        """
+        Split a large email list into several bulk requests and create them
+        concurrently. Only `max_workers` chunks are held in memory at a time
+        See `Client.create_requests_chunked`
+        """
+
+        chunks, max_workers, use_cache = self._prepare_chunks(kwargs)
+        semaphore = asyncio.Semaphore(max_workers)
+        failed = []
+
+        async def create(chunk):
+            try:
+                return await self.create_request(
+                    emails=chunk, use_cache=False)
+            except BaseException:
+                failed.append(True)
+                raise
+            finally:
+                semaphore.release()
+
+        tasks = []
+        try:
+            for chunk in chunks:
+                await semaphore.acquire()
+                if failed:
+                    semaphore.release()
+                    break
+                tasks.append(asyncio.ensure_future(create(chunk)))
+
+            request_ids = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if not tasks and not use_cache:
+            raise ParameterError('Emails required')
+
+        return dict(enumerate(request_ids))
+
+    async def download(self, **kwargs) -> int:
+        """
+        Download processing results CSV and save to file
+        See `Client.download`
+        """
+
+        path, payload = self._get_records_args(
+            kwargs, Client._DOWNLOAD_FORMAT)
+        result_file, chunk_size = Client._prepare_download(kwargs)
+
+        with result_file:
+            async for chunk in self._api_requester.stream(
+                    path, payload, chunk_size=chunk_size):
+                result_file.write(chunk)
+
+        return result_file.bytes_written
+
+    async def get_records(self, **kwargs) -> ResponseRecords:
+        """
+        Get processed email results
+        See `Client.get_records`
+        """
+
+        lazy = Client._validate_lazy(kwargs)
+
+        path, payload = self._get_records_args(
+            kwargs, Client._PARSABLE_FORMAT)
+        response = await self._api_requester.post_bytes(path, payload)
+
+        return self._build_response(path, response, ResponseRecords, lazy)
+
+    async def get_records_merged(self, **kwargs) -> ResponseRecords:
+        """
+        Combine cached results with the results of a new request
+        See `Client.get_records_merged`
+        """
+
+        emails = Client._validate_merge_emails(kwargs)
+
+        fresh = []
+        if kwargs.get('request_id') is not None:
+            fresh = [record async for record in self.iter_records(
+                request_id=kwargs['request_id'])]
+
+        return self._merge_records(emails, fresh)
+
+    async def get_requests(self, **kwargs) -> ResponseRequests:
+        """
+        Get a list of your requests
+        See `Client.get_requests`
+        """
+
+        path, payload = self._get_requests_args(
+            dict(kwargs, only_ids=False), Client._PARSABLE_FORMAT)
+        response = await self._api_requester.post_bytes(path, payload)
+
+        return self._build_response(path, response, ResponseRequests)
+
+    async def get_status(self, **kwargs) -> ResponseStatus:
+        """
+        Get statuses of the specified requests
+        See `Client.get_status`
+        """
+
+        path, payload = self._get_status_args(
+            kwargs, Client._PARSABLE_FORMAT)
+        response = await self._api_requester.post_bytes(path, payload)
+
+        return self._build_response(path, response, ResponseStatus)
+
+    async def get_status_bulk(self, **kwargs) -> dict:
+        """
+        Get statuses of any number of requests in concurrent batches
+        See `Client.get_status_bulk`
+        """
+
+        batches, max_workers = Client._prepare_status_batches(kwargs)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def get_batch(request_ids):
+            async with semaphore:
+                return await self._get_status_batch(request_ids)
+
+        statuses = {}
+        for batch in await asyncio.gather(*map(get_batch, batches)):
+            statuses.update(batch)
+        return statuses
+
+    async def _get_status_batch(self, request_ids: list) -> dict:
+        try:
+            response = await self.get_status(request_ids=request_ids)
+        except (BadRequestError, HttpApiError) as error:
+            if len(request_ids) < 2 \
+                    or error.code not in Client._SPLIT_STATUS_CODES:
+                raise
+            middle = len(request_ids) // 2
+            statuses = await self._get_status_batch(request_ids[:middle])
+            statuses.update(
+                await self._get_status_batch(request_ids[middle:]))
+            return statuses
+
+        return {bulk_request.id: bulk_request
+                for bulk_request in response.data}
+
+    def iter_records(self, **kwargs):
+        """
+        Get processed email results one by one while the response is
+        being downloaded
+        See `Client.iter_records`
+        :return: AsyncIterator[Record]
+        """
+
+        return super().iter_records(**kwargs)
+
+    async def _iter_records(self, path: str, payload: dict, chunk_size: int,
+                            record_class=Record):
+        parser = JsonArrayParser('response')
+
+        async for chunk in self._api_requester.stream(
+                path, payload, chunk_size=chunk_size):
+            for item in Client._feed_parser(parser, chunk):
+                yield record_class(item)
+
+        for item in Client._feed_parser(parser, None):
+            yield record_class(item)
+
+    def iter_requests(self, **kwargs):
+        """
+        Get all your requests, prefetching the next pages concurrently
+        See `Client.iter_requests`
+        :return: AsyncIterator[BulkRequest] or AsyncIterator[int]
+        """
+
+        return super().iter_requests(**kwargs)
+
+    async def _iter_requests(self, options: dict, max_workers: int,
+                             predicate):
+        last_page, items = await self._get_requests_page(options, 1)
+        seen = set()
+        for item in Client._select_requests(items, seen, predicate):
+            yield item
+
+        pending = deque()
+        next_page = 2
+        try:
+            while next_page <= last_page or pending:
+                while next_page <= last_page and len(pending) < max_workers:
+                    pending.append(asyncio.ensure_future(
+                        self._get_requests_page(options, next_page)))
+                    next_page += 1
+
+                _, items = await pending.popleft()
+                for item in Client._select_requests(items, seen, predicate):
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_requests_page(self, options: dict, page: int) -> tuple:
+        response = await self._api_requester.post_bytes(
+            *self._get_requests_args(dict(options, page=page)))
+
+        return Client._parse_requests_page(response, options['only_ids'])
+
+    def verify(self, **kwargs):
+        """
+        Not supported: `VerificationPipeline` runs on worker threads.
+        Use `Client.verify`, or combine `create_requests_chunked`,
+        `wait_for_requests` and `iter_records`
+        :raises TypeError:
+        """
+
+        raise TypeError('AsyncClient does not support verify(), '
+                        'use Client.verify() instead')
+
+    def wait_for_requests(self, **kwargs) -> AsyncRequestPoller:
+        """
+        Wait for bulk requests to become ready
+        See `Client.wait_for_requests`
+        :return: `AsyncRequestPoller` instance. Iterate over it with
+                `async for` or await its `run()`
+        """
+
+        request_ids = kwargs.pop('request_ids', None)
+
+        if not request_ids:
+            raise ParameterError('Request ID list required')
+
+        return AsyncRequestPoller(self, request_ids, **kwargs)
+
+    async def create_request_raw(self, **kwargs) -> str:
+        """
+        Get raw create response
+        See `Client.create_request_raw`
+        """
+
+        return await self._api_requester.post(
+            *self._create_request_args(kwargs))
+
+    async def get_records_raw(self, **kwargs) -> str:
+        """
+        Get processed email results
+        See `Client.get_records_raw`
+        """
+
+        return await self._api_requester.post(
+            *self._get_records_args(kwargs))
+
+    async def get_requests_raw(self, **kwargs) -> str:
+        """
+        Get a list of your requests
+        See `Client.get_requests_raw`
+        """
+
+        return await self._api_requester.post(
+            *self._get_requests_args(kwargs))
+
+    async def get_status_raw(self, **kwargs) -> str:
+        """
+        Get statuses of the specified requests
+        See `Client.get_status_raw`
+        """
+
+        return await self._api_requester.post(
+            *self._get_status_args(kwargs))
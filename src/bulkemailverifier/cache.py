@@ -0,0 +1,267 @@
+from itertools import islice
+from json import dumps, loads
+from time import time
+
+import sqlite3
+import threading
+
+from .exceptions.error import ParameterError
+from .models.response import Record
+from .preprocess import normalize_email
+
+_FIELDS = Record.__slots__
+
+# Keeps the number of bound parameters below the default SQLite limit
+_BATCH_SIZE = 500
+
+
+class ResultCache:
+    """
+    Local store of verification results keyed by normalized address.
+
+    Results are kept in an SQLite database, so they survive restarts and
+    can be shared by several processes using the same file. Every result
+    expires after its TTL. With `max_entries` set the least recently used
+    results are evicted once the cache grows beyond it.
+
+        cache = ResultCache('results.sqlite', ttl=30 * 86400)
+        client = Client('Your API key', cache=cache)
+
+        request_id = client.create_request(emails=emails)  # misses only
+        ...
+        records = client.get_records_merged(
+            emails=emails, request_id=request_id)
+    """
+
+    DEFAULT_TTL = 30 * 24 * 3600
+
+    def __init__(self, path: str = ':memory:', **kwargs):
+        """
+        :param path: Database file name. In-memory database by default
+        :key ttl: Optional. Seconds a result stays valid or a callable
+                (Record) -> seconds to set it per result, e.g. shorter for
+                'unknown' results. `ResultCache.DEFAULT_TTL` by default
+        :key max_entries: Optional. Max number of cached results.
+                No limit by default
+        """
+        self._ttl = ResultCache.DEFAULT_TTL
+        self._max_entries = None
+
+        if 'ttl' in kwargs:
+            self._ttl = _validate_ttl(kwargs['ttl'])
+        if kwargs.get('max_entries') is not None:
+            if type(kwargs['max_entries']) is not int \
+                    or kwargs['max_entries'] < 1:
+                raise ValueError('Max entries should be a positive integer')
+            self._max_entries = kwargs['max_entries']
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection as connection:
+            if path != ':memory:':
+                connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS records ('
+                'email TEXT PRIMARY KEY, '
+                'record TEXT NOT NULL, '
+                'expires REAL NOT NULL, '
+                'accessed REAL NOT NULL)')
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS records_accessed '
+                'ON records (accessed)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM records').fetchone()[0]
+
+    @staticmethod
+    def key(email: str) -> str:
+        """
+        Cache key of an address: its normalized form, see `normalize_email`
+        :raises ParameterError: the address is not a string
+        """
+        normalized = normalize_email(email)
+        if normalized is not None:
+            return normalized
+        if type(email) is not str:
+            raise ParameterError('Incorrect email value')
+        return email.strip()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def get(self, email: str) -> Record or None:
+        """
+        :return: Cached `Record` or None if there is no valid result
+        """
+        return self.get_many([email]).get(ResultCache.key(email))
+
+    def get_many(self, emails) -> dict:
+        """
+        Look up many addresses at once
+        :param emails: Iterable[str]
+        :return: dict. Cache key -> `Record` for the addresses found
+        """
+        keys = set(ResultCache.key(e) for e in emails)
+        found = self.lookup(keys)
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def filter_misses(self, emails) -> list:
+        """
+        :param emails: Iterable[str]
+        :return: list[str]. Addresses without a valid cached result in input
+                order, one per cache key
+        """
+        emails = list(emails)
+        found = self.get_many(emails)
+
+        result = []
+        for email in emails:
+            key = ResultCache.key(email)
+            if key not in found:
+                found[key] = None
+                result.append(email)
+        return result
+
+    def iter_misses(self, emails, batch_size: int = 10000):
+        """
+        Streaming version of `filter_misses` for inputs of any size.
+        Repeated addresses are dropped only within one batch.
+        :param emails: Iterable[str]
+        :param batch_size: Number of addresses looked up at once
+        :return: Iterator[str]
+        """
+        iterator = iter(emails)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            for email in self.filter_misses(batch):
+                yield email
+
+    def put(self, record: Record, ttl: float = None):
+        """
+        Store a verification result
+        :param ttl: Optional. Overrides the TTL of the cache
+        """
+        self.put_many([record], ttl)
+
+    def put_many(self, records, ttl: float = None) -> int:
+        """
+        Store verification results
+        :param records: Iterable[Record]
+        :param ttl: Optional. Overrides the TTL of the cache
+        :return: int. Number of stored results
+        """
+        ttl = self._ttl if ttl is None else _validate_ttl(ttl)
+        now = time()
+
+        rows = []
+        for record in records:
+            expires = now + (ttl(record) if callable(ttl) else ttl)
+            rows.append((
+                ResultCache.key(record.email_address),
+                _dump_record(record),
+                expires,
+                now
+            ))
+
+        with self._lock, self._connection as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO records '
+                '(email, record, expires, accessed) VALUES (?, ?, ?, ?)',
+                rows)
+            if self._max_entries is not None:
+                self._evict(connection, now)
+        return len(rows)
+
+    def lookup(self, keys) -> dict:
+        """
+        Look up cache keys without updating the hit and miss counters,
+        e.g. to merge results of addresses already counted by `get_many`
+        :param keys: Iterable[str]. Cache keys, see `key`
+        :return: dict. Cache key -> `Record` for the keys found
+        """
+        keys = list(keys)
+        now = time()
+        found = {}
+
+        with self._lock, self._connection as connection:
+            for i in range(0, len(keys), _BATCH_SIZE):
+                batch = keys[i:i + _BATCH_SIZE]
+                rows = connection.execute(
+                    'SELECT email, record FROM records '
+                    'WHERE expires > ? AND email IN ({})'.format(
+                        ','.join('?' * len(batch))),
+                    [now] + batch)
+                for key, value in rows:
+                    found[key] = _load_record(value)
+
+            if found and self._max_entries is not None:
+                connection.executemany(
+                    'UPDATE records SET accessed = ? WHERE email = ?',
+                    ((now, key) for key in found))
+        return found
+
+    def purge(self) -> int:
+        """
+        Remove expired results
+        :return: int. Number of removed results
+        """
+        with self._lock, self._connection as connection:
+            return connection.execute(
+                'DELETE FROM records WHERE expires <= ?', (time(),)).rowcount
+
+    def clear(self):
+        """
+        Remove all results and reset the hit and miss counters
+        """
+        with self._lock, self._connection as connection:
+            connection.execute('DELETE FROM records')
+            self.hits = 0
+            self.misses = 0
+
+    def _evict(self, connection, now: float):
+        connection.execute('DELETE FROM records WHERE expires <= ?', (now,))
+
+        size = connection.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+        if size > self._max_entries:
+            connection.execute(
+                'DELETE FROM records WHERE email IN ('
+                'SELECT email FROM records ORDER BY accessed LIMIT ?)',
+                (size - self._max_entries,))
+
+
+def _dump_record(record: Record) -> str:
+    values = [getattr(record, name) for name in _FIELDS]
+    return dumps(values, separators=(',', ':'))
+
+
+def _load_record(value: str) -> Record:
+    record = Record(None)
+    for name, field in zip(_FIELDS, loads(value)):
+        setattr(record, name, field)
+    record.mx_records = tuple(record.mx_records)
+    return record
+
+
+def _validate_ttl(value):
+    if callable(value) or type(value) in (int, float) and value >= 0:
+        return value
+    raise ValueError('TTL should be a non-negative number or a callable')
@@ -1,17 +1,46 @@
-from json import loads, JSONDecodeError
-
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from json import JSONDecodeError
+from time import perf_counter
+
+import gzip
+import os
 import re
-
-from .exceptions.error import EmptyApiKeyError, FileError, ParameterError, \
-    UnparsableApiResponseError
-from .models.response import ResponseRecords, ResponseRequests, ResponseStatus
+import tempfile
+
+from .cache import ResultCache
+from .exceptions.error import BadRequestError, EmptyApiKeyError, FileError, \
+    HttpApiError, ParameterError, UnparsableApiResponseError
+from .json_backend import loads
+from .models.response import LazyRecord, Record, ResponseRecords, \
+    ResponseRequests, ResponseStatus
+from .models.stream import JsonArrayParser
 from .net.http import ApiRequester
+from .net.observer import Observer, notify_span
+from .pipeline import VerificationPipeline
+from .poller import RequestPoller
+from .preprocess import iter_unique_emails
 
 
 class Client:
+    """
+    Client of the Bulk Email Verification API.
+
+    One client may be shared by any number of threads. Calls do not modify
+    the client or their keyword arguments, and the requester settings are
+    replaced atomically, so they can be changed while calls are running.
+    Connections come from a single pool: set `pool_maxsize` to the number
+    of threads, or `pool_block` to make extra threads wait for a free
+    connection.
+    """
+
     __default_url = 'https://emailverification.whoisxmlapi.com/api/bevService'
     _api_requester: ApiRequester or None
     _api_key: str
+    _cache: ResultCache or None
+
+    _requester_class = ApiRequester
 
     _re_api_key = re.compile(r'^at_[a-z0-9]{29}$', re.IGNORECASE)
 
@@ -27,6 +56,15 @@ class Client:
     MIN_PAGE_SIZE = 10
     MAX_PAGE_SIZE = 50
 
+    DEFAULT_CHUNK_SIZE = 10000
+    DEFAULT_MAX_WORKERS = 4
+    DEFAULT_STATUS_BATCH_SIZE = 100
+
+    # Status codes of a `get_status` batch rejected as too large
+    _SPLIT_STATUS_CODES = (400, 413, 422)
+
+    DEFAULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
     SORT_ASC = 'asc'
     SORT_DESC = 'desc'
 
@@ -39,16 +77,40 @@ class Client:
         :param api_key: str: Your API key
         :key base_url: str: (optional) API endpoint URL
         :key timeout: float: (optional) API call timeout in seconds
+        :key pool_connections: int: (optional) Number of per-host
+                connection pools
+        :key pool_maxsize: int: (optional) Maximum number of keep-alive
+                connections per host
+        :key pool_block: bool: (optional) Wait for a free connection when
+                the pool is exhausted
+        :key retry_policy: RetryPolicy: (optional) Retry failed calls.
+                No retries by default
+        :key rate_limiter: RateLimiter: (optional) Client-side limit of
+                calls per API path. No limit by default
+        :key cache: ResultCache: (optional) Local cache of verification
+                results. Cached addresses are not submitted again
+        :key transport: Transport: (optional) Sends the HTTP calls.
+                A pooled `RequestsTransport` by default
+        :key observers: list[Observer]: (optional) Instrumentation hooks
+                notified of the phases of every call. None by default
         """
 
         self._api_key = ''
+        self._cache = None
 
         self.api_key = api_key
+        self.cache = kwargs.pop('cache', None)
 
         if 'base_url' not in kwargs:
             kwargs['base_url'] = Client.__default_url
 
-        self.api_requester = ApiRequester(**kwargs)
+        self.api_requester = self._requester_class(**kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @property
     def api_key(self) -> str:
@@ -66,6 +128,16 @@ class Client:
     def api_requester(self, value: ApiRequester):
         self._api_requester = value
 
+    @property
+    def cache(self) -> ResultCache or None:
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: ResultCache or None):
+        if value is not None and not isinstance(value, ResultCache):
+            raise ParameterError('Expected a ResultCache instance')
+        self._cache = value
+
     @property
     def base_url(self) -> str:
         return self._api_requester.base_url
@@ -85,13 +157,26 @@ class Client:
     def timeout(self, value: float):
         self._api_requester.timeout = value
 
+    def close(self):
+        """
+        Release pooled HTTP connections
+        """
+
+        self._api_requester.close()
+
     def create_request(self, **kwargs) -> int:
         """
         Create bulk emails processing request
         :key emails: Required. list[str]
-        :return: int. Created request ID
-        :raises ConnectionError:
+        :key preprocess: Optional. Trim, lowercase domains, drop duplicates
+                and syntactically invalid addresses before sending,
+                see `prepare_emails`. False by default
+        :key use_cache: Optional. With a `cache` configured submit only
+                the addresses without a cached result. True by default
+        :return: int. Created request ID. None if every address has a
+                cached result
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -99,30 +184,37 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
-        kwargs['output_format'] = Client._PARSABLE_FORMAT
+        options = self._filter_cached(kwargs)
+        if options is None:
+            return None
 
-        response = self.create_request_raw(**kwargs)
+        response = self._api_requester.post_bytes(
+            *self._create_request_args(options, Client._PARSABLE_FORMAT))
 
-        try:
-            parsed = loads(str(response))
-            if 'response' in parsed:
-                return int(parsed['response']['id'])
-            raise UnparsableApiResponseError(
-                'Could not find the correct root element.', None)
-        except JSONDecodeError as error:
-            raise UnparsableApiResponseError(
-                    'Could not parse API response',
-                    error)
+        return Client._parse_request_id(response)
 
-    def download(self, **kwargs):
+    def create_requests_chunked(self, **kwargs) -> dict:
         """
-        Download processing results CSV and save to file
-        :key request_id: Required. int. Request ID
-        :key return_failed: Optional.
-                Returns only completed emails if False, failed - otherwise.
+        Split a large email list into several bulk requests and create them
+        concurrently. Only `max_workers` chunks are held in memory at a time,
+        so the input may be a generator of any size.
+        :key emails: Required. Iterable[str]
+        :key chunk_size: Optional. Number of emails per request.
+                `Client.DEFAULT_CHUNK_SIZE` by default
+        :key max_workers: Optional. Maximum number of concurrent requests.
+                `Client.DEFAULT_MAX_WORKERS` by default
+        :key preprocess: Optional. Trim, lowercase domains, drop duplicates
+                and syntactically invalid addresses before sending.
                 False by default
-        :raises ConnectionError:
+        :key dedupe_window: Optional. With `preprocess` remember only this
+                many recent addresses for deduplication to bound memory.
+                All addresses are remembered by default
+        :key use_cache: Optional. With a `cache` configured submit only
+                the addresses without a cached result. True by default
+        :return: dict. Chunk number (starting with 0) -> created request ID.
+                Empty if every address has a cached result
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -130,32 +222,107 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
-        filename = None
+        chunks, max_workers, use_cache = self._prepare_chunks(kwargs)
 
-        kwargs['output_format'] = Client._DOWNLOAD_FORMAT
+        request_ids = {}
+        pending = {}
 
-        if 'filename' in kwargs:
-            filename = kwargs['filename']
+        def collect(futures):
+            for future in futures:
+                request_ids[pending.pop(future)] = future.result()
 
-        if type(filename) is not str or not filename:
-            raise ParameterError('Output file name required')
+        with ThreadPoolExecutor(max_workers) as executor:
+            try:
+                for number, chunk in enumerate(chunks):
+                    if len(pending) >= max_workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
 
-        try:
-            result_file = open(filename, 'w')
-        except Exception:
-            raise FileError('Cannot open output file')
+                    future = executor.submit(
+                        self.create_request, emails=chunk, use_cache=False)
+                    pending[future] = number
 
-        result_file.close()
+                collect(list(pending))
+            finally:
+                for future in pending:
+                    future.cancel()
 
-        response = self.get_records_raw(**kwargs)
+        if not request_ids and not use_cache:
+            raise ParameterError('Emails required')
 
-        try:
-            result_file = open(filename, 'w')
-            result_file.write(response)
-        except Exception:
-            raise FileError('Cannot write result to file')
-        finally:
-            result_file.close()
+        return dict(sorted(request_ids.items()))
+
+    def _prepare_chunks(self, kwargs: dict) -> tuple:
+        """
+        Validate the `create_requests_chunked` options
+        :return: tuple. Iterator over the email chunks, max workers and
+                whether the cache is used
+        """
+        emails = None
+        chunk_size = Client.DEFAULT_CHUNK_SIZE
+        max_workers = Client.DEFAULT_MAX_WORKERS
+
+        if self.api_key == '':
+            raise EmptyApiKeyError('')
+
+        if 'emails' in kwargs:
+            emails = Client._validate_email_iterable(kwargs['emails'])
+
+        if emails is None:
+            raise ParameterError('Emails required')
+
+        if 'chunk_size' in kwargs:
+            chunk_size = Client._validate_positive_int(
+                kwargs['chunk_size'], 'Chunk size')
+
+        if 'max_workers' in kwargs:
+            max_workers = Client._validate_positive_int(
+                kwargs['max_workers'], 'Max workers')
+
+        emails = Client._preprocess_iterable(emails, kwargs)
+
+        use_cache = self._cache is not None \
+            and Client._validate_use_cache(kwargs)
+        if use_cache:
+            emails = self._cache.iter_misses(emails)
+
+        return _chunks(emails, chunk_size), max_workers, use_cache
+
+    def download(self, **kwargs) -> int:
+        """
+        Download processing results CSV and save to file.
+        The response is streamed to a temporary file in the same directory,
+        which replaces the target file once the download is complete.
+        :key filename: Required. str. Output file name
+        :key request_id: Required. int. Request ID
+        :key return_failed: Optional.
+                Returns only completed emails if False, failed - otherwise.
+                False by default
+        :key compress: Optional. Gzip the file while writing.
+                False by default
+        :key chunk_size: Optional. Size of the chunks read from the network.
+                `Client.DEFAULT_DOWNLOAD_CHUNK_SIZE` by default
+        :return: int. Number of bytes written to the file
+        :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
+        :raises ResponseError: response contains an error message
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises ParameterError: invalid parameter value
+        :raises FileError: output file cannot be written
+        """
+
+        path, payload = self._get_records_args(
+            kwargs, Client._DOWNLOAD_FORMAT)
+        result_file, chunk_size = Client._prepare_download(kwargs)
+
+        with result_file:
+            for chunk in self._api_requester.stream(
+                    path, payload, chunk_size=chunk_size):
+                result_file.write(chunk)
+
+        return result_file.bytes_written
 
     def get_records(self, **kwargs) -> ResponseRecords:
         """
@@ -164,9 +331,11 @@ class Client:
         :key return_failed: Optional.
                 Returns only completed emails if False, failed - otherwise.
                 False by default
+        :key lazy: Optional. Convert the fields of every `Record` on first
+                access, see `LazyRecord`. False by default
         :return: `ResponseRecords` instance
-        :raises ConnectionError:
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -174,20 +343,40 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
-        kwargs['output_format'] = Client._PARSABLE_FORMAT
+        lazy = Client._validate_lazy(kwargs)
 
-        response = self.get_records_raw(**kwargs)
+        path, payload = self._get_records_args(
+            kwargs, Client._PARSABLE_FORMAT)
+        response = self._api_requester.post_bytes(path, payload)
 
-        try:
-            parsed = loads(str(response))
-            if 'response' in parsed:
-                return ResponseRecords(parsed)
-            raise UnparsableApiResponseError(
-                'Cannot find the correct root element', None)
-        except JSONDecodeError as error:
-            raise UnparsableApiResponseError(
-                    'Could not parse API response',
-                    error)
+        return self._build_response(path, response, ResponseRecords, lazy)
+
+    def get_records_merged(self, **kwargs) -> ResponseRecords:
+        """
+        Combine cached results with the results of a new request.
+        Fresh results are added to the cache.
+        :key emails: Required. Iterable[str]. Addresses passed to
+                `create_request`
+        :key request_id: Optional. int. ID returned by `create_request`.
+                None if every address had a cached result
+        :return: `ResponseRecords` instance. One `Record` per address in
+                input order, addresses without a result are omitted
+        :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
+        :raises ResponseError: response contains an error message
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises ParameterError: invalid parameter value
+        """
+
+        emails = Client._validate_merge_emails(kwargs)
+
+        fresh = []
+        if kwargs.get('request_id') is not None:
+            fresh = list(self.iter_records(request_id=kwargs['request_id']))
+
+        return self._merge_records(emails, fresh)
 
     def get_requests(self, **kwargs) -> ResponseRequests:
         """
@@ -203,8 +392,8 @@ class Client:
                 Supported options: SORT_ASC, SORT_DESC.
                 SORT_DESC by default
         :return: `ResponseRequests` instance
-        :raises ConnectionError:
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -212,29 +401,19 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
-        kwargs['output_format'] = Client._PARSABLE_FORMAT
-        kwargs['only_ids'] = False
+        path, payload = self._get_requests_args(
+            dict(kwargs, only_ids=False), Client._PARSABLE_FORMAT)
+        response = self._api_requester.post_bytes(path, payload)
 
-        response = self.get_requests_raw(**kwargs)
-
-        try:
-            parsed = loads(str(response))
-            if 'response' in parsed:
-                return ResponseRequests(parsed)
-            raise UnparsableApiResponseError(
-                'Cannot find the correct root element', None)
-        except JSONDecodeError as error:
-            raise UnparsableApiResponseError(
-                    'Could not parse API response',
-                    error)
+        return self._build_response(path, response, ResponseRequests)
 
     def get_status(self, **kwargs) -> ResponseStatus:
         """
         Get statuses of the specified requests
         :key request_ids: Required. list[str]. Request IDs
         :return: `ResponseStatus` instance
-        :raises ConnectionError:
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -242,31 +421,135 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
-        kwargs['output_format'] = Client._PARSABLE_FORMAT
+        path, payload = self._get_status_args(
+            kwargs, Client._PARSABLE_FORMAT)
+        response = self._api_requester.post_bytes(path, payload)
 
-        response = self.get_status_raw(**kwargs)
+        return self._build_response(path, response, ResponseStatus)
 
+    def get_status_bulk(self, **kwargs) -> dict:
+        """
+        Get statuses of any number of requests. The IDs are split into
+        batches which are sent concurrently. A batch rejected as too large
+        (HTTP 400, 413 or 422) is split in two and retried, down to single
+        IDs.
+        :key request_ids: Required. Iterable[int]. Request IDs
+        :key batch_size: Optional. Max IDs per `get_status` call.
+                `Client.DEFAULT_STATUS_BATCH_SIZE` by default
+        :key max_workers: Optional. Maximum number of concurrent requests.
+                `Client.DEFAULT_MAX_WORKERS` by default
+        :return: dict. Request ID -> `BulkRequest` for the requests found
+        :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
+        :raises ResponseError: response contains an error message
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises ParameterError: invalid parameter value
+        """
+
+        batches, max_workers = Client._prepare_status_batches(kwargs)
+
+        statuses = {}
+        if len(batches) == 1:
+            statuses.update(self._get_status_batch(batches[0]))
+            return statuses
+
+        with ThreadPoolExecutor(min(max_workers, len(batches))) as executor:
+            futures = [executor.submit(self._get_status_batch, batch)
+                       for batch in batches]
+            try:
+                for future in futures:
+                    statuses.update(future.result())
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return statuses
+
+    def _get_status_batch(self, request_ids: list) -> dict:
         try:
-            parsed = loads(str(response))
-            if 'response' in parsed:
-                return ResponseStatus(parsed)
-            raise UnparsableApiResponseError(
-                'Cannot find the correct root element', None)
-        except JSONDecodeError as error:
-            raise UnparsableApiResponseError(
-                    'Could not parse API response',
-                    error)
+            response = self.get_status(request_ids=request_ids)
+        except (BadRequestError, HttpApiError) as error:
+            if len(request_ids) < 2 \
+                    or error.code not in Client._SPLIT_STATUS_CODES:
+                raise
+            middle = len(request_ids) // 2
+            statuses = self._get_status_batch(request_ids[:middle])
+            statuses.update(self._get_status_batch(request_ids[middle:]))
+            return statuses
+
+        return {bulk_request.id: bulk_request
+                for bulk_request in response.data}
+
+    def iter_records(self, **kwargs):
+        """
+        Get processed email results one by one. The response is parsed
+        while it is being downloaded, so memory usage does not depend on
+        the number of results.
+        :key request_id: Required. int. Request ID
+        :key return_failed: Optional.
+                Returns only completed emails if False, failed - otherwise.
+                False by default
+        :key chunk_size: Optional. Size of the chunks read from the network.
+                `Client.DEFAULT_DOWNLOAD_CHUNK_SIZE` by default
+        :key lazy: Optional. Convert the fields of every `Record` on first
+                access, see `LazyRecord`. False by default
+        :return: Iterator[Record]
+        :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
+        :raises ResponseError: response contains an error message
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises ParameterError: invalid parameter value
+        """
 
-    def create_request_raw(self, **kwargs) -> str:
+        chunk_size = Client.DEFAULT_DOWNLOAD_CHUNK_SIZE
+        if 'chunk_size' in kwargs:
+            chunk_size = Client._validate_positive_int(
+                kwargs['chunk_size'], 'Chunk size')
+
+        record_class = LazyRecord if Client._validate_lazy(kwargs) else Record
+
+        path, payload = self._get_records_args(
+            kwargs, Client._PARSABLE_FORMAT)
+
+        return self._iter_records(path, payload, chunk_size, record_class)
+
+    def _iter_records(self, path: str, payload: dict, chunk_size: int,
+                      record_class=Record):
+        parser = JsonArrayParser('response')
+
+        for chunk in self._api_requester.stream(
+                path, payload, chunk_size=chunk_size):
+            for item in Client._feed_parser(parser, chunk):
+                yield record_class(item)
+
+        for item in Client._feed_parser(parser, None):
+            yield record_class(item)
+
+    def iter_requests(self, **kwargs):
         """
-        Get raw create response
-        :key emails: Required. list[str]
-        :key output_format: Optional. Response output format.
-                Supported options: JSON_FORMAT, XML_FORMAT.
-                JSON_FORMAT by default
-        :return: int. Created request ID
-        :raises ConnectionError:
+        Get all your requests, page by page. The first page gives the
+        number of pages, the others are fetched concurrently, at most
+        `max_workers` pages ahead, and yielded in order. A request shifted
+        to the next page by requests created meanwhile is yielded once.
+        :key per_page: Optional. Number of requests per page.
+                Min: `Client.MIN_PAGE_SIZE`, Max: `Client.MAX_PAGE_SIZE`.
+                `Client.MAX_PAGE_SIZE` by default
+        :key sort: Optional. Specify the order of requests in the response.
+                Supported options: SORT_ASC, SORT_DESC.
+                SORT_DESC by default
+        :key only_ids: Optional. Yield request IDs (int) instead of
+                `BulkRequest` objects. False by default
+        :key filter: Optional. Callable (BulkRequest or int) -> bool.
+                Yield only the requests it returns True for
+        :key max_workers: Optional. Maximum number of concurrent page
+                requests. `Client.DEFAULT_MAX_WORKERS` by default
+        :return: Iterator[BulkRequest] or Iterator[int]
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -274,29 +557,158 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
-        emails = None
+        max_workers = Client.DEFAULT_MAX_WORKERS
+        predicate = kwargs.get('filter')
+
+        options = {
+            'output_format': Client._PARSABLE_FORMAT,
+            'per_page': kwargs.get('per_page', Client.MAX_PAGE_SIZE),
+            'only_ids': kwargs.get('only_ids', False),
+        }
+        if 'sort' in kwargs:
+            options['sort'] = kwargs['sort']
+
+        if 'max_workers' in kwargs:
+            max_workers = Client._validate_positive_int(
+                kwargs['max_workers'], 'Max workers')
+
+        if predicate is not None and not callable(predicate):
+            raise ParameterError('Filter must be callable')
+
+        # Validates the options before the first page is requested
+        self._get_requests_args(dict(options, page=1))
+
+        return self._iter_requests(options, max_workers, predicate)
+
+    def _iter_requests(self, options: dict, max_workers: int, predicate):
+        last_page, items = self._get_requests_page(options, 1)
+        seen = set()
+        for item in Client._select_requests(items, seen, predicate):
+            yield item
+
+        pending = deque()
+        next_page = 2
+        with ThreadPoolExecutor(max_workers) as executor:
+            try:
+                while next_page <= last_page or pending:
+                    while next_page <= last_page \
+                            and len(pending) < max_workers:
+                        pending.append(executor.submit(
+                            self._get_requests_page, options, next_page))
+                        next_page += 1
+
+                    _, items = pending.popleft().result()
+                    for item in Client._select_requests(
+                            items, seen, predicate):
+                        yield item
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _get_requests_page(self, options: dict, page: int) -> tuple:
+        response = self._api_requester.post_bytes(
+            *self._get_requests_args(dict(options, page=page)))
+
+        return Client._parse_requests_page(response, options['only_ids'])
+
+    def verify(self, **kwargs) -> VerificationPipeline:
+        """
+        Verify an email stream of any size. Requests are created, polled
+        and downloaded concurrently, see `VerificationPipeline`
+        :key emails: Required. Iterable[str]
+        :key chunk_size: Optional. Number of emails per request.
+                `VerificationPipeline.DEFAULT_CHUNK_SIZE` by default
+        :key submit_workers: Optional. Max concurrent `create_request` calls.
+                `VerificationPipeline.DEFAULT_SUBMIT_WORKERS` by default
+        :key fetch_workers: Optional. Max concurrent result downloads.
+                `VerificationPipeline.DEFAULT_FETCH_WORKERS` by default
+        :key max_pending: Optional. Max chunks in progress at a time.
+                `VerificationPipeline.DEFAULT_MAX_PENDING` by default
+        :key include_failed: Optional. Also yield the records of the emails
+                that could not be processed. False by default
+        :key journal: Optional. `JobJournal` to record the progress in and
+                to resume from. The input must be the same on resume
+        :key preprocess: Optional. Trim, lowercase domains, drop duplicates
+                and syntactically invalid addresses before sending.
+                False by default
+        :key dedupe_window: Optional. With `preprocess` remember only this
+                many recent addresses for deduplication.
+                All addresses are remembered by default
+        :key batch_size: Optional. Max IDs per `get_status` call.
+                `RequestPoller.DEFAULT_BATCH_SIZE` by default
+        :key min_interval: Optional. Min seconds between checks of a request.
+                `RequestPoller.DEFAULT_MIN_INTERVAL` by default
+        :key max_interval: Optional. Max seconds between checks of a request.
+                `RequestPoller.DEFAULT_MAX_INTERVAL` by default
+        :key backoff: Optional. Interval multiplier for stalled requests.
+                `RequestPoller.DEFAULT_BACKOFF` by default
+        :return: `VerificationPipeline` instance. Iterate over it to get
+                `Record` objects as the requests are completed
+        :raises ParameterError: invalid parameter value
+        """
 
         if self.api_key == '':
             raise EmptyApiKeyError('')
 
-        if 'emails' in kwargs:
-            emails = Client._validate_emails(kwargs['emails'])
+        emails = Client._validate_email_iterable(kwargs.pop('emails', None))
+        emails = Client._preprocess_iterable(emails, kwargs)
+        kwargs.pop('preprocess', None)
+        kwargs.pop('dedupe_window', None)
 
-        if not emails:
-            raise ParameterError('Emails required')
+        return VerificationPipeline(self, emails, **kwargs)
 
-        if 'response_format' in kwargs:
-            kwargs['output_format'] = kwargs['response_format']
-        if 'output_format' in kwargs:
-            output_format = Client._validate_output_format(
-                kwargs['output_format'])
-        else:
-            output_format = Client._PARSABLE_FORMAT
+    def wait_for_requests(self, **kwargs) -> RequestPoller:
+        """
+        Wait for bulk requests to become ready. Statuses are checked in
+        batches with an adaptive interval, see `RequestPoller`
+        :key request_ids: Required. list[int]. Request IDs
+        :key batch_size: Optional. Max IDs per `get_status` call.
+                `RequestPoller.DEFAULT_BATCH_SIZE` by default
+        :key min_interval: Optional. Min seconds between checks of a request.
+                `RequestPoller.DEFAULT_MIN_INTERVAL` by default
+        :key max_interval: Optional. Max seconds between checks of a request.
+                `RequestPoller.DEFAULT_MAX_INTERVAL` by default
+        :key backoff: Optional. Interval multiplier for stalled requests.
+                `RequestPoller.DEFAULT_BACKOFF` by default
+        :key max_workers: Optional. Maximum number of concurrent
+                `get_status` calls.
+                `RequestPoller.DEFAULT_MAX_WORKERS` by default
+        :key timeout: Optional. Stop waiting after this many seconds.
+                No limit by default
+        :key callback: Optional. Called with every ready `BulkRequest`
+        :return: `RequestPoller` instance. Iterate over it to get
+                `BulkRequest` objects as the requests become ready
+        :raises ParameterError: invalid parameter value
+        """
 
-        return self._api_requester.post(
-                self._PATH_CREATE,
-                self._build_payload(self.api_key, output_format, emails)
-        )
+        request_ids = kwargs.pop('request_ids', None)
+
+        if not request_ids:
+            raise ParameterError('Request ID list required')
+
+        return RequestPoller(self, request_ids, **kwargs)
+
+    def create_request_raw(self, **kwargs) -> str:
+        """
+        Get raw create response
+        :key emails: Required. list[str]
+        :key preprocess: Optional. Trim, lowercase domains, drop duplicates
+                and syntactically invalid addresses before sending,
+                see `prepare_emails`. False by default
+        :key output_format: Optional. Response output format.
+                Supported options: JSON_FORMAT, XML_FORMAT.
+                JSON_FORMAT by default
+        :return: int. Created request ID
+        :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
+        :raises ResponseError: response contains an error message
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises ParameterError: invalid parameter value
+        """
+
+        return self._api_requester.post(*self._create_request_args(kwargs))
 
     def get_records_raw(self, **kwargs) -> str:
         """
@@ -309,8 +721,8 @@ class Client:
                 Supported options: CSV_FORMAT, JSON_FORMAT, XML_FORMAT.
                 JSON_FORMAT by default
         :return: str
-        :raises ConnectionError:
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -318,37 +730,7 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
-        request_id = None
-        return_failed = False
-
-        if self.api_key == '':
-            raise EmptyApiKeyError('')
-
-        if 'request_id' in kwargs:
-            request_id = Client._validate_request_id(kwargs['request_id'])
-
-        if not request_id:
-            raise ParameterError('Request ID required')
-
-        if 'return_failed' in kwargs:
-            return_failed = \
-                Client._validate_return_failed(kwargs['return_failed'])
-
-        if 'response_format' in kwargs:
-            kwargs['output_format'] = kwargs['response_format']
-        if 'output_format' in kwargs:
-            output_format = Client._validate_output_format_records(
-                kwargs['output_format'])
-        else:
-            output_format = Client._PARSABLE_FORMAT
-
-        path = self._PATH_FAILED if return_failed else self._PATH_COMPLETED
-
-        return self._api_requester.post(
-            path,
-            self._build_payload(
-                self.api_key, output_format, request_id=request_id)
-        )
+        return self._api_requester.post(*self._get_records_args(kwargs))
 
     def get_requests_raw(self, **kwargs) -> str:
         """
@@ -369,8 +751,27 @@ class Client:
                 Supported options: JSON_FORMAT, XML_FORMAT.
                 JSON_FORMAT by default
         :return: str
-        :raises ConnectionError:
         :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
+        :raises ResponseError: response contains an error message
+        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
+        :raises BadRequestError: Server returned 400 or 422 HTTP code
+        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
+        :raises ParameterError: invalid parameter value
+        """
+
+        return self._api_requester.post(*self._get_requests_args(kwargs))
+
+    def get_status_raw(self, **kwargs) -> str:
+        """
+        Get statuses of the specified requests
+        :key request_ids: Required. list[str]. Request IDs
+        :key output_format: Optional. Response output format.
+                Supported options: JSON_FORMAT, XML_FORMAT.
+                JSON_FORMAT by default
+        :return: str
+        :raises BulkEmailVerificationApiError: Base class for all errors below
+        :raises ApiConnectionError: network error after the last retry
         :raises ResponseError: response contains an error message
         :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
         :raises BadRequestError: Server returned 400 or 422 HTTP code
@@ -378,18 +779,78 @@ class Client:
         :raises ParameterError: invalid parameter value
         """
 
+        return self._api_requester.post(*self._get_status_args(kwargs))
+
+    def _create_request_args(self, kwargs: dict,
+                              output_format: str = None) -> tuple:
+        emails = None
+
+        # Read once, the key may be replaced by another thread
+        api_key = self.api_key
+        if api_key == '':
+            raise EmptyApiKeyError('')
+
+        if 'emails' in kwargs:
+            emails = kwargs['emails']
+            if Client._validate_preprocess(kwargs):
+                emails = list(iter_unique_emails(
+                    Client._validate_email_iterable(emails)))
+            emails = Client._validate_emails(emails)
+
+        if not emails:
+            raise ParameterError('Emails required')
+
+        if output_format is None:
+            output_format = Client._output_format(
+                kwargs, Client._validate_output_format)
+
+        return (
+            self._PATH_CREATE,
+            self._build_payload(api_key, output_format, emails)
+        )
+
+    def _get_records_args(self, kwargs: dict,
+                           output_format: str = None) -> tuple:
+        request_id = None
+        return_failed = False
+
+        api_key = self.api_key
+        if api_key == '':
+            raise EmptyApiKeyError('')
+
+        if 'request_id' in kwargs:
+            request_id = Client._validate_request_id(kwargs['request_id'])
+
+        if not request_id:
+            raise ParameterError('Request ID required')
+
+        if 'return_failed' in kwargs:
+            return_failed = \
+                Client._validate_return_failed(kwargs['return_failed'])
+
+        if output_format is None:
+            output_format = Client._output_format(
+                kwargs, Client._validate_output_format_records)
+
+        path = self._PATH_FAILED if return_failed else self._PATH_COMPLETED
+
+        return (
+            path,
+            self._build_payload(
+                api_key, output_format, request_id=request_id)
+        )
+
+    def _get_requests_args(self, kwargs: dict,
+                            output_format: str = None) -> tuple:
         page, only_ids, per_page, sort = [None] * 4
 
-        if self.api_key == '':
+        api_key = self.api_key
+        if api_key == '':
             raise EmptyApiKeyError('')
 
-        if 'response_format' in kwargs:
-            kwargs['output_format'] = kwargs['response_format']
-        if 'output_format' in kwargs:
-            output_format = Client._validate_output_format(
-                kwargs['output_format'])
-        else:
-            output_format = Client._PARSABLE_FORMAT
+        if output_format is None:
+            output_format = Client._output_format(
+                kwargs, Client._validate_output_format)
 
         if 'page' in kwargs:
             page = Client._validate_page(kwargs['page'])
@@ -403,10 +864,10 @@ class Client:
         if 'sort' in kwargs:
             sort = Client._validate_sort(kwargs['sort'])
 
-        return self._api_requester.post(
+        return (
             self._PATH_REQUESTS,
             self._build_payload(
-                self.api_key,
+                api_key,
                 output_format,
                 page=page,
                 only_ids=only_ids,
@@ -415,26 +876,12 @@ class Client:
             )
         )
 
-    def get_status_raw(self, **kwargs) -> str:
-        """
-        Get statuses of the specified requests
-        :key request_ids: Required. list[str]. Request IDs
-        :key output_format: Optional. Response output format.
-                Supported options: JSON_FORMAT, XML_FORMAT.
-                JSON_FORMAT by default
-        :return: str
-        :raises ConnectionError:
-        :raises BulkEmailVerificationApiError: Base class for all errors below
-        :raises ResponseError: response contains an error message
-        :raises ApiAuthError: Server returned 401, 402 or 403 HTTP code
-        :raises BadRequestError: Server returned 400 or 422 HTTP code
-        :raises HttpApiError: HTTP code >= 300 and not equal to above codes
-        :raises ParameterError: invalid parameter value
-        """
-
+    def _get_status_args(self, kwargs: dict,
+                          output_format: str = None) -> tuple:
         request_ids = None
 
-        if self.api_key == '':
+        api_key = self.api_key
+        if api_key == '':
             raise EmptyApiKeyError('')
 
         if 'request_ids' in kwargs:
@@ -443,20 +890,51 @@ class Client:
         if not request_ids:
             raise ParameterError('Request ID list required')
 
-        if 'response_format' in kwargs:
-            kwargs['output_format'] = kwargs['response_format']
-        if 'output_format' in kwargs:
-            output_format = Client._validate_output_format(
-                kwargs['output_format'])
-        else:
-            output_format = Client._PARSABLE_FORMAT
+        if output_format is None:
+            output_format = Client._output_format(
+                kwargs, Client._validate_output_format)
 
-        return self._api_requester.post(
+        return (
             self._PATH_STATUS,
             self._build_payload(
-                self.api_key, output_format, request_ids=request_ids)
+                api_key, output_format, request_ids=request_ids)
         )
 
+    def _filter_cached(self, kwargs: dict) -> dict or None:
+        """
+        Replace the emails with the cache misses.
+        :return: dict. Copy of `kwargs` with the misses, `kwargs` itself
+                without a cache, None if nothing is left to submit
+        """
+        cache = self._cache
+        if cache is None or not Client._validate_use_cache(kwargs) \
+                or 'emails' not in kwargs:
+            return kwargs
+
+        if Client._validate_preprocess(kwargs):
+            emails = iter_unique_emails(
+                Client._validate_email_iterable(kwargs['emails']))
+        else:
+            emails = Client._validate_emails(kwargs['emails'])
+
+        misses = cache.filter_misses(emails)
+        if not misses:
+            return None
+        return dict(kwargs, emails=misses, preprocess=False)
+
+    def _merge_records(self, emails: list, fresh: list) -> ResponseRecords:
+        found = {ResultCache.key(r.email_address): r for r in fresh}
+        keys = [ResultCache.key(email) for email in emails]
+
+        if self._cache is not None:
+            self._cache.put_many(fresh)
+            found.update(self._cache.lookup(
+                set(k for k in keys if k not in found)))
+
+        result = ResponseRecords(None)
+        result.data = [found[k] for k in keys if k in found]
+        return result
+
     @staticmethod
     def _build_payload(
             api_key,
@@ -487,6 +965,162 @@ class Client:
                 payload[k] = v
         return payload
 
+    def _build_response(self, path: str, response: bytes, model, *args):
+        """
+        Parse a response and construct its model, reporting both phases
+        to the observers
+        """
+        observers = self._api_requester.observers
+        if not observers:
+            return model(Client._parse_response(response), *args)
+
+        started = perf_counter()
+        parsed = Client._parse_response(response)
+        decoded = perf_counter()
+        result = model(parsed, *args)
+        notify_span(observers, path, Observer.DECODE, decoded - started)
+        notify_span(observers, path, Observer.BUILD,
+                    perf_counter() - decoded)
+        return result
+
+    @staticmethod
+    def _feed_parser(parser: JsonArrayParser, chunk: bytes or None) -> list:
+        try:
+            if chunk is not None:
+                return parser.feed(chunk)
+
+            items = parser.close()
+        except JSONDecodeError as error:
+            raise UnparsableApiResponseError(
+                    'Could not parse API response',
+                    error)
+
+        if not parser.found:
+            raise UnparsableApiResponseError(
+                'Cannot find the correct root element', None)
+        return items
+
+    @staticmethod
+    def _parse_request_id(response: str) -> int:
+        return int(Client._parse_response(response)['response']['id'])
+
+    @staticmethod
+    def _parse_response(response: bytes or str) -> dict:
+        try:
+            parsed = loads(response)
+        except JSONDecodeError as error:
+            raise UnparsableApiResponseError(
+                    'Could not parse API response',
+                    error)
+
+        if 'response' in parsed:
+            return parsed
+        raise UnparsableApiResponseError(
+            'Cannot find the correct root element', None)
+
+    @staticmethod
+    def _parse_requests_page(response: bytes, only_ids: bool) -> tuple:
+        """
+        :return: tuple. Last page number and the `BulkRequest` objects or
+                request IDs of the page
+        """
+        parsed = Client._parse_response(response)
+        if not only_ids:
+            page = ResponseRequests(parsed)
+            return page.last_page, page.data
+
+        page = parsed['response']
+        if type(page) is list:
+            return 1, [_request_id(x) for x in page]
+        if type(page) is not dict:
+            raise UnparsableApiResponseError(
+                'Cannot find the list of request IDs', None)
+        return int(page.get('last_page') or 1), \
+            [_request_id(x) for x in page.get('data') or ()]
+
+    @staticmethod
+    def _select_requests(items: list, seen: set, predicate) -> list:
+        selected = []
+        for item in items:
+            key = item if type(item) is int else item.id
+            if key in seen:
+                continue
+            seen.add(key)
+            if predicate is None or predicate(item):
+                selected.append(item)
+        return selected
+
+    @staticmethod
+    def _prepare_status_batches(kwargs: dict) -> tuple:
+        batch_size = Client.DEFAULT_STATUS_BATCH_SIZE
+        max_workers = Client.DEFAULT_MAX_WORKERS
+
+        request_ids = kwargs.get('request_ids')
+        if hasattr(request_ids, '__iter__') \
+                and not isinstance(request_ids, (list, str, bytes, dict)):
+            request_ids = list(request_ids)
+        # Repeated IDs are sent once, in the order of first appearance
+        request_ids = list(dict.fromkeys(
+            Client._validate_request_ids(request_ids)))
+
+        if 'batch_size' in kwargs:
+            batch_size = Client._validate_positive_int(
+                kwargs['batch_size'], 'Batch size')
+
+        if 'max_workers' in kwargs:
+            max_workers = Client._validate_positive_int(
+                kwargs['max_workers'], 'Max workers')
+
+        batches = [request_ids[i:i + batch_size]
+                   for i in range(0, len(request_ids), batch_size)]
+        return batches, max_workers
+
+    @staticmethod
+    def _preprocess_iterable(emails, kwargs: dict):
+        if not Client._validate_preprocess(kwargs):
+            return emails
+
+        window = None
+        if kwargs.get('dedupe_window') is not None:
+            window = Client._validate_positive_int(
+                kwargs['dedupe_window'], 'Dedupe window')
+        return iter_unique_emails(emails, window)
+
+    @staticmethod
+    def _prepare_download(kwargs: dict) -> tuple:
+        filename = None
+        compress = False
+        chunk_size = Client.DEFAULT_DOWNLOAD_CHUNK_SIZE
+
+        if 'filename' in kwargs:
+            filename = kwargs['filename']
+
+        if type(filename) is not str or not filename:
+            raise ParameterError('Output file name required')
+
+        if 'compress' in kwargs:
+            if type(kwargs['compress']) is not bool:
+                raise ParameterError('Compress parameter must be boolean')
+            compress = kwargs['compress']
+
+        if 'chunk_size' in kwargs:
+            chunk_size = Client._validate_positive_int(
+                kwargs['chunk_size'], 'Chunk size')
+
+        return _DownloadFile(filename, compress), chunk_size
+
+    @staticmethod
+    def _output_format(kwargs: dict, validate) -> str:
+        """
+        Format requested by a raw method call, `response_format` taking
+        precedence over `output_format`
+        """
+        if 'response_format' in kwargs:
+            return validate(kwargs['response_format'])
+        if 'output_format' in kwargs:
+            return validate(kwargs['output_format'])
+        return Client._PARSABLE_FORMAT
+
     @staticmethod
     def _validate_api_key(api_key) -> str:
         if Client._re_api_key.search(str(api_key)) is not None:
@@ -508,6 +1142,30 @@ class Client:
 
         raise ParameterError('Expected a list of emails')
 
+    @staticmethod
+    def _validate_email_iterable(value):
+        if value is None:
+            raise ParameterError('Email list cannot be None')
+        if isinstance(value, (str, bytes)) or not hasattr(value, '__iter__'):
+            raise ParameterError('Expected an iterable of emails')
+        return value
+
+    @staticmethod
+    def _validate_lazy(kwargs: dict) -> bool:
+        value = kwargs.get('lazy', False)
+        if type(value) is bool:
+            return value
+
+        raise ParameterError('Lazy parameter must be boolean')
+
+    @staticmethod
+    def _validate_merge_emails(kwargs: dict) -> list:
+        emails = list(Client._validate_email_iterable(kwargs.get('emails')))
+        for item in emails:
+            if type(item) is not str:
+                raise ParameterError('Incorrect email value')
+        return emails
+
     @staticmethod
     def _validate_only_ids(value: int) -> int:
         if type(value) is bool:
@@ -553,6 +1211,21 @@ class Client:
             f'Page size must be between {Client.MIN_PAGE_SIZE} '
             f'and {Client.MAX_PAGE_SIZE}')
 
+    @staticmethod
+    def _validate_positive_int(value: int, name: str) -> int:
+        if type(value) is int and value > 0:
+            return value
+
+        raise ParameterError(f'{name} must be a positive integer')
+
+    @staticmethod
+    def _validate_preprocess(kwargs: dict) -> bool:
+        value = kwargs.get('preprocess', False)
+        if type(value) is bool:
+            return value
+
+        raise ParameterError('Preprocess parameter must be boolean')
+
     @staticmethod
     def _validate_request_id(value: int) -> int:
         if type(value) is int and value > 0:
@@ -567,13 +1240,21 @@ class Client:
         elif type(value) is list:
             if len(value) < 1:
                 raise ParameterError('Request ID list cannot be empty')
-            for item in value:
-                if type(item) is not int:
-                    raise ParameterError('Incorrect request ID')
+            # Type check of all items without a Python level loop
+            if set(map(type, value)) != {int}:
+                raise ParameterError('Incorrect request ID')
             return value
 
         raise ParameterError('Expected a list of request IDs')
 
+    @staticmethod
+    def _validate_use_cache(kwargs: dict) -> bool:
+        value = kwargs.get('use_cache', True)
+        if type(value) is bool:
+            return value
+
+        raise ParameterError('Use cache parameter must be boolean')
+
     @staticmethod
     def _validate_return_failed(value: bool) -> bool:
         if type(value) is bool:
@@ -589,3 +1270,98 @@ class Client:
 
         raise ParameterError(
             f'Sort must be {Client.SORT_ASC} or {Client.SORT_DESC}')
+
+
+def _new_file_mode() -> int:
+    """
+    Mode `open()` gives a new file: mkstemp creates it as 0o600
+    """
+    # The umask can only be read by setting it
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+_NEW_FILE_MODE = _new_file_mode()
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _request_id(item) -> int:
+    try:
+        return int(item['id'] if type(item) is dict else item)
+    except (KeyError, TypeError, ValueError):
+        raise UnparsableApiResponseError('Incorrect request ID', None)
+
+
+class _DownloadFile:
+    """
+    Writes downloaded data to a temporary file and atomically moves it
+    to the target name on success. The temporary file is removed if the
+    download fails.
+    """
+
+    def __init__(self, filename: str, compress: bool):
+        self.filename = filename
+        self.bytes_written = 0
+
+        directory, name = os.path.split(os.path.abspath(filename))
+
+        try:
+            fd, self._tmp_name = tempfile.mkstemp(
+                prefix='.' + name + '.', suffix='.part', dir=directory)
+        except Exception:
+            raise FileError('Cannot open output file')
+
+        self._file = os.fdopen(fd, 'wb')
+        self._writer = self._file
+        if compress:
+            self._writer = gzip.GzipFile(
+                filename=name, mode='wb', fileobj=self._file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def write(self, chunk: bytes):
+        try:
+            self._writer.write(chunk)
+        except Exception:
+            self.abort()
+            raise FileError('Cannot write result to file')
+
+    def commit(self):
+        try:
+            if self._writer is not self._file:
+                self._writer.close()
+            self.bytes_written = self._file.tell()
+            self._file.close()
+
+            if os.path.exists(self.filename):
+                os.chmod(self._tmp_name, os.stat(self.filename).st_mode)
+            else:
+                os.chmod(self._tmp_name, _NEW_FILE_MODE)
+
+            os.replace(self._tmp_name, self.filename)
+        except Exception:
+            self.abort()
+            raise FileError('Cannot write result to file')
+
+    def abort(self):
+        try:
+            self._file.close()
+        finally:
+            if os.path.exists(self._tmp_name):
+                os.remove(self._tmp_name)
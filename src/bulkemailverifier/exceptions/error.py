@@ -55,6 +55,12 @@ class BadRequestError(ResponseError):
     pass
 
 
+class ApiConnectionError(BulkEmailVerificationApiError):
+    """
+    The API could not be reached. The network error is the `__cause__`
+    """
+
+
 class EmptyApiKeyError(BulkEmailVerificationApiError):
     pass
 
@@ -0,0 +1,135 @@
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from itertools import islice
+from operator import attrgetter
+
+import os
+import tempfile
+
+from .client import _NEW_FILE_MODE
+from .exceptions.error import FileError
+from .models.response import Record, ResponseRecords
+
+_FIELDS = Record.__slots__
+_CHECK_FIELDS = ('format_check', 'smtp_check', 'dns_check', 'free_check',
+                 'disposable_check', 'catch_all_check')
+_CATEGORY_FIELDS = ('result', 'error')
+
+DEFAULT_BATCH_SIZE = 65536
+
+_schema = None
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError(
+            'pyarrow is required for Arrow and Parquet export. '
+            'Install bulk-email-verifier[arrow]')
+
+
+def record_schema():
+    """
+    Arrow schema of the exported records: nullable booleans for the
+    checks, list<string> for mx_records and dictionary-encoded result
+    and error. The columns have the `Record` attribute names and order.
+    :return: pyarrow.Schema
+    """
+    global _schema
+
+    _require_pyarrow()
+    if _schema is None:
+        category = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+        types = {name: pyarrow.bool_() for name in _CHECK_FIELDS}
+        types.update({name: category for name in _CATEGORY_FIELDS})
+        types['email_address'] = pyarrow.string()
+        types['mx_records'] = pyarrow.list_(pyarrow.string())
+
+        _schema = pyarrow.schema([
+            pyarrow.field(name, types[name],
+                          nullable=name in _CHECK_FIELDS)
+            for name in _FIELDS
+        ])
+    return _schema
+
+
+def iter_record_batches(records, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Convert records to Arrow record batches, `batch_size` records at
+    a time
+    :param records: Iterable[Record] such as `Client.iter_records`,
+            `ResponseRecords` or `RecordFileReader`
+    :param batch_size: Max rows per batch
+    :return: Iterator[pyarrow.RecordBatch]
+    """
+    schema = record_schema()
+    if type(batch_size) is not int or batch_size < 1:
+        raise ValueError('Batch size should be a positive integer')
+    if isinstance(records, ResponseRecords):
+        records = records.data
+
+    # One tuple of all attributes per record, transposed into columns
+    values = map(attrgetter(*_FIELDS), records)
+    while True:
+        rows = list(islice(values, batch_size))
+        if not rows:
+            return
+
+        columns = [
+            pyarrow.array(column, field.type)
+            if not pyarrow.types.is_dictionary(field.type)
+            else pyarrow.array(column, pyarrow.string()).dictionary_encode()
+            for column, field in zip(zip(*rows), schema)
+        ]
+        yield pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_parquet(records, filename: str, **kwargs) -> int:
+    """
+    Stream records to a Parquet file. Records are converted and written
+    one row group at a time, so memory usage does not depend on the
+    number of records. The file replaces `filename` once it is complete.
+    :param records: Iterable[Record] such as `Client.iter_records`,
+            `ResponseRecords` or `RecordFileReader`
+    :param filename: Output file name
+    :key row_group_size: Optional. Max rows per row group.
+            `DEFAULT_BATCH_SIZE` by default
+    :key compression: Optional. Parquet compression codec.
+            'snappy' by default
+    :return: int. Number of rows written
+    :raises FileError: output file cannot be written
+    """
+    schema = record_schema()
+    row_group_size = kwargs.get('row_group_size', DEFAULT_BATCH_SIZE)
+    compression = kwargs.get('compression', 'snappy')
+
+    directory, name = os.path.split(os.path.abspath(filename))
+    try:
+        fd, tmp_name = tempfile.mkstemp(
+            prefix='.' + name + '.', suffix='.part', dir=directory)
+        os.close(fd)
+    except Exception:
+        raise FileError('Cannot open output file')
+
+    rows = 0
+    try:
+        with pyarrow.parquet.ParquetWriter(
+                tmp_name, schema, compression=compression) as writer:
+            for batch in iter_record_batches(records, row_group_size):
+                writer.write_batch(batch, row_group_size=row_group_size)
+                rows += batch.num_rows
+
+        if os.path.exists(filename):
+            os.chmod(tmp_name, os.stat(filename).st_mode)
+        else:
+            os.chmod(tmp_name, _NEW_FILE_MODE)
+        os.replace(tmp_name, filename)
+    except OSError:
+        raise FileError('Cannot write result to file')
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+    return rows
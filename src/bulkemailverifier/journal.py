@@ -0,0 +1,177 @@
+from json import dumps, loads, JSONDecodeError
+
+import hashlib
+import os
+import threading
+
+from .exceptions.error import FileError
+
+
+class ChunkState:
+    """
+    Progress of one chunk as recorded in a `JobJournal`
+    """
+    __slots__ = ('number', 'digest', 'request_id', 'ready', 'fetched', 'done')
+
+    def __init__(self, number: int, digest: str, request_id: int or None):
+        self.number = number
+        self.digest = digest
+        self.request_id = request_id
+        self.ready = False
+        self.fetched = 0
+        self.done = False
+
+
+class JobJournal:
+    """
+    Append-only record of a `VerificationPipeline` run.
+
+    Every created request, every request that becomes ready and the
+    number of records already yielded per chunk are appended to a
+    JSON-lines file. A pipeline restarted with the same input and the
+    same journal skips finished chunks, waits for the requests created
+    before the restart instead of submitting the emails again and
+    continues yielding records after the last checkpoint.
+
+        with JobJournal('job.jsonl') as journal:
+            for record in client.verify(emails=emails, journal=journal):
+                ...
+
+    Records yielded after the last checkpoint are yielded again on
+    restart, up to `checkpoint` records per chunk.
+    """
+
+    DEFAULT_CHECKPOINT = 1000
+
+    def __init__(self, path: str, **kwargs):
+        """
+        :param path: Journal file name, created if it does not exist
+        :key checkpoint: Optional. Record the yielded records offset every
+                this many records. `JobJournal.DEFAULT_CHECKPOINT` by default
+        :key fsync: Optional. Flush every entry to disk. False by default
+        :raises FileError: the journal cannot be read or written
+        """
+        self._checkpoint = JobJournal.DEFAULT_CHECKPOINT
+        self._fsync = False
+
+        if 'checkpoint' in kwargs:
+            if type(kwargs['checkpoint']) is not int \
+                    or kwargs['checkpoint'] < 1:
+                raise ValueError('Checkpoint should be a positive integer')
+            self._checkpoint = kwargs['checkpoint']
+        if 'fsync' in kwargs:
+            self._fsync = bool(kwargs['fsync'])
+
+        self._path = path
+        self._chunks = {}
+        self._lock = threading.Lock()
+
+        try:
+            self._file = open(path, 'a+b')
+            self._replay()
+        except OSError:
+            raise FileError('Cannot open journal file')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def checkpoint(self) -> int:
+        return self._checkpoint
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def request_ids(self) -> dict:
+        """Chunk number -> request ID of every created request"""
+        return {n: c.request_id for n, c in sorted(self._chunks.items())
+                if c.request_id is not None}
+
+    @staticmethod
+    def digest(chunk: list) -> str:
+        """Fingerprint of the emails of a chunk"""
+        return hashlib.sha1('\n'.join(chunk).encode('UTF-8')).hexdigest()
+
+    def chunk(self, number: int) -> ChunkState or None:
+        """
+        :return: `ChunkState` or None if the chunk was not submitted yet
+        """
+        return self._chunks.get(number)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def submitted(self, number: int, digest: str, request_id: int or None):
+        """
+        A request was created for the chunk. `request_id` is None if
+        every address had a cached result
+        """
+        self._chunks[number] = ChunkState(number, digest, request_id)
+        self._append({'event': 'submitted', 'chunk': number,
+                      'digest': digest, 'request_id': request_id})
+
+    def ready(self, number: int):
+        self._chunks[number].ready = True
+        self._append({'event': 'ready', 'chunk': number})
+
+    def fetched(self, number: int, offset: int):
+        """
+        The first `offset` records of the chunk have been yielded
+        """
+        self._chunks[number].fetched = offset
+        self._append({'event': 'fetched', 'chunk': number, 'offset': offset})
+
+    def done(self, number: int):
+        self._chunks[number].done = True
+        self._append({'event': 'done', 'chunk': number})
+
+    def _append(self, entry: dict):
+        line = dumps(entry, separators=(',', ':')).encode('UTF-8') + b'\n'
+        with self._lock:
+            try:
+                self._file.write(line)
+                self._file.flush()
+                if self._fsync:
+                    os.fsync(self._file.fileno())
+            except (OSError, ValueError):
+                raise FileError('Cannot write journal file')
+
+    def _replay(self):
+        self._file.seek(0)
+        content = self._file.read()
+
+        # An entry cut short by a crash is dropped
+        end = content.rfind(b'\n') + 1
+        if end < len(content):
+            self._file.truncate(end)
+
+        for number, line in enumerate(content[:end].splitlines(), 1):
+            try:
+                entry = loads(line.decode('UTF-8'))
+                self._apply(entry)
+            except (JSONDecodeError, UnicodeDecodeError, KeyError,
+                    TypeError):
+                raise FileError(
+                    'Corrupted journal entry on line {}'.format(number))
+
+    def _apply(self, entry: dict):
+        event = entry['event']
+        number = entry['chunk']
+
+        if event == 'submitted':
+            self._chunks[number] = ChunkState(
+                number, entry['digest'], entry['request_id'])
+        elif event == 'ready':
+            self._chunks[number].ready = True
+        elif event == 'fetched':
+            self._chunks[number].fetched = entry['offset']
+        elif event == 'done':
+            self._chunks[number].done = True
+        else:
+            raise KeyError(event)
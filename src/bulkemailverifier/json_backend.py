@@ -0,0 +1,75 @@
+from json import JSONDecodeError
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+ORJSON = 'orjson'
+UJSON = 'ujson'
+STDLIB = 'json'
+
+_LOADERS = {
+    ORJSON: None if orjson is None else orjson.loads,
+    UJSON: None if ujson is None else ujson.loads,
+    STDLIB: json.loads,
+}
+
+
+def available_backends() -> list:
+    """
+    :return: list[str]. Installed backends, fastest first
+    """
+    return [name for name in (ORJSON, UJSON, STDLIB)
+            if _LOADERS[name] is not None]
+
+
+_name = available_backends()[0]
+_loads = _LOADERS[_name]
+
+
+def get_backend() -> str:
+    """
+    :return: str. Name of the backend used to parse API responses
+    """
+    return _name
+
+
+def set_backend(backend):
+    """
+    Select the JSON parser used for API responses. The fastest installed
+    one is used by default: orjson, then ujson, then the standard library.
+    :param backend: ORJSON, UJSON, STDLIB or a callable
+            (bytes or str) -> object raising JSONDecodeError or ValueError
+    :raises ValueError: unknown or not installed backend
+    """
+    global _name, _loads
+
+    if callable(backend):
+        _name, _loads = getattr(backend, '__name__', 'custom'), backend
+        return
+
+    if _LOADERS.get(backend) is None:
+        raise ValueError('JSON backend is not available: {}'.format(backend))
+    _name, _loads = backend, _LOADERS[backend]
+
+
+def loads(data):
+    """
+    Parse a JSON document without decoding it to str first
+    :param data: bytes or str
+    :raises JSONDecodeError: the document is malformed
+    """
+    try:
+        return _loads(data)
+    except JSONDecodeError:
+        raise
+    except ValueError as error:
+        raise JSONDecodeError(str(error), '', 0)
@@ -1,10 +1,28 @@
+_field_names = {}
+
+
+def _slot_names(cls) -> tuple:
+    names = _field_names.get(cls)
+    if names is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            if type(slots) is str:
+                slots = (slots,)
+            names.extend(n for n in slots if not n.startswith('_'))
+        names = _field_names[cls] = tuple(names)
+    return names
+
+
 class BaseModel:
+    __slots__ = ()
+
     def __init__(self):
         pass
 
     def __str__(self):
         result = {}
-        for k, v in self.__dict__.items():
+        for k, v in self._fields().items():
             result[k] = str(v)
         return str(result)
 
@@ -12,13 +30,29 @@ class BaseModel:
         return self.__str__()
 
     def __eq__(self, other):
-        is_equal = isinstance(other, self.__class__)
-        for k, v in self.__dict__.values():
-            is_equal = is_equal and (other.__dict__.get(k) == v)
-
-        return is_equal
+        # Symmetric for subclasses, e.g. LazyRecord and Record
+        if not isinstance(other, BaseModel):
+            return False
+        return (isinstance(other, self.__class__)
+                or isinstance(self, other.__class__)) \
+            and self._fields() == other._fields()
 
     def __getitem__(self, item):
-        if type(item) is str and item in self.__dict__:
-            return self.__dict__[item]
+        if type(item) is str:
+            if item in _slot_names(type(self)) and hasattr(self, item):
+                return getattr(self, item)
+            if item in getattr(self, '__dict__', ()):
+                return self.__dict__[item]
         raise KeyError("Invalid key: {}".format(item))
+
+    def _fields(self) -> dict:
+        """Public attributes, both slotted and regular ones"""
+        fields = {}
+        for name in _slot_names(type(self)):
+            try:
+                fields[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        if hasattr(self, '__dict__'):
+            fields.update(self.__dict__)
+        return fields
@@ -29,11 +29,11 @@ def _int_value(values: dict, key: str) -> int:
     return 0
 
 
-def _list_of_objects(values: dict, key: str, classname: str) -> list:
-    r = []
-    if key in values and type(values[key]) is list:
-        r = [globals()[classname](x) for x in values[key]]
-    return r
+def _list_of_objects(values: dict, key: str, cls) -> list:
+    items = values.get(key)
+    if type(items) is list:
+        return [cls(x) for x in items]
+    return []
 
 
 def _list_value(values: dict, key: str) -> list:
@@ -42,12 +42,31 @@ def _list_value(values: dict, key: str) -> list:
     return []
 
 
+def _tuple_value(values: dict, key: str) -> tuple:
+    if key in values and type(values[key]) is list:
+        return tuple(values[key])
+    return ()
+
+
 def _string_value(values: dict, key: str) -> str:
     if key in values and values[key]:
         return str(values[key])
     return ''
 
 
+_MISSING = object()
+
+# Precomputed `_bool_value` results for the values the API actually sends.
+# Anything else (or unhashable) falls back to `_bool_value`.
+_BOOLS = {
+    _MISSING: None,
+    'true': True, 'True': True, 'TRUE': True, '1': True,
+    'false': False, 'False': False, 'FALSE': False, '0': False, '': False,
+    'null': None, 'NULL': None, 'Null': None,
+    True: True, False: False, None: False,
+}
+
+
 def _timestamp2datetime(timestamp) -> datetime.datetime or None:
     if timestamp is not None:
         return datetime.datetime.utcfromtimestamp(timestamp)
@@ -55,6 +74,9 @@ def _timestamp2datetime(timestamp) -> datetime.datetime or None:
 
 
 class BulkRequest(BaseModel):
+    __slots__ = ('id', 'date_start', 'total_emails', 'invalid_emails',
+                 'processed_emails', 'failed_emails', 'ready')
+
     id: int
     date_start: datetime.datetime or None
     total_emails: int
@@ -65,30 +87,45 @@ class BulkRequest(BaseModel):
 
     def __init__(self, values):
         super().__init__()
-        self.id = 0
-        self.date_start = None
-        self.total_emails = 0
-        self.invalid_emails = 0
-        self.processed_emails = 0
-        self.failed_emails = 0
-        self.ready = False
-
-        if values is not None:
-            self.id = _int_value(values, 'id')
 
-            if 'date_start' in values:
-                self.date_start = _timestamp2datetime(
-                    _int_value(values, 'date_start')
-                )
+        if values is None:
+            self.id = 0
+            self.date_start = None
+            self.total_emails = 0
+            self.invalid_emails = 0
+            self.processed_emails = 0
+            self.failed_emails = 0
+            self.ready = False
+            return
+
+        # Inlined `_int_value` calls, this runs once per listed request
+        get = values.get
+        value = get('id')
+        self.id = int(value) if value else 0
 
-            self.total_emails = _int_value(values, 'total_emails')
-            self.invalid_emails = _int_value(values, 'invalid_emails')
-            self.processed_emails = _int_value(values, 'processed_emails')
-            self.failed_emails = _int_value(values, 'failed_emails')
+        self.date_start = None
+        if 'date_start' in values:
+            value = values['date_start']
+            self.date_start = _timestamp2datetime(int(value) if value else 0)
+
+        value = get('total_emails')
+        self.total_emails = int(value) if value else 0
+        value = get('invalid_emails')
+        self.invalid_emails = int(value) if value else 0
+        value = get('processed_emails')
+        self.processed_emails = int(value) if value else 0
+        value = get('failed_emails')
+        self.failed_emails = int(value) if value else 0
+
+        try:
+            self.ready = _BOOLS[get('ready', _MISSING)]
+        except (KeyError, TypeError):
             self.ready = _bool_value(values, 'ready')
 
 
 class ErrorMessage(BaseModel):
+    __slots__ = ('code', 'message')
+
     code: int
 
     if sys.version_info < (3, 9):
@@ -111,6 +148,10 @@ class ErrorMessage(BaseModel):
 
 
 class Record(BaseModel):
+    __slots__ = ('email_address', 'format_check', 'smtp_check', 'dns_check',
+                 'free_check', 'disposable_check', 'catch_all_check',
+                 'mx_records', 'result', 'error')
+
     email_address: str
     format_check: bool or None
     smtp_check: bool or None
@@ -122,35 +163,128 @@ class Record(BaseModel):
     error: str
 
     if sys.version_info < (3, 9):
-        mx_records: typing.List[str]
+        mx_records: typing.Tuple[str, ...]
     else:
-        mx_records: [str]
+        mx_records: (str, ...)
 
     def __init__(self, values):
         super().__init__()
 
-        self.email_address = ''
-        self.format_check = False
-        self.smtp_check = None
-        self.dns_check = None
-        self.free_check = None
-        self.disposable_check = None
-        self.catch_all_check = None
-        self.mx_records = []
-        self.result = ''
-        self.error = ''
-
-        if values is not None:
-            self.email_address = _string_value(values, 'emailAddress')
+        if values is None:
+            self.email_address = ''
+            self.format_check = False
+            self.smtp_check = None
+            self.dns_check = None
+            self.free_check = None
+            self.disposable_check = None
+            self.catch_all_check = None
+            self.mx_records = ()
+            self.result = ''
+            self.error = ''
+            return
+
+        # Same conversions as `_string_value`, `_bool_value` and
+        # `_tuple_value`, inlined as this runs once per email
+        get = values.get
+        value = get('emailAddress')
+        self.email_address = str(value) if value else ''
+
+        try:
+            self.format_check = _BOOLS[get('formatCheck', _MISSING)]
+            self.smtp_check = _BOOLS[get('smtpCheck', _MISSING)]
+            self.dns_check = _BOOLS[get('dnsCheck', _MISSING)]
+            self.free_check = _BOOLS[get('freeCheck', _MISSING)]
+            self.disposable_check = _BOOLS[get('disposableCheck', _MISSING)]
+            self.catch_all_check = _BOOLS[get('catchAllCheck', _MISSING)]
+        except (KeyError, TypeError):
             self.format_check = _bool_value(values, 'formatCheck')
             self.smtp_check = _bool_value(values, 'smtpCheck')
             self.dns_check = _bool_value(values, 'dnsCheck')
             self.free_check = _bool_value(values, 'freeCheck')
             self.disposable_check = _bool_value(values, 'disposableCheck')
             self.catch_all_check = _bool_value(values, 'catchAllCheck')
-            self.mx_records = _list_value(values, 'mxRecords')
-            self.result = _string_value(values, 'result')
-            self.error = _string_value(values, 'error')
+
+        value = get('mxRecords')
+        self.mx_records = tuple(value) if type(value) is list else ()
+        value = get('result')
+        self.result = str(value) if value else ''
+        value = get('error')
+        self.error = str(value) if value else ''
+
+
+_STRING = 0
+_BOOL = 1
+_TUPLE = 2
+
+
+def _lazy_field(name: str, key: str, kind: int) -> property:
+    """
+    `LazyRecord` field converting the raw value of `key` on access.
+    Strings and booleans are converted on every read, which is cheaper
+    than caching them; the mx_records tuple is built once and stored in
+    the slot inherited from `Record`, as are explicitly assigned values.
+    """
+    slot = Record.__dict__[name]
+    get_slot, set_slot = slot.__get__, slot.__set__
+
+    def setter(self, value):
+        if self._assigned is None:
+            self._assigned = set()
+        self._assigned.add(name)
+        set_slot(self, value)
+
+    if kind == _STRING:
+        def getter(self):
+            if self._assigned is not None and name in self._assigned:
+                return get_slot(self)
+            value = self._values.get(key)
+            return str(value) if value else ''
+    elif kind == _BOOL:
+        def getter(self):
+            if self._assigned is not None and name in self._assigned:
+                return get_slot(self)
+            try:
+                return _BOOLS[self._values.get(key, _MISSING)]
+            except (KeyError, TypeError):
+                return _bool_value(self._values, key)
+    else:
+        def getter(self):
+            if self._assigned is not None and name in self._assigned:
+                return get_slot(self)
+            value = _tuple_value(self._values, key)
+            setter(self, value)
+            return value
+
+    return property(getter, setter)
+
+
+class LazyRecord(Record):
+    """
+    `Record` view over a parsed API dict. Creating one does not depend on
+    the number of fields and fields that are never read are never
+    converted. The attributes behave exactly like the `Record` ones.
+    """
+    __slots__ = ('_values', '_assigned')
+
+    email_address = _lazy_field('email_address', 'emailAddress', _STRING)
+    format_check = _lazy_field('format_check', 'formatCheck', _BOOL)
+    smtp_check = _lazy_field('smtp_check', 'smtpCheck', _BOOL)
+    dns_check = _lazy_field('dns_check', 'dnsCheck', _BOOL)
+    free_check = _lazy_field('free_check', 'freeCheck', _BOOL)
+    disposable_check = _lazy_field(
+        'disposable_check', 'disposableCheck', _BOOL)
+    catch_all_check = _lazy_field('catch_all_check', 'catchAllCheck', _BOOL)
+    mx_records = _lazy_field('mx_records', 'mxRecords', _TUPLE)
+    result = _lazy_field('result', 'result', _STRING)
+    error = _lazy_field('error', 'error', _STRING)
+
+    def __init__(self, values):
+        self._assigned = None
+        if values is None:
+            self._values = {}
+            super().__init__(None)
+        else:
+            self._values = values
 
 
 class ResponseRecords(BaseModel):
@@ -159,13 +293,28 @@ class ResponseRecords(BaseModel):
     else:
         data: [Record]
 
-    def __init__(self, values):
+    def __init__(self, values, lazy: bool = False):
+        """
+        :param values: Parsed API response
+        :param lazy: Create `LazyRecord` objects converting their fields on
+                first access. False by default
+        """
         super().__init__()
 
         self.data = []
 
         if values is not None:
-            self.data = _list_of_objects(values, 'response', 'Record')
+            self.data = _list_of_objects(
+                values, 'response', LazyRecord if lazy else Record)
+
+    def to_table(self):
+        """
+        Columnar copy of the records for aggregate statistics
+        :return: `RecordTable` instance
+        """
+        from .table import RecordTable
+
+        return RecordTable(self.data)
 
 
 class ResponseStatus(BaseModel):
@@ -178,7 +327,7 @@ class ResponseStatus(BaseModel):
         super().__init__()
 
         if values is not None and 'response' in values:
-            self.data = _list_of_objects(values, 'response', 'BulkRequest')
+            self.data = _list_of_objects(values, 'response', BulkRequest)
 
 
 class ResponseRequests(ResponseStatus):
@@ -207,4 +356,4 @@ class ResponseRequests(ResponseStatus):
             self.per_page = _int_value(response, 'per_page')
             self.to_requests = _int_value(response, 'to')
             self.total = _int_value(response, 'total')
-            self.data = _list_of_objects(response, 'data', 'BulkRequest')
+            self.data = _list_of_objects(response, 'data', BulkRequest)
@@ -0,0 +1,164 @@
+from json import JSONDecoder, JSONDecodeError
+
+import codecs
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+_START = 0
+_KEY_OR_END = 1
+_KEY = 2
+_COLON = 3
+_VALUE = 4
+_ITEM_OR_END = 5
+_ITEM = 6
+_AFTER_ITEM = 7
+_AFTER_MEMBER = 8
+_END = 9
+
+_INCOMPLETE = object()
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+class JsonArrayParser:
+    """
+    Incremental parser for API responses shaped like {"<key>": [...]}.
+
+    Data is pushed with `feed` as it arrives from the network; every call
+    returns the array items completed so far, so only the unparsed tail
+    of the document is kept in memory.
+    """
+
+    def __init__(self, key: str = 'response'):
+        self.found = False
+
+        self._key = key
+        self._current_key = None
+        self._decoder = JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('UTF-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _START
+        self._eof = False
+
+    def feed(self, data: bytes) -> list:
+        """
+        :param data: Next part of the document
+        :return: list of array items completed by this part
+        :raises JSONDecodeError: the document is malformed
+        """
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(data)
+        self._pos = 0
+        return self._parse()
+
+    def close(self) -> list:
+        """
+        Signal the end of the document
+        :return: list of remaining array items
+        :raises JSONDecodeError: the document is malformed or truncated
+        """
+        self._buffer = \
+            self._buffer[self._pos:] + self._utf8.decode(b'', final=True)
+        self._pos = 0
+        self._eof = True
+
+        items = self._parse()
+        if self._state != _END:
+            raise JSONDecodeError(
+                'Unexpected end of data', self._buffer, self._pos)
+        return items
+
+    def _parse(self) -> list:
+        items = []
+        buffer = self._buffer
+
+        while True:
+            pos = _WHITESPACE.match(buffer, self._pos).end()
+            self._pos = pos
+            if pos >= len(buffer):
+                return items
+
+            char = buffer[pos]
+            state = self._state
+
+            if state == _ITEM or (state == _ITEM_OR_END and char != ']'):
+                decoded = self._decode(pos)
+                if decoded is _INCOMPLETE:
+                    return items
+                items.append(decoded)
+                self._state = _AFTER_ITEM
+            elif state == _ITEM_OR_END or state == _AFTER_ITEM:
+                if char == ',' and state == _AFTER_ITEM:
+                    self._state = _ITEM
+                elif char == ']':
+                    self._state = _AFTER_MEMBER
+                else:
+                    self._fail('Expecting \',\' delimiter or \']\'')
+                self._pos += 1
+            elif state == _START:
+                if char != '{':
+                    self._fail('Expecting \'{\'')
+                self._state = _KEY_OR_END
+                self._pos += 1
+            elif state == _KEY or state == _KEY_OR_END:
+                if char == '}' and state == _KEY_OR_END:
+                    self._state = _END
+                    self._pos += 1
+                    continue
+                if char != '"':
+                    self._fail('Expecting property name enclosed in '
+                               'double quotes')
+                decoded = self._decode(pos)
+                if decoded is _INCOMPLETE:
+                    return items
+                self._current_key = decoded
+                self._state = _COLON
+            elif state == _COLON:
+                if char != ':':
+                    self._fail('Expecting \':\' delimiter')
+                self._state = _VALUE
+                self._pos += 1
+            elif state == _VALUE:
+                if self._current_key == self._key:
+                    self.found = True
+                    if char == '[':
+                        self._state = _ITEM_OR_END
+                        self._pos += 1
+                        continue
+                if self._decode(pos) is _INCOMPLETE:
+                    return items
+                self._state = _AFTER_MEMBER
+            elif state == _AFTER_MEMBER:
+                if char == ',':
+                    self._state = _KEY
+                elif char == '}':
+                    self._state = _END
+                else:
+                    self._fail('Expecting \',\' delimiter or \'}\'')
+                self._pos += 1
+            else:
+                self._fail('Extra data')
+
+    def _decode(self, pos: int):
+        """
+        Decode a complete value at `pos` and move past it.
+        Returns _INCOMPLETE when more data is needed.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except JSONDecodeError:
+            if self._eof:
+                raise
+            return _INCOMPLETE
+
+        # A number at the end of the buffer may continue in the next part
+        if not self._eof and (end == len(self._buffer) or (
+                type(value) in (int, float)
+                and self._buffer[end] in _NUMBER_CHARS)):
+            return _INCOMPLETE
+
+        self._pos = end
+        return value
+
+    def _fail(self, message: str):
+        raise JSONDecodeError(message, self._buffer, self._pos)
@@ -0,0 +1,242 @@
+from array import array
+from collections import Counter
+
+import sys
+
+from .response import Record
+
+_FALSE = 0
+_TRUE = 1
+_NULL = 2
+
+_BOOL_CODES = {False: _FALSE, True: _TRUE, None: _NULL}
+_BOOL_VALUES = (False, True, None)
+
+# Category code arrays by width: one, two, then four bytes per row
+_WIDE_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+
+def _bit_table(code: int) -> bytes:
+    """translate() table mapping `code` to b'1' and everything else to b'0'"""
+    table = bytearray(b'0' * 256)
+    table[code] = ord('1')
+    return bytes(table)
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+class RecordTable:
+    """
+    Columnar storage for verification results.
+
+    Tri-state checks are stored as one byte per row, `result` and `error`
+    as interned category codes and email addresses as offsets into one
+    shared UTF-8 buffer. Filters return row masks (int bitsets, bit N is
+    row N) which can be combined with `&`, `|` and `~` and counted with
+    `count`, all without per-row Python code.
+
+        table = client.get_records(request_id=request_id).to_table()
+        risky = table.where('disposable_check', True) \\
+            | table.where('catch_all_check', True)
+        table.count(risky)
+        table.group_count('result', risky)
+    """
+
+    BOOL_COLUMNS = ('format_check', 'smtp_check', 'dns_check', 'free_check',
+                    'disposable_check', 'catch_all_check')
+    CATEGORY_COLUMNS = ('result', 'error')
+
+    def __init__(self, records=()):
+        """
+        :param records: Iterable[Record]
+        """
+        self._size = 0
+        self._addresses = bytearray()
+        self._offsets = array('Q', [0])
+        self._mx_records = []
+        self._mx_interned = {}
+        self._bools = {c: bytearray() for c in RecordTable.BOOL_COLUMNS}
+        self._codes = {c: bytearray() for c in RecordTable.CATEGORY_COLUMNS}
+        self._categories = {c: {} for c in RecordTable.CATEGORY_COLUMNS}
+        self._names = {c: [] for c in RecordTable.CATEGORY_COLUMNS}
+        self._masks = {}
+
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Record:
+        return self.record(index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self.record(i)
+
+    @property
+    def all(self) -> int:
+        """Mask selecting every row"""
+        return (1 << self._size) - 1
+
+    def append(self, record: Record):
+        address = record.email_address.encode('UTF-8')
+        self._addresses += address
+        self._offsets.append(len(self._addresses))
+        mx_records = tuple(record.mx_records)
+        self._mx_records.append(
+            self._mx_interned.setdefault(mx_records, mx_records))
+
+        for column, codes in self._bools.items():
+            codes.append(_BOOL_CODES[getattr(record, column)])
+
+        for column in RecordTable.CATEGORY_COLUMNS:
+            code = self._intern(column, getattr(record, column))
+            self._codes[column].append(code)
+
+        self._size += 1
+        self._masks.clear()
+
+    def extend(self, records):
+        """
+        :param records: Iterable[Record]
+        """
+        for record in records:
+            self.append(record)
+
+    def email(self, index: int) -> str:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._addresses[start:end].decode('UTF-8')
+
+    def record(self, index: int) -> Record:
+        """Restore the `Record` stored at `index`"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('Row index out of range')
+
+        record = Record(None)
+        record.email_address = self.email(index)
+        record.mx_records = self._mx_records[index]
+        for column, codes in self._bools.items():
+            setattr(record, column, _BOOL_VALUES[codes[index]])
+        for column, codes in self._codes.items():
+            setattr(record, column, self._names[column][codes[index]])
+        return record
+
+    def where(self, column: str, value) -> int:
+        """
+        Mask of the rows where `column` equals `value`.
+        For check columns `value` is True, False or None.
+        """
+        key = (column, value)
+        mask = self._masks.get(key)
+        if mask is not None:
+            return mask
+
+        if column in self._bools:
+            if value not in _BOOL_CODES:
+                raise ValueError('Check value must be True, False or None')
+            mask = self._code_mask(self._bools[column], _BOOL_CODES[value])
+        elif column in self._codes:
+            code = self._categories[column].get(value)
+            mask = 0 if code is None \
+                else self._code_mask(self._codes[column], code)
+        else:
+            raise KeyError("Invalid column: {}".format(column))
+
+        self._masks[key] = mask
+        return mask
+
+    def count(self, mask: int = None) -> int:
+        """Number of rows selected by `mask`, all rows by default"""
+        if mask is None:
+            return self._size
+        return _popcount(mask & self.all)
+
+    def group_count(self, column: str, mask: int = None) -> dict:
+        """
+        Number of rows per distinct value of `column`
+        :param mask: Optional. Count only the selected rows
+        :return: dict. Value -> number of rows
+        """
+        if column in self._bools:
+            values = _BOOL_VALUES
+            codes = self._bools[column]
+        elif column in self._codes:
+            values = self._names[column]
+            codes = self._codes[column]
+        else:
+            raise KeyError("Invalid column: {}".format(column))
+
+        if type(codes) is not bytearray:
+            # Too many values for a pass per value: count the codes of
+            # the selected rows in one pass
+            selected = codes if mask is None \
+                else map(codes.__getitem__, self.indices(mask))
+            counts = Counter(selected)
+            return {values[code]: counts[code] for code in sorted(counts)}
+
+        result = {}
+        for code, value in enumerate(values):
+            if mask is None:
+                count = codes.count(code)
+            else:
+                count = self.count(mask & self.where(column, value))
+            if count:
+                result[value] = count
+        return result
+
+    def indices(self, mask: int):
+        """
+        Row numbers selected by `mask` in ascending order
+        :return: Iterator[int]
+        """
+        mask &= self.all
+        data = mask.to_bytes((self._size + 7) // 8, 'little')
+        for byte_index, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                yield byte_index * 8 + low.bit_length() - 1
+                byte ^= low
+
+    def records(self, mask: int):
+        """
+        Records selected by `mask`
+        :return: Iterator[Record]
+        """
+        for index in self.indices(mask):
+            yield self.record(index)
+
+    def _intern(self, column: str, value: str) -> int:
+        categories = self._categories[column]
+        code = categories.get(value)
+        if code is None:
+            code = categories[value] = len(categories)
+            self._names[column].append(value)
+            if code == 0x100:
+                # Rare: switch to two bytes per row
+                self._codes[column] = array('H', list(self._codes[column]))
+            elif code == 0x10000:
+                # Free text such as `error`: switch to four bytes per row
+                self._codes[column] = array(_WIDE_TYPECODE,
+                                            self._codes[column])
+        return code
+
+    @staticmethod
+    def _code_mask(codes, code: int) -> int:
+        if not codes:
+            return 0
+        if type(codes) is bytearray:
+            return int(codes.translate(_bit_table(code))[::-1], 2)
+
+        # Every byte of a wide code is matched separately, a row is
+        # selected when all of them match
+        width = codes.itemsize
+        data = codes.tobytes()
+        mask = -1
+        for offset, byte in enumerate(code.to_bytes(width, sys.byteorder)):
+            mask &= int(data[offset::width].translate(
+                _bit_table(byte))[::-1], 2)
+        return mask
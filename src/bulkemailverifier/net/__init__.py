@@ -1,3 +1,14 @@
-__all__ = ['ApiRequester']
+__all__ = ['AiohttpTransport', 'ApiRequester', 'AsyncApiRequester',
+           'AsyncFakeTransport', 'AsyncTransport', 'FakeApi', 'FakeTransport',
+           'FileRateLimiter', 'Histogram', 'MetricsRecorder', 'Observer',
+           'RateLimiter', 'RequestsTransport', 'RetryPolicy',
+           'TokenBucketRateLimiter', 'Transport']
 
 from .http import ApiRequester
+from .async_http import AsyncApiRequester
+from .fake import AsyncFakeTransport, FakeApi, FakeTransport
+from .observer import Histogram, MetricsRecorder, Observer
+from .ratelimit import FileRateLimiter, RateLimiter, TokenBucketRateLimiter
+from .retry import RetryPolicy
+from .transport import AiohttpTransport, AsyncTransport, RequestsTransport, \
+    Transport
@@ -0,0 +1,205 @@
+from json import dumps
+from time import monotonic, perf_counter
+
+import asyncio
+
+from .http import ApiRequester
+from .observer import Observer, notify_attempt, notify_span, \
+    notify_transfer
+from .transport import AiohttpTransport, AsyncTransport, \
+    aiohttp  # noqa: F401 (None when aiohttp is not installed)
+from ..exceptions.error import ApiConnectionError
+
+
+class AsyncApiRequester(ApiRequester):
+    """
+    asyncio counterpart of `ApiRequester` built on an aiohttp session.
+
+    Requires the optional `aiohttp` dependency
+    (pip install bulk-email-verifier[async]) unless another
+    `AsyncTransport` is used.
+    """
+
+    _transport: AsyncTransport
+
+    _transport_class = AsyncTransport
+
+    def __init__(self, **kwargs):
+        """
+        :param kwargs: Supported parameters:
+        - base_url: (optional) API endpoint URL; str
+        - timeout: (optional) API call timeout in seconds; float
+        - pool_connections: (optional) Number of per-host connection pools
+            to keep; int
+        - pool_maxsize: (optional) Maximum number of concurrent
+            connections per host; int
+        - retry_policy: (optional) Retry failed calls, no retries
+            by default; RetryPolicy
+        - rate_limiter: (optional) Client-side limit of calls per API
+            path, no limit by default. A `blocking` limiter such as
+            `FileRateLimiter` is called in the default executor;
+            RateLimiter
+        - transport: (optional) Sends the HTTP calls. A pooled
+            `AiohttpTransport` by default; AsyncTransport
+        """
+        super().__init__(**kwargs)
+
+    def __enter__(self):
+        raise TypeError('Use "async with" instead')
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close all pooled connections. The requester stays usable,
+        a new pool is created on the next call.
+        """
+        await self._transport.close()
+
+    async def post(self, path: str, data: dict) -> str:
+        return (await self.post_bytes(path, data)).decode('UTF-8')
+
+    async def post_bytes(self, path: str, data: dict) -> bytes:
+        """
+        Send a request and return the response body without decoding it
+        """
+        response = await self._send(self._settings, path, data, False)
+        content = await response.read()
+
+        if 200 <= response.status < 300:
+            return content
+
+        ApiRequester._raise_for_status(
+            response.status, content.decode('UTF-8', 'replace'))
+
+    async def stream(self, path: str, data: dict, chunk_size: int = 65536):
+        """
+        Send a request and iterate over the response body in chunks
+        without loading it into memory
+        :return: AsyncIterator[bytes]
+        """
+        settings = self._settings
+        response = await self._send(settings, path, data, True)
+
+        try:
+            if not 200 <= response.status < 300:
+                content = await response.read()
+                ApiRequester._raise_for_status(
+                    response.status, content.decode('UTF-8', 'replace'))
+
+            chunks = response.content.iter_chunked(chunk_size)
+            if settings.observers:
+                chunks = AsyncApiRequester._observe_chunks(
+                    settings.observers, path, chunks)
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            response.release()
+
+    async def _send(self, settings, path: str, data: dict, stream: bool):
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': ApiRequester._user_agent,
+        }
+        body = dumps(data).encode('UTF-8')
+
+        observers = settings.observers
+        rate_limiter = settings.rate_limiter
+
+        started = monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            if rate_limiter is not None:
+                if rate_limiter.blocking:
+                    delay = await asyncio.get_event_loop().run_in_executor(
+                        None, rate_limiter.reserve, path)
+                else:
+                    delay = rate_limiter.reserve(path)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if observers:
+                    notify_span(observers, path, Observer.RATE_LIMIT,
+                                max(delay, 0.0))
+
+            sent = perf_counter() if observers else 0.0
+            try:
+                response = await self._transport.post(
+                    settings.base_url + path,
+                    body,
+                    headers,
+                    (ApiRequester._connect_timeout, settings.timeout),
+                    stream
+                )
+            except Exception as error:
+                kind = self._transport.error_kind(error)
+                if kind is None and not isinstance(error, OSError):
+                    raise
+                if observers:
+                    notify_attempt(observers, path, attempt, None,
+                                   len(body), None)
+                delay = None if kind is None else ApiRequester._retry_delay(
+                    settings, path, attempt, started, error_kind=kind)
+                if delay is None:
+                    raise ApiConnectionError(repr(error)) from error
+                ApiRequester._logger.warning(
+                    'Retrying %s in %.2fs after %r', path, delay, error)
+                ApiRequester._observe_retry(
+                    observers, path, attempt, delay, kind)
+                await asyncio.sleep(delay)
+                continue
+
+            if observers:
+                ApiRequester._observe_response(
+                    observers, path, attempt, response.status,
+                    perf_counter() - sent, len(body),
+                    None if stream else len(await response.read()))
+
+            if 200 <= response.status < 300:
+                return response
+
+            delay = ApiRequester._retry_delay(
+                settings, path, attempt, started,
+                status_code=response.status,
+                retry_after=response.headers.get('Retry-After'))
+            if delay is None:
+                return response
+
+            response.release()
+            ApiRequester._logger.warning(
+                'Retrying %s in %.2fs after HTTP %d',
+                path, delay, response.status)
+            ApiRequester._observe_retry(
+                observers, path, attempt, delay, response.status)
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _observe_chunks(observers: tuple, path: str, chunks):
+        size = 0
+        spent = 0.0
+        try:
+            while True:
+                started = perf_counter()
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    spent += perf_counter() - started
+                size += len(chunk)
+                yield chunk
+        finally:
+            notify_span(observers, path, Observer.TRANSFER, spent)
+            notify_transfer(observers, path, size)
+
+    def _create_transport(self) -> AsyncTransport:
+        return AiohttpTransport(self._pool_connections, self._pool_maxsize)
@@ -0,0 +1,399 @@
+from json import dumps, loads
+from time import monotonic, sleep, time
+
+import asyncio
+import random
+import threading
+import zlib
+
+from .retry import RetryPolicy
+from .transport import AsyncTransport, Transport
+
+_CSV_HEADER = '"Email Address","Format Check","SMTP Check","DNS Check",' \
+              '"Free Check","Disposable Check","Catch All Check",' \
+              '"MX Records","Result","Error"\n'
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+_CSV_HEADERS = {'Content-Type': 'text/csv'}
+
+
+class _FakeRequest:
+    __slots__ = ('id', 'emails', 'failed', 'created', 'date_start')
+
+    def __init__(self, request_id: int, emails: list, failed: list,
+                 created: float):
+        self.id = request_id
+        self.emails = emails
+        self.failed = failed
+        self.created = created
+        self.date_start = int(time())
+
+
+class FakeApi:
+    """
+    In-process simulation of the Bulk Email Verification API for offline
+    tests, load tests and benchmarks.
+
+    Every created request is processed at `emails_per_second` from the
+    moment it is created. Each call takes `latency` seconds and fails at
+    the configured rates, with HTTP 500 or with a connection error. The
+    verification results are derived from the addresses and the errors
+    from `seed`, so runs with the same input are reproducible.
+
+        api = FakeApi(latency=0.05, emails_per_second=5000, error_rate=0.01)
+        client = Client('Your API key', transport=FakeTransport(api),
+                        retry_policy=RetryPolicy())
+    """
+
+    PATHS = ('/request', '/request/status', '/request/completed',
+             '/request/failed', '/request/list')
+
+    def __init__(self, **kwargs):
+        """
+        :key latency: Optional. Seconds every call takes or a
+                (min, max) tuple for a uniformly distributed latency.
+                0 by default
+        :key emails_per_second: Optional. Processing speed of every
+                request. None (instant) by default
+        :key error_rate: Optional. Fraction of calls answered with
+                HTTP 500. 0 by default
+        :key connection_error_rate: Optional. Fraction of calls failing
+                with `ConnectionResetError`. 0 by default
+        :key invalid_rate: Optional. Fraction of the addresses reported
+                as failed instead of completed. 0 by default
+        :key seed: Optional. Seed of the error and latency generator.
+                0 by default
+        """
+        self._latency = (0.0, 0.0)
+        self._speed = None
+        self._error_rate = 0.0
+        self._connection_error_rate = 0.0
+        self._invalid_rate = 0.0
+
+        if 'latency' in kwargs:
+            latency = kwargs['latency']
+            if type(latency) in (int, float):
+                latency = (latency, latency)
+            if type(latency) is not tuple or len(latency) != 2 \
+                    or not 0 <= latency[0] <= latency[1]:
+                raise ValueError('Latency should be a non-negative number '
+                                 'or a (min, max) tuple')
+            self._latency = (float(latency[0]), float(latency[1]))
+        if kwargs.get('emails_per_second') is not None:
+            self._speed = kwargs['emails_per_second']
+            if type(self._speed) not in (int, float) or self._speed <= 0:
+                raise ValueError(
+                    'Emails per second should be a positive number')
+        if 'error_rate' in kwargs:
+            self._error_rate = _validate_rate(
+                kwargs['error_rate'], 'Error rate')
+        if 'connection_error_rate' in kwargs:
+            self._connection_error_rate = _validate_rate(
+                kwargs['connection_error_rate'], 'Connection error rate')
+        if 'invalid_rate' in kwargs:
+            self._invalid_rate = _validate_rate(
+                kwargs['invalid_rate'], 'Invalid rate')
+
+        self._random = random.Random(kwargs.get('seed', 0))
+        self._lock = threading.Lock()
+        self._requests = {}
+        self.calls = {path: 0 for path in FakeApi.PATHS}
+
+    def path(self, url: str) -> str or None:
+        """
+        API method of a URL, None if it is not simulated
+        """
+        for path in sorted(FakeApi.PATHS, key=len, reverse=True):
+            if url.endswith(path):
+                return path
+        return None
+
+    def latency(self) -> float:
+        """
+        Seconds the next call should take
+        """
+        low, high = self._latency
+        if low == high:
+            return low
+        with self._lock:
+            return self._random.uniform(low, high)
+
+    def handle(self, path: str, payload: dict) -> tuple:
+        """
+        Answer an API call without waiting for the latency
+        :return: tuple. HTTP status code, body bytes and headers
+        :raises ConnectionResetError: a simulated connection error
+        """
+        with self._lock:
+            if path in self.calls:
+                self.calls[path] += 1
+            roll = self._random.random()
+
+        if roll < self._connection_error_rate:
+            raise ConnectionResetError('Simulated connection error')
+        if roll < self._connection_error_rate + self._error_rate:
+            return _json(500, {'error': 'Simulated server error'})
+        if not payload.get('apiKey'):
+            return _json(401, {'error': 'Access restricted'})
+
+        if path == '/request':
+            return self._create(payload)
+        if path == '/request/status':
+            return self._status(payload)
+        if path in ('/request/completed', '/request/failed'):
+            return self._records(payload, path == '/request/failed')
+        if path == '/request/list':
+            return self._list(payload)
+        return _json(404, {'error': 'Not found'})
+
+    def _create(self, payload: dict) -> tuple:
+        emails = payload.get('emails')
+        if type(emails) is not list or not emails:
+            return _json(400, {'error': 'Emails required'})
+
+        threshold = int(self._invalid_rate * 0x100000000)
+        completed, failed = [], []
+        for email in emails:
+            if _address_hash(email, 1) < threshold:
+                failed.append(email)
+            else:
+                completed.append(email)
+
+        with self._lock:
+            request_id = len(self._requests) + 1
+            self._requests[request_id] = _FakeRequest(
+                request_id, completed, failed, monotonic())
+        return _json(200, {'response': {'id': request_id}})
+
+    def _processed(self, request: _FakeRequest) -> int:
+        total = len(request.emails) + len(request.failed)
+        if self._speed is None:
+            return total
+        return min(int((monotonic() - request.created) * self._speed), total)
+
+    def _request_status(self, request: _FakeRequest) -> dict:
+        total = len(request.emails) + len(request.failed)
+        processed = self._processed(request)
+        return {
+            'id': request.id,
+            'date_start': request.date_start,
+            'total_emails': total,
+            'invalid_emails': len(request.failed),
+            'processed_emails': processed,
+            'failed_emails': 0,
+            'ready': int(processed == total),
+        }
+
+    def _status(self, payload: dict) -> tuple:
+        ids = payload.get('ids')
+        if type(ids) is not list or not ids:
+            return _json(400, {'error': 'Request IDs required'})
+
+        with self._lock:
+            found = [self._requests[i] for i in ids if i in self._requests]
+        return _json(200, {'response': [
+            self._request_status(r) for r in found]})
+
+    def _records(self, payload: dict, failed: bool) -> tuple:
+        with self._lock:
+            request = self._requests.get(payload.get('id'))
+        if request is None:
+            return _json(400, {'error': 'Request not found'})
+
+        if failed:
+            records = [_failed_record(e) for e in request.failed]
+        else:
+            records = [_record(e) for e in request.emails]
+
+        if payload.get('format') == 'csv':
+            return 200, (_CSV_HEADER + ''.join(
+                _csv_row(r) for r in records)).encode('UTF-8'), _CSV_HEADERS
+        return _json(200, {'response': records})
+
+    def _list(self, payload: dict) -> tuple:
+        page = payload.get('page', 1)
+        per_page = payload.get('perPage', 10)
+
+        with self._lock:
+            requests = sorted(self._requests.values(), key=lambda r: r.id,
+                              reverse=payload.get('sort') != 'asc')
+        data = requests[(page - 1) * per_page:page * per_page]
+        if payload.get('onlyIds'):
+            data = [r.id for r in data]
+        else:
+            data = [self._request_status(r) for r in data]
+
+        return _json(200, {'response': {
+            'current_page': page,
+            'data': data,
+            'from': (page - 1) * per_page + 1 if data else 0,
+            'last_page': max((len(requests) - 1) // per_page + 1, 1),
+            'per_page': per_page,
+            'to': (page - 1) * per_page + len(data),
+            'total': len(requests),
+        }})
+
+
+class _FakeResponse:
+    """
+    `requests.Response` look-alike
+    """
+
+    def __init__(self, status: int, body: bytes, headers: dict):
+        self.status_code = status
+        self.headers = headers
+        self.content = body
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('UTF-8', 'replace')
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _FakeStream:
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def iter_chunked(self, chunk_size: int):
+        for i in range(0, len(self._body), chunk_size):
+            yield self._body[i:i + chunk_size]
+
+
+class _AsyncFakeResponse:
+    """
+    `aiohttp.ClientResponse` look-alike
+    """
+
+    def __init__(self, status: int, body: bytes, headers: dict):
+        self.status = status
+        self.headers = headers
+        self.content = _FakeStream(body)
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def release(self):
+        pass
+
+
+class FakeTransport(Transport):
+    """
+    `Transport` answering from a `FakeApi` instead of the network
+    """
+
+    def __init__(self, api: FakeApi):
+        self.api = api
+
+    def post(self, url: str, body: bytes, headers: dict, timeout: tuple,
+             stream: bool):
+        latency = self.api.latency()
+        if latency:
+            sleep(latency)
+        return _FakeResponse(*self.api.handle(
+            self.api.path(url), loads(body.decode('UTF-8'))))
+
+    def error_kind(self, error: Exception) -> str or None:
+        return _error_kind(error)
+
+
+class AsyncFakeTransport(AsyncTransport):
+    """
+    `AsyncTransport` answering from a `FakeApi` instead of the network
+    """
+
+    def __init__(self, api: FakeApi):
+        self.api = api
+
+    async def post(self, url: str, body: bytes, headers: dict,
+                   timeout: tuple, stream: bool):
+        latency = self.api.latency()
+        if latency:
+            await asyncio.sleep(latency)
+        return _AsyncFakeResponse(*self.api.handle(
+            self.api.path(url), loads(body.decode('UTF-8'))))
+
+    def error_kind(self, error: Exception) -> str or None:
+        return _error_kind(error)
+
+
+def _error_kind(error: Exception) -> str or None:
+    if isinstance(error, ConnectionRefusedError):
+        return RetryPolicy.CONNECT_ERROR
+    if isinstance(error, ConnectionError):
+        return RetryPolicy.TRANSPORT_ERROR
+    return None
+
+
+def _json(status: int, body) -> tuple:
+    return status, dumps(body).encode('UTF-8'), _JSON_HEADERS
+
+
+def _address_hash(email: str, salt: int = 0) -> int:
+    return zlib.crc32(email.encode('UTF-8'), salt)
+
+
+def _record(email: str) -> dict:
+    value = _address_hash(email)
+    valid = '@' in email
+    domain = email.rpartition('@')[2]
+    smtp = valid and value % 10 != 0
+    catch_all = valid and value % 7 == 0
+
+    if not valid:
+        result = 'invalid-format'
+    elif catch_all:
+        result = 'catch-all'
+    elif smtp:
+        result = 'ok'
+    else:
+        result = 'smtp-failed'
+
+    return {
+        'emailAddress': email,
+        'formatCheck': 'true' if valid else 'false',
+        'smtpCheck': 'true' if smtp else 'false',
+        'dnsCheck': 'true' if valid else 'false',
+        'freeCheck': 'true' if value % 5 == 0 else 'false',
+        'disposableCheck': 'true' if value % 50 == 0 else 'false',
+        'catchAllCheck': 'true' if catch_all else 'false',
+        'mxRecords': ['mx1.' + domain, 'mx2.' + domain] if valid else [],
+        'result': result,
+    }
+
+
+def _failed_record(email: str) -> dict:
+    return {
+        'emailAddress': email,
+        'formatCheck': 'null',
+        'smtpCheck': 'null',
+        'dnsCheck': 'null',
+        'freeCheck': 'null',
+        'disposableCheck': 'null',
+        'catchAllCheck': 'null',
+        'mxRecords': [],
+        'result': 'unknown',
+        'error': 'Verification failed',
+    }
+
+
+def _csv_row(record: dict) -> str:
+    values = [record['emailAddress'], record['formatCheck'],
+              record['smtpCheck'], record['dnsCheck'], record['freeCheck'],
+              record['disposableCheck'], record['catchAllCheck'],
+              ','.join(record['mxRecords']), record['result'],
+              record.get('error', '')]
+    return ','.join('"{}"'.format(v.replace('"', '""'))
+                    for v in values) + '\n'
+
+
+def _validate_rate(value, name: str) -> float:
+    if type(value) in (int, float) and 0 <= value <= 1:
+        return float(value)
+    raise ValueError('{} should be between 0 and 1'.format(name))
@@ -1,84 +1,407 @@
-from requests import request, Response
+from json import dumps
+from time import monotonic, perf_counter, sleep
 
 import logging
+import threading
 
-from ..exceptions.error import ApiAuthError, BadRequestError, HttpApiError
+from .observer import Observer, notify_attempt, notify_retry, notify_span, \
+    notify_transfer, validate_observers
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .transport import RequestsTransport, Transport
+from ..exceptions.error import ApiAuthError, ApiConnectionError, \
+    BadRequestError, HttpApiError
 from ..version import LIBRARY_NAME, VERSION
 
 
+class _Settings:
+    """
+    Per-call configuration of an `ApiRequester`. Never modified once
+    created: setters swap in a new instance, so a call reads a consistent
+    snapshot even while another thread reconfigures the requester.
+    """
+
+    __slots__ = ('base_url', 'timeout', 'retry_policy', 'rate_limiter',
+                 'observers')
+
+    def __init__(self, base_url: str, timeout: float,
+                 retry_policy: RetryPolicy or None,
+                 rate_limiter: RateLimiter or None, observers: tuple):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.observers = observers
+
+    def replace(self, **changes) -> '_Settings':
+        values = {name: getattr(self, name) for name in _Settings.__slots__}
+        values.update(changes)
+        return _Settings(**values)
+
+
 class ApiRequester:
-    __connect_timeout = 10
-    __logger = logging.getLogger('api-requester')
-    __user_agent = '{name}/{ver}'.format(name=LIBRARY_NAME, ver=VERSION)
+    """
+    Sends API calls through a pooled `Transport`.
+
+    A requester may be shared by any number of threads. Every call works
+    on a snapshot of the settings taken when it starts, and the setters
+    replace the snapshot atomically.
+    """
+
+    _connect_timeout = 10
+    _logger = logging.getLogger('api-requester')
+    _user_agent = '{name}/{ver}'.format(name=LIBRARY_NAME, ver=VERSION)
+
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+
+    _transport_class = Transport
 
-    _base_url: str
-    _timeout: float
+    _settings: _Settings
+    _pool_connections: int
+    _pool_maxsize: int
+    _pool_block: bool
+    _transport: Transport
 
     def __init__(self, **kwargs):
         """
         :param kwargs: Supported parameters:
         - base_url: (optional) API endpoint URL; str
         - timeout: (optional) API call timeout in seconds; float
+        - pool_connections: (optional) Number of per-host connection pools
+            to keep; int
+        - pool_maxsize: (optional) Maximum number of keep-alive connections
+            per host; int
+        - pool_block: (optional) Wait for a free connection instead of
+            opening an extra one when the pool is exhausted; bool
+        - retry_policy: (optional) Retry failed calls, no retries
+            by default; RetryPolicy
+        - rate_limiter: (optional) Client-side limit of calls per API
+            path, no limit by default; RateLimiter
+        - transport: (optional) Sends the HTTP calls. A pooled
+            `RequestsTransport` by default, the pool parameters are
+            ignored when set; Transport
+        - observers: (optional) Instrumentation hooks notified of every
+            call, none by default; list[Observer]
         """
-        self._base_url = ''
-        self.timeout = 30
+        self._settings = _Settings('', 30, None, None, ())
+        self._settings_lock = threading.Lock()
+
+        self._pool_connections = ApiRequester.DEFAULT_POOL_CONNECTIONS
+        self._pool_maxsize = ApiRequester.DEFAULT_POOL_MAXSIZE
+        self._pool_block = False
+        self._transport = None
 
         if 'base_url' in kwargs:
             self.base_url = kwargs['base_url']
         if 'timeout' in kwargs:
             self.timeout = kwargs['timeout']
+        if 'pool_connections' in kwargs:
+            self._pool_connections = ApiRequester._validate_pool_size(
+                kwargs['pool_connections'])
+        if 'pool_maxsize' in kwargs:
+            self._pool_maxsize = ApiRequester._validate_pool_size(
+                kwargs['pool_maxsize'])
+        if 'pool_block' in kwargs:
+            self._pool_block = bool(kwargs['pool_block'])
+        if 'retry_policy' in kwargs:
+            self.retry_policy = kwargs['retry_policy']
+        if 'rate_limiter' in kwargs:
+            self.rate_limiter = kwargs['rate_limiter']
+        if 'observers' in kwargs:
+            self.observers = kwargs['observers']
+
+        if kwargs.get('transport') is not None:
+            if not isinstance(kwargs['transport'], self._transport_class):
+                raise ValueError('Expected a {} instance'.format(
+                    self._transport_class.__name__))
+            self._transport = kwargs['transport']
+        else:
+            self._transport = self._create_transport()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     @property
     def base_url(self) -> str:
-        return self._base_url
+        return self._settings.base_url
 
     @base_url.setter
     def base_url(self, url: str):
         if url is None or len(url) <= 8 or not url.startswith('http'):
             raise ValueError('Invalid URL specified.')
-        self._base_url = url
+        self._update_settings(base_url=url)
+
+    @property
+    def observers(self) -> tuple:
+        """Instrumentation hooks, see `Observer`"""
+        return self._settings.observers
+
+    @observers.setter
+    def observers(self, value: list or None):
+        self._update_settings(observers=validate_observers(value))
+
+    @property
+    def pool_connections(self) -> int:
+        """Number of per-host connection pools"""
+        return self._pool_connections
+
+    @property
+    def pool_maxsize(self) -> int:
+        """Maximum number of keep-alive connections per host"""
+        return self._pool_maxsize
+
+    @property
+    def rate_limiter(self) -> RateLimiter or None:
+        return self._settings.rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, value: RateLimiter or None):
+        if value is not None and not isinstance(value, RateLimiter):
+            raise ValueError('Expected a RateLimiter instance')
+        self._update_settings(rate_limiter=value)
+
+    @property
+    def retry_policy(self) -> RetryPolicy or None:
+        return self._settings.retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value: RetryPolicy or None):
+        if value is not None and not isinstance(value, RetryPolicy):
+            raise ValueError('Expected a RetryPolicy instance')
+        self._update_settings(retry_policy=value)
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport
 
     @property
     def timeout(self) -> float:
         """API call timeout in seconds"""
-        return self._timeout
+        return self._settings.timeout
 
     @timeout.setter
     def timeout(self, value: float):
         """API call timeout in seconds"""
         if value is not None and 1 <= value <= 60:
-            self._timeout = value
+            self._update_settings(timeout=value)
         else:
             raise ValueError('Timeout value should be in [1, 60]')
 
+    def close(self):
+        """
+        Close all pooled connections. The requester stays usable,
+        a new pool is created on the next call.
+        """
+        self._transport.close()
+
     def post(self, path: str, data: dict) -> str:
+        return self.post_bytes(path, data).decode('UTF-8')
+
+    def post_bytes(self, path: str, data: dict) -> bytes:
+        """
+        Send a request and return the response body without decoding it
+        """
+        response = self._send(self._settings, path, data, False)
+
+        return ApiRequester._handle_response(response)
+
+    def stream(self, path: str, data: dict, chunk_size: int = 65536):
+        """
+        Send a request and iterate over the response body in chunks
+        without loading it into memory
+        :return: Iterator[bytes]
+        """
+        settings = self._settings
+        response = self._send(settings, path, data, True)
+
+        try:
+            if not 200 <= response.status_code < 300:
+                ApiRequester._handle_response(response)
+
+            chunks = response.iter_content(chunk_size)
+            if settings.observers:
+                chunks = ApiRequester._observe_chunks(
+                    settings.observers, path, chunks)
+            for chunk in chunks:
+                yield chunk
+        finally:
+            response.close()
+
+    def _send(self, settings: _Settings, path: str, data: dict,
+              stream: bool):
         headers = {
-            'User-Agent': ApiRequester.__user_agent,
-            'Connection': 'close'
+            'Content-Type': 'application/json',
+            'User-Agent': ApiRequester._user_agent,
         }
+        body = dumps(data).encode('UTF-8')
 
-        response = request(
-            'POST',
-            self.base_url + path,
-            json=data,
-            headers=headers,
-            timeout=(ApiRequester.__connect_timeout, self.timeout)
-        )
+        observers = settings.observers
+        rate_limiter = settings.rate_limiter
 
-        return ApiRequester._handle_response(response)
+        started = monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            if rate_limiter is not None:
+                if observers:
+                    waited = perf_counter()
+                    rate_limiter.acquire(path)
+                    notify_span(observers, path, Observer.RATE_LIMIT,
+                                perf_counter() - waited)
+                else:
+                    rate_limiter.acquire(path)
+
+            sent = perf_counter() if observers else 0.0
+            try:
+                response = self._transport.post(
+                    settings.base_url + path,
+                    body,
+                    headers,
+                    (ApiRequester._connect_timeout, settings.timeout),
+                    stream
+                )
+            except Exception as error:
+                kind = self._transport.error_kind(error)
+                if kind is None and not isinstance(error, OSError):
+                    raise
+                if observers:
+                    notify_attempt(observers, path, attempt, None,
+                                   len(body), None)
+                delay = None if kind is None else ApiRequester._retry_delay(
+                    settings, path, attempt, started, error_kind=kind)
+                if delay is None:
+                    raise ApiConnectionError(repr(error)) from error
+                ApiRequester._logger.warning(
+                    'Retrying %s in %.2fs after %r', path, delay, error)
+                ApiRequester._observe_retry(
+                    observers, path, attempt, delay, kind)
+                sleep(delay)
+                continue
+
+            if observers:
+                elapsed = perf_counter() - sent
+                if stream:
+                    ApiRequester._observe_response(
+                        observers, path, attempt, response.status_code,
+                        elapsed, len(body), None)
+                else:
+                    # requests.Response.elapsed ends at the headers
+                    ApiRequester._observe_response(
+                        observers, path, attempt, response.status_code,
+                        elapsed,
+                        len(body), len(response.content),
+                        getattr(response, 'elapsed', None))
+
+            if 200 <= response.status_code < 300:
+                return response
+
+            delay = ApiRequester._retry_delay(
+                settings, path, attempt, started,
+                status_code=response.status_code,
+                retry_after=response.headers.get('Retry-After'))
+            if delay is None:
+                return response
+
+            response.close()
+            ApiRequester._logger.warning(
+                'Retrying %s in %.2fs after HTTP %d',
+                path, delay, response.status_code)
+            ApiRequester._observe_retry(
+                observers, path, attempt, delay, response.status_code)
+            sleep(delay)
+
+    def _update_settings(self, **changes):
+        with self._settings_lock:
+            self._settings = self._settings.replace(**changes)
+
+    @staticmethod
+    def _observe_response(observers: tuple, path: str, attempt: int,
+                          status_code: int, elapsed: float,
+                          request_bytes: int, response_bytes: int or None,
+                          headers_time=None):
+        """
+        :param elapsed: Seconds `Transport.post` took
+        :param headers_time: timedelta until the response headers arrived,
+                None if unknown
+        """
+        if headers_time is None:
+            notify_span(observers, path, Observer.WAIT, elapsed)
+        else:
+            wait = min(headers_time.total_seconds(), elapsed)
+            notify_span(observers, path, Observer.WAIT, wait)
+            notify_span(observers, path, Observer.TRANSFER, elapsed - wait)
+
+        notify_attempt(observers, path, attempt, status_code, request_bytes,
+                       response_bytes)
+
+    @staticmethod
+    def _observe_retry(observers: tuple, path: str, attempt: int,
+                       delay: float, reason):
+        if observers:
+            notify_retry(observers, path, attempt, delay, reason)
+            notify_span(observers, path, Observer.RETRY_WAIT, delay)
+
+    @staticmethod
+    def _observe_chunks(observers: tuple, path: str, chunks):
+        """
+        Time the reads of a streamed body, not the processing of chunks
+        """
+        size = 0
+        spent = 0.0
+        try:
+            while True:
+                started = perf_counter()
+                chunk = next(chunks, None)
+                spent += perf_counter() - started
+                if chunk is None:
+                    return
+                size += len(chunk)
+                yield chunk
+        finally:
+            notify_span(observers, path, Observer.TRANSFER, spent)
+            notify_transfer(observers, path, size)
+
+    @staticmethod
+    def _retry_delay(settings: _Settings, path: str, attempt: int,
+                     started: float, **kwargs) -> float or None:
+        if settings.retry_policy is None:
+            return None
+
+        return settings.retry_policy.next_delay(
+            path, attempt, monotonic() - started, **kwargs)
+
+    def _create_transport(self) -> Transport:
+        return RequestsTransport(
+            self._pool_connections, self._pool_maxsize, self._pool_block)
 
     @staticmethod
-    def _handle_response(response: Response) -> str:
+    def _handle_response(response) -> bytes:
         status_code = response.status_code
 
         if 200 <= status_code < 300:
-            return response.content.decode('UTF-8')
+            return response.content
 
+        ApiRequester._raise_for_status(status_code, response.text)
+
+    @staticmethod
+    def _raise_for_status(status_code: int, text: str):
         if status_code in [401, 402, 403]:
-            raise ApiAuthError(response.text, status_code)
+            raise ApiAuthError(text, status_code)
 
         if status_code in [400, 422]:
-            raise BadRequestError(response.text, status_code)
+            raise BadRequestError(text, status_code)
 
         if status_code >= 300:
-            raise HttpApiError(response.text, status_code)
+            raise HttpApiError(text, status_code)
+
+    @staticmethod
+    def _validate_pool_size(value: int) -> int:
+        if type(value) is int and value > 0:
+            return value
+        raise ValueError('Pool size should be a positive integer')
@@ -0,0 +1,315 @@
+from bisect import bisect_left
+
+import threading
+
+
+class Observer:
+    """
+    Base class for instrumentation hooks of `ApiRequester` and `Client`.
+
+    Override the methods of interest. They are called synchronously from
+    the thread (or the event loop) making the call, so they should return
+    quickly, be thread-safe and not raise. With no observers installed
+    nothing is measured.
+
+    Phases of a call reported to `on_span`:
+    - RATE_LIMIT: waiting for the client-side rate limiter
+    - WAIT: sending the payload until the response headers arrive,
+      including connection setup, TLS and server processing. Transports
+      that cannot tell the headers from the body (anything but
+      `RequestsTransport`) report the whole non-streamed response here
+    - TRANSFER: reading the response body
+    - RETRY_WAIT: backoff sleep before another attempt
+    - DECODE: parsing the JSON response
+    - BUILD: constructing the response models
+    """
+
+    RATE_LIMIT = 'rate_limit'
+    WAIT = 'wait'
+    TRANSFER = 'transfer'
+    RETRY_WAIT = 'retry_wait'
+    DECODE = 'decode'
+    BUILD = 'build'
+
+    def on_span(self, path: str, phase: str, seconds: float):
+        """
+        A phase of a call to `path` took `seconds`
+        """
+
+    def on_attempt(self, path: str, attempt: int, status_code: int or None,
+                   request_bytes: int, response_bytes: int or None):
+        """
+        An attempt of a call is complete
+        :param attempt: Number of the attempt, starting with 1
+        :param status_code: HTTP code, None after a network error
+        :param request_bytes: Size of the request body in bytes: the
+                UTF-8 encoded JSON payload exactly as sent
+        :param response_bytes: Size of the body, None when it is streamed
+                (reported with `on_transfer`) or after a network error
+        """
+
+    def on_transfer(self, path: str, response_bytes: int):
+        """
+        A streamed response body of `response_bytes` was read
+        """
+
+    def on_retry(self, path: str, attempt: int, delay: float, reason):
+        """
+        An attempt failed and will be repeated after `delay` seconds
+        :param reason: HTTP code or `RetryPolicy` error kind
+        """
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bucket bounds
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                       0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds. Values above the last bound
+                are only counted in `count`
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list:
+        """
+        :return: list[int]. Number of values <= every bound
+        """
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def quantile(self, q: float) -> float or None:
+        """
+        Estimate a quantile by linear interpolation within its bucket
+        :param q: 0..1
+        :return: float. None without values, the last bound if the
+                quantile is above it
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        lower, seen = 0.0, 0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            lower, seen = bound, seen + count
+        return self.buckets[-1] if self.buckets else None
+
+
+class MetricsRecorder(Observer):
+    """
+    In-memory aggregation of the observed calls: a duration histogram per
+    path and phase, and counters of attempts by status code, retries and
+    transferred bytes per path.
+
+        metrics = MetricsRecorder()
+        client = Client('Your API key', observers=[metrics])
+        ...
+        print(metrics.histogram('/request/completed', Observer.WAIT)
+              .quantile(0.99))
+        print(metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets: tuple = Histogram.DEFAULT_BUCKETS):
+        """
+        :param buckets: Upper bounds of the duration histograms in seconds
+        """
+        self._buckets = tuple(buckets)
+        self._histograms = {}
+        self._attempts = {}
+        self._retries = {}
+        self._request_bytes = {}
+        self._response_bytes = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, path: str, phase: str, seconds: float):
+        key = (path, phase)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets)
+            histogram.observe(seconds)
+
+    def on_attempt(self, path: str, attempt: int, status_code: int or None,
+                   request_bytes: int, response_bytes: int or None):
+        key = (path, 'error' if status_code is None else str(status_code))
+        with self._lock:
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+            self._request_bytes[path] = \
+                self._request_bytes.get(path, 0) + request_bytes
+            if response_bytes is not None:
+                self._response_bytes[path] = \
+                    self._response_bytes.get(path, 0) + response_bytes
+
+    def on_transfer(self, path: str, response_bytes: int):
+        with self._lock:
+            self._response_bytes[path] = \
+                self._response_bytes.get(path, 0) + response_bytes
+
+    def on_retry(self, path: str, attempt: int, delay: float, reason):
+        key = (path, str(reason))
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def histogram(self, path: str, phase: str) -> Histogram or None:
+        """
+        :return: Copy of the duration histogram, None if the phase was
+                not observed for the path
+        """
+        with self._lock:
+            histogram = self._histograms.get((path, phase))
+            if histogram is None:
+                return None
+            copy = Histogram(histogram.buckets)
+            copy.counts = list(histogram.counts)
+            copy.count, copy.sum = histogram.count, histogram.sum
+            return copy
+
+    def snapshot(self) -> dict:
+        """
+        :return: dict. Plain copy of all metrics:
+                'spans': {(path, phase): {'count', 'sum', 'buckets'}},
+                'attempts': {(path, status): count},
+                'retries': {(path, reason): count},
+                'request_bytes' and 'response_bytes': {path: bytes}
+        """
+        with self._lock:
+            return {
+                'spans': {key: {
+                    'count': h.count,
+                    'sum': h.sum,
+                    'buckets': list(zip(h.buckets, h.cumulative())),
+                } for key, h in self._histograms.items()},
+                'attempts': dict(self._attempts),
+                'retries': dict(self._retries),
+                'request_bytes': dict(self._request_bytes),
+                'response_bytes': dict(self._response_bytes),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._attempts.clear()
+            self._retries.clear()
+            self._request_bytes.clear()
+            self._response_bytes.clear()
+
+    def to_prometheus(self, prefix: str = 'bulkemailverifier') -> str:
+        """
+        Render the metrics in the Prometheus text exposition format
+        :param prefix: Metric name prefix
+        :return: str
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        name = prefix + '_phase_seconds'
+        lines.append('# HELP {} Duration of API call phases'.format(name))
+        lines.append('# TYPE {} histogram'.format(name))
+        for (path, phase), span in sorted(snapshot['spans'].items()):
+            labels = 'path="{}",phase="{}"'.format(
+                _escape(path), _escape(phase))
+            for bound, count in span['buckets']:
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                    name, labels, _number(bound), count))
+            lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(
+                name, labels, span['count']))
+            lines.append('{}_sum{{{}}} {}'.format(
+                name, labels, _number(span['sum'])))
+            lines.append('{}_count{{{}}} {}'.format(
+                name, labels, span['count']))
+
+        counters = (
+            ('attempts', 'API call attempts by HTTP code', 'status',
+             snapshot['attempts']),
+            ('retries', 'Retried API call attempts by reason', 'reason',
+             snapshot['retries']),
+        )
+        for suffix, description, label, values in counters:
+            name = '{}_{}_total'.format(prefix, suffix)
+            lines.append('# HELP {} {}'.format(name, description))
+            lines.append('# TYPE {} counter'.format(name))
+            for (path, value), count in sorted(values.items()):
+                lines.append('{}{{path="{}",{}="{}"}} {}'.format(
+                    name, _escape(path), label, _escape(value), count))
+
+        for suffix, description in (('request', 'Sent payload bytes'),
+                                    ('response', 'Received body bytes')):
+            name = '{}_{}_bytes_total'.format(prefix, suffix)
+            lines.append('# HELP {} {}'.format(name, description))
+            lines.append('# TYPE {} counter'.format(name))
+            for path, count in sorted(snapshot[suffix + '_bytes'].items()):
+                lines.append('{}{{path="{}"}} {}'.format(
+                    name, _escape(path), count))
+
+        return '\n'.join(lines) + '\n'
+
+
+def notify_span(observers: tuple, path: str, phase: str, seconds: float):
+    for observer in observers:
+        observer.on_span(path, phase, seconds)
+
+
+def notify_attempt(observers: tuple, path: str, attempt: int,
+                   status_code: int or None, request_bytes: int,
+                   response_bytes: int or None):
+    for observer in observers:
+        observer.on_attempt(path, attempt, status_code, request_bytes,
+                            response_bytes)
+
+
+def notify_transfer(observers: tuple, path: str, response_bytes: int):
+    for observer in observers:
+        observer.on_transfer(path, response_bytes)
+
+
+def notify_retry(observers: tuple, path: str, attempt: int, delay: float,
+                 reason):
+    for observer in observers:
+        observer.on_retry(path, attempt, delay, reason)
+
+
+def validate_observers(value) -> tuple:
+    """
+    :raises ValueError: not an iterable of `Observer` instances
+    """
+    if value is None:
+        return ()
+    if isinstance(value, Observer):
+        raise ValueError('Expected a list of Observer instances')
+    try:
+        observers = tuple(value)
+    except TypeError:
+        raise ValueError('Expected a list of Observer instances')
+    if not all(isinstance(o, Observer) for o in observers):
+        raise ValueError('Expected a list of Observer instances')
+    return observers
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"') \
+        .replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
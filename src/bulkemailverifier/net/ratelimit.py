@@ -0,0 +1,160 @@
+from json import dumps, loads
+from time import monotonic, sleep, time
+
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class RateLimiter:
+    """
+    Base class for client-side rate limiters used by `ApiRequester`.
+    Limits are applied per key, the requester uses the API path.
+
+    Set `blocking` in subclasses whose `reserve` waits for locks or I/O:
+    `AsyncApiRequester` then calls it in a thread pool instead of on the
+    event loop.
+    """
+
+    blocking = False
+
+    def reserve(self, key: str) -> float:
+        """
+        Take a permit for one call
+        :param key: Rate limit key, e.g. API path
+        :return: Seconds to wait before the call may be sent
+        """
+        raise NotImplementedError
+
+    def acquire(self, key: str):
+        """
+        Block until a call for `key` is allowed
+        """
+        delay = self.reserve(key)
+        if delay > 0:
+            sleep(delay)
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket shared by all threads of the process.
+
+    Every key has its own bucket of `burst` tokens refilled at `rate`
+    tokens per second. A call that finds the bucket empty still takes a
+    token and waits until it is refilled, so concurrent callers are
+    served in order.
+    """
+
+    def __init__(self, rate: float, **kwargs):
+        """
+        :param rate: Calls per second allowed for every key
+        :key burst: Optional. Bucket size. 1 by default
+        :key rates: Optional. dict. Key -> calls per second overrides,
+                e.g. {'/request/status': 2}
+        """
+        self._rate = _validate_rate(rate)
+        self._burst = 1
+        self._rates = {}
+
+        if 'burst' in kwargs:
+            self._burst = _validate_rate(kwargs['burst'])
+        if 'rates' in kwargs:
+            self._rates = {k: _validate_rate(v)
+                           for k, v in dict(kwargs['rates']).items()}
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str) -> float:
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self._burst, None))
+            now = monotonic()
+            tokens, delay = _take(tokens, updated, now,
+                                  self._rates.get(key, self._rate),
+                                  self._burst)
+            self._buckets[key] = (tokens, now)
+            return delay
+
+
+class FileRateLimiter(TokenBucketRateLimiter):
+    """
+    Token bucket shared by all processes using the same state file.
+
+    The buckets are kept in a small JSON file which is locked for the
+    duration of every `reserve` call, so workers on one host together
+    stay within the configured rate.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, rate: float, **kwargs):
+        """
+        :param path: State file path, created if it does not exist
+        :param rate: Calls per second allowed for every key
+        :key burst: Optional. Bucket size. 1 by default
+        :key rates: Optional. dict. Key -> calls per second overrides
+        """
+        super().__init__(rate, **kwargs)
+        self._path = path
+
+    def reserve(self, key: str) -> float:
+        with self._lock, open(self._path, 'a+b') as state_file:
+            _lock_file(state_file)
+            try:
+                state_file.seek(0)
+                content = state_file.read()
+                buckets = loads(content.decode('UTF-8')) if content else {}
+
+                tokens, updated = buckets.get(key, (self._burst, None))
+                # Monotonic clocks of different processes may not agree
+                now = time()
+                tokens, delay = _take(tokens, updated, now,
+                                      self._rates.get(key, self._rate),
+                                      self._burst)
+                buckets[key] = (tokens, now)
+
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(dumps(buckets).encode('UTF-8'))
+                state_file.flush()
+            finally:
+                _unlock_file(state_file)
+
+        return delay
+
+
+def _take(tokens: float, updated: float or None, now: float, rate: float,
+          burst: float) -> tuple:
+    if updated is not None:
+        tokens = min(burst, tokens + max(now - updated, 0) * rate)
+
+    tokens -= 1
+    if tokens >= 0:
+        return tokens, 0.0
+    return tokens, -tokens / rate
+
+
+def _validate_rate(value) -> float:
+    if type(value) in (int, float) and value > 0:
+        return value
+    raise ValueError('Rate should be a positive number')
+
+
+def _lock_file(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
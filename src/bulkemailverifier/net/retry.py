@@ -0,0 +1,149 @@
+from email.utils import parsedate_to_datetime
+
+import datetime
+import random
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed API call is repeated.
+
+    Calls to idempotent endpoints are retried on transport errors and on
+    `retry_statuses`. Other calls (e.g. creating a request) are retried
+    only when the connection could not be established, so the server has
+    never seen them. Delays grow exponentially with full jitter, a
+    Retry-After header takes precedence when present. A call is not
+    retried when Retry-After asks to wait longer than `max_backoff` or
+    past the `deadline`.
+    """
+
+    DEFAULT_MAX_ATTEMPTS = 3
+    DEFAULT_BACKOFF_FACTOR = 0.5
+    DEFAULT_MAX_BACKOFF = 30.0
+    DEFAULT_RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+    DEFAULT_IDEMPOTENT_PATHS = frozenset([
+        '/request/completed',
+        '/request/failed',
+        '/request/list',
+        '/request/status',
+    ])
+
+    CONNECT_ERROR = 'connect'
+    TRANSPORT_ERROR = 'transport'
+
+    def __init__(self, **kwargs):
+        """
+        :key max_attempts: Optional. Total number of attempts per call.
+                `RetryPolicy.DEFAULT_MAX_ATTEMPTS` by default
+        :key backoff_factor: Optional. Base delay in seconds, doubled with
+                every attempt. `RetryPolicy.DEFAULT_BACKOFF_FACTOR` by default
+        :key max_backoff: Optional. Max delay between attempts in seconds.
+                `RetryPolicy.DEFAULT_MAX_BACKOFF` by default
+        :key jitter: Optional. Randomize delays. True by default
+        :key respect_retry_after: Optional. Honor the Retry-After header.
+                True by default
+        :key deadline: Optional. Max total time of a call including retries
+                in seconds. No limit by default
+        :key retry_statuses: Optional. HTTP codes to retry.
+                `RetryPolicy.DEFAULT_RETRY_STATUSES` by default
+        :key idempotent_paths: Optional. API paths safe to repeat.
+                `RetryPolicy.DEFAULT_IDEMPOTENT_PATHS` by default
+        """
+        self.max_attempts = RetryPolicy.DEFAULT_MAX_ATTEMPTS
+        self.backoff_factor = RetryPolicy.DEFAULT_BACKOFF_FACTOR
+        self.max_backoff = RetryPolicy.DEFAULT_MAX_BACKOFF
+        self.jitter = True
+        self.respect_retry_after = True
+        self.deadline = None
+        self.retry_statuses = RetryPolicy.DEFAULT_RETRY_STATUSES
+        self.idempotent_paths = RetryPolicy.DEFAULT_IDEMPOTENT_PATHS
+
+        if 'max_attempts' in kwargs:
+            if type(kwargs['max_attempts']) is not int \
+                    or kwargs['max_attempts'] < 1:
+                raise ValueError('Max attempts should be a positive integer')
+            self.max_attempts = kwargs['max_attempts']
+        if 'backoff_factor' in kwargs:
+            self.backoff_factor = _non_negative(
+                kwargs['backoff_factor'], 'Backoff factor')
+        if 'max_backoff' in kwargs:
+            self.max_backoff = _non_negative(
+                kwargs['max_backoff'], 'Max backoff')
+        if 'jitter' in kwargs:
+            self.jitter = bool(kwargs['jitter'])
+        if 'respect_retry_after' in kwargs:
+            self.respect_retry_after = bool(kwargs['respect_retry_after'])
+        if kwargs.get('deadline') is not None:
+            self.deadline = _non_negative(kwargs['deadline'], 'Deadline')
+        if 'retry_statuses' in kwargs:
+            self.retry_statuses = frozenset(kwargs['retry_statuses'])
+        if 'idempotent_paths' in kwargs:
+            self.idempotent_paths = frozenset(kwargs['idempotent_paths'])
+
+        self._random = random.Random()
+
+    def next_delay(self, path: str, attempt: int, elapsed: float,
+                   status_code: int = None, error_kind: str = None,
+                   retry_after: str = None) -> float or None:
+        """
+        :param path: API path of the call
+        :param attempt: Number of the failed attempt, starting with 1
+        :param elapsed: Seconds since the first attempt
+        :param status_code: HTTP code of the failed attempt
+        :param error_kind: CONNECT_ERROR or TRANSPORT_ERROR
+        :param retry_after: Retry-After header value
+        :return: Seconds to wait before the next attempt or None to give up
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        idempotent = path in self.idempotent_paths
+        if error_kind == RetryPolicy.CONNECT_ERROR:
+            retryable = True
+        elif error_kind == RetryPolicy.TRANSPORT_ERROR:
+            retryable = idempotent
+        else:
+            retryable = idempotent and status_code in self.retry_statuses
+
+        if not retryable:
+            return None
+
+        delay = None
+        if retry_after is not None and self.respect_retry_after:
+            delay = _parse_retry_after(retry_after)
+            if delay is not None and delay > self.max_backoff:
+                # An earlier attempt would be rejected again
+                return None
+        if delay is None:
+            delay = min(self.max_backoff,
+                        self.backoff_factor * 2 ** (attempt - 1))
+            if self.jitter:
+                delay = self._random.uniform(0, delay)
+
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+
+def _non_negative(value, name: str) -> float:
+    if type(value) in (int, float) and value >= 0:
+        return value
+    raise ValueError('{} should be a non-negative number'.format(name))
+
+
+def _parse_retry_after(value: str) -> float or None:
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((date - now).total_seconds(), 0.0)
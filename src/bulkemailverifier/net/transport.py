@@ -0,0 +1,213 @@
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, \
+    ConnectTimeout, RequestException
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+import asyncio
+import threading
+
+from .retry import RetryPolicy
+
+
+class Transport:
+    """
+    Sends the HTTP calls of an `ApiRequester`.
+
+    `post` returns an object with the `requests.Response` attributes the
+    requester uses: `status_code`, `headers`, `content`, `text`,
+    `iter_content(chunk_size)` and `close()`.
+    """
+
+    def post(self, url: str, body: bytes, headers: dict, timeout: tuple,
+             stream: bool):
+        """
+        :param url: Full URL of the API method
+        :param body: UTF-8 encoded JSON payload, sent as is
+        :param headers: HTTP headers, including the Content-Type
+        :param timeout: (connect timeout, read timeout) in seconds
+        :param stream: The body is read with `iter_content`
+        :return: Response object
+        """
+        raise NotImplementedError
+
+    def error_kind(self, error: Exception) -> str or None:
+        """
+        Classify an exception raised by `post` for `RetryPolicy`
+        :return: RetryPolicy.CONNECT_ERROR, RetryPolicy.TRANSPORT_ERROR or
+                None if the error is not retried. An `OSError` is then
+                raised as `ApiConnectionError`, anything else is re-raised
+        """
+        return None
+
+    def close(self):
+        """
+        Release pooled connections. The transport stays usable.
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    `Transport` over a pooled keep-alive `requests.Session`.
+    The session is created on the first call.
+    """
+
+    def __init__(self, pool_connections: int, pool_maxsize: int,
+                 pool_block: bool = False):
+        """
+        :param pool_connections: Number of per-host connection pools
+        :param pool_maxsize: Maximum number of keep-alive connections per
+                host
+        :param pool_block: Wait for a free connection instead of opening
+                an extra one when the pool is exhausted
+        """
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def post(self, url: str, body: bytes, headers: dict, timeout: tuple,
+             stream: bool):
+        return self._get_session().post(
+            url, data=body, headers=headers, timeout=timeout, stream=stream)
+
+    def error_kind(self, error: Exception) -> str or None:
+        if not isinstance(error, RequestException):
+            return None
+
+        if isinstance(error, ConnectTimeout):
+            return RetryPolicy.CONNECT_ERROR
+
+        if isinstance(error, RequestsConnectionError) and error.args:
+            reason = getattr(error.args[0], 'reason', None)
+            if isinstance(reason, (NewConnectionError, ConnectTimeoutError)):
+                return RetryPolicy.CONNECT_ERROR
+
+        return RetryPolicy.TRANSPORT_ERROR
+
+    def close(self):
+        with self._session_lock:
+            session, self._session = self._session, None
+
+        if session is not None:
+            session.close()
+
+    def _get_session(self) -> Session:
+        session = self._session
+        if session is not None:
+            return session
+
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self) -> Session:
+        adapter = HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block
+        )
+
+        session = Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+
+class AsyncTransport:
+    """
+    Sends the HTTP calls of an `AsyncApiRequester`.
+
+    `post` is a coroutine returning an object with the
+    `aiohttp.ClientResponse` attributes the requester uses: `status`,
+    `headers`, `read()`, `content.iter_chunked(chunk_size)` and
+    `release()`. Unless `stream` is set the body is already read.
+    """
+
+    async def post(self, url: str, body: bytes, headers: dict,
+                   timeout: tuple, stream: bool):
+        """
+        See `Transport.post`
+        """
+        raise NotImplementedError
+
+    def error_kind(self, error: Exception) -> str or None:
+        """
+        See `Transport.error_kind`
+        """
+        return None
+
+    async def close(self):
+        """
+        Release pooled connections. The transport stays usable.
+        """
+
+
+class AiohttpTransport(AsyncTransport):
+    """
+    `AsyncTransport` over a pooled aiohttp session.
+
+    Requires the optional `aiohttp` dependency
+    (pip install bulk-email-verifier[async]).
+    """
+
+    def __init__(self, pool_connections: int, pool_maxsize: int):
+        """
+        :param pool_connections: Number of per-host connection pools
+        :param pool_maxsize: Maximum number of concurrent connections per
+                host
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'aiohttp is required for asynchronous requests. '
+                'Install bulk-email-verifier[async]')
+
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._session = None
+
+    async def post(self, url: str, body: bytes, headers: dict,
+                   timeout: tuple, stream: bool):
+        response = await self._get_session().post(
+            url,
+            data=body,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=timeout[0], sock_read=timeout[1])
+        )
+        if not stream:
+            await response.read()
+        return response
+
+    def error_kind(self, error: Exception) -> str or None:
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return RetryPolicy.CONNECT_ERROR
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return RetryPolicy.TRANSPORT_ERROR
+        return None
+
+    async def close(self):
+        session, self._session = self._session, None
+
+        if session is not None:
+            await session.close()
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=self._pool_connections * self._pool_maxsize,
+            limit_per_host=self._pool_maxsize
+        )
+
+        return aiohttp.ClientSession(connector=connector)
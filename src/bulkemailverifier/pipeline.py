@@ -0,0 +1,257 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from time import monotonic, sleep
+
+from .exceptions.error import ParameterError
+from .journal import ChunkState, JobJournal
+from .poller import RequestPoller, _validate_positive
+
+
+class VerificationPipeline:
+    """
+    Verifies an email stream of any size end to end.
+
+    The input is split into chunks which go through three overlapping
+    stages: requests are created by a pool of submit workers, all
+    outstanding requests are polled together by a `RequestPoller` and
+    the results of every ready request are downloaded by a pool of fetch
+    workers. At most `max_pending` chunks are between input and output at
+    a time, so memory usage does not depend on the input size.
+
+    Records are yielded chunk by chunk in the order the requests finish.
+
+        with open('emails.txt') as f:
+            for record in client.verify(emails=(l.strip() for l in f)):
+                print(record.email_address, record.result)
+    """
+
+    DEFAULT_CHUNK_SIZE = 10000
+    DEFAULT_SUBMIT_WORKERS = 2
+    DEFAULT_FETCH_WORKERS = 2
+    DEFAULT_MAX_PENDING = 8
+
+    _POLL_OPTIONS = ('batch_size', 'min_interval', 'max_interval', 'backoff')
+
+    def __init__(self, client, emails, **kwargs):
+        """
+        :param client: `Client` instance
+        :param emails: Iterable[str]
+        :key chunk_size: Optional. Number of emails per request.
+                `VerificationPipeline.DEFAULT_CHUNK_SIZE` by default
+        :key submit_workers: Optional. Max concurrent `create_request` calls.
+                `VerificationPipeline.DEFAULT_SUBMIT_WORKERS` by default
+        :key fetch_workers: Optional. Max concurrent result downloads.
+                `VerificationPipeline.DEFAULT_FETCH_WORKERS` by default
+        :key max_pending: Optional. Max chunks being submitted, processed
+                or downloaded at a time.
+                `VerificationPipeline.DEFAULT_MAX_PENDING` by default
+        :key include_failed: Optional. Also yield the records of the emails
+                that could not be processed. False by default
+        :key journal: Optional. `JobJournal` to record the progress in and
+                to resume from. The input must be the same on resume
+        :key batch_size: Optional. See `RequestPoller`
+        :key min_interval: Optional. See `RequestPoller`
+        :key max_interval: Optional. See `RequestPoller`
+        :key backoff: Optional. See `RequestPoller`
+        :raises ParameterError: invalid parameter value
+        """
+        self._client = client
+        self._emails = emails
+        self._chunk_size = VerificationPipeline.DEFAULT_CHUNK_SIZE
+        self._submit_workers = VerificationPipeline.DEFAULT_SUBMIT_WORKERS
+        self._fetch_workers = VerificationPipeline.DEFAULT_FETCH_WORKERS
+        self._max_pending = VerificationPipeline.DEFAULT_MAX_PENDING
+        self._include_failed = False
+        self._journal = None
+
+        if 'chunk_size' in kwargs:
+            self._chunk_size = _validate_positive(
+                kwargs['chunk_size'], 'Chunk size', (int,))
+        if 'submit_workers' in kwargs:
+            self._submit_workers = _validate_positive(
+                kwargs['submit_workers'], 'Submit workers', (int,))
+        if 'fetch_workers' in kwargs:
+            self._fetch_workers = _validate_positive(
+                kwargs['fetch_workers'], 'Fetch workers', (int,))
+        if 'max_pending' in kwargs:
+            self._max_pending = _validate_positive(
+                kwargs['max_pending'], 'Max pending', (int,))
+        if 'include_failed' in kwargs:
+            if type(kwargs['include_failed']) is not bool:
+                raise ParameterError(
+                    'Include failed parameter must be boolean')
+            self._include_failed = kwargs['include_failed']
+
+        if kwargs.get('journal') is not None:
+            if not isinstance(kwargs['journal'], JobJournal):
+                raise ParameterError('Expected a JobJournal instance')
+            self._journal = kwargs['journal']
+
+        self._poll_options = {k: kwargs[k] for k in self._POLL_OPTIONS
+                              if k in kwargs}
+        # Validates the polling options
+        RequestPoller(client, [], **self._poll_options)
+
+        self._request_ids = {}
+
+    @property
+    def request_ids(self) -> dict:
+        """Chunk number (starting with 0) -> created request ID"""
+        return dict(sorted(self._request_ids.items()))
+
+    def __iter__(self):
+        """
+        :return: Iterator[Record]
+        """
+        poller = RequestPoller(self._client, [], **self._poll_options)
+        journal = self._journal
+        emails = iter(self._emails)
+        exhausted = False
+        number = 0
+
+        submitting = {}
+        waiting = {}
+        fetching = {}
+        cached = []
+
+        def in_progress():
+            return len(submitting) + len(waiting) + len(fetching) \
+                + len(cached)
+
+        submit_executor = ThreadPoolExecutor(self._submit_workers)
+        fetch_executor = ThreadPoolExecutor(self._fetch_workers)
+        try:
+            while True:
+                while not exhausted \
+                        and len(submitting) < self._submit_workers \
+                        and in_progress() < self._max_pending:
+                    chunk = list(islice(emails, self._chunk_size))
+                    if not chunk:
+                        exhausted = True
+                        break
+
+                    state = self._resume(number, chunk)
+                    if state is None:
+                        future = submit_executor.submit(
+                            self._submit, number, chunk)
+                        submitting[future] = (number, chunk)
+                    elif state.done:
+                        pass
+                    elif state.request_id is None:
+                        cached.append((number, chunk))
+                    elif state.ready:
+                        future = fetch_executor.submit(
+                            self._fetch, state.request_id, chunk)
+                        fetching[future] = (number, chunk)
+                    else:
+                        waiting[state.request_id] = (number, chunk)
+                        poller.add([state.request_id])
+                    number += 1
+
+                if exhausted and not in_progress():
+                    return
+
+                for future in [f for f in submitting if f.done()]:
+                    chunk_number, chunk = submitting.pop(future)
+                    request_id = future.result()
+
+                    if request_id is None:
+                        # Every address had a cached result
+                        cached.append((chunk_number, chunk))
+                        continue
+
+                    self._request_ids[chunk_number] = request_id
+                    waiting[request_id] = (chunk_number, chunk)
+                    poller.add([request_id])
+
+                while cached:
+                    chunk_number, chunk = cached.pop(0)
+                    for record in self._emit(
+                            chunk_number, self._merge(chunk, [])):
+                        yield record
+
+                for bulk_request in poller.poll():
+                    chunk_number, chunk = waiting.pop(bulk_request.id)
+                    if journal is not None:
+                        journal.ready(chunk_number)
+
+                    future = fetch_executor.submit(
+                        self._fetch, bulk_request.id, chunk)
+                    fetching[future] = (chunk_number, chunk)
+
+                for future in [f for f in fetching if f.done()]:
+                    chunk_number, _ = fetching.pop(future)
+                    for record in self._emit(chunk_number, future.result()):
+                        yield record
+
+                timeout = None
+                if poller.next_due is not None:
+                    timeout = max(poller.next_due - monotonic(), 0)
+
+                futures = list(submitting) + list(fetching)
+                if futures:
+                    wait(futures, timeout, FIRST_COMPLETED)
+                elif timeout:
+                    sleep(timeout)
+        finally:
+            for future in list(submitting) + list(fetching):
+                future.cancel()
+            submit_executor.shutdown()
+            fetch_executor.shutdown()
+
+    def run(self) -> list:
+        """
+        Verify all emails
+        :return: list[Record]
+        """
+        return list(self)
+
+    def _emit(self, number: int, records: list):
+        journal = self._journal
+        if journal is None:
+            for record in records:
+                yield record
+            return
+
+        for offset in range(journal.chunk(number).fetched, len(records)):
+            yield records[offset]
+            if (offset + 1) % journal.checkpoint == 0:
+                journal.fetched(number, offset + 1)
+        journal.done(number)
+
+    def _resume(self, number: int, chunk: list) -> ChunkState or None:
+        if self._journal is None:
+            return None
+
+        state = self._journal.chunk(number)
+        if state is None:
+            return None
+        if state.digest != JobJournal.digest(chunk):
+            raise ParameterError(
+                'Chunk {} does not match the journal'.format(number))
+
+        if state.request_id is not None:
+            self._request_ids[number] = state.request_id
+        return state
+
+    def _submit(self, number: int, chunk: list) -> int or None:
+        request_id = self._client.create_request(emails=chunk)
+        # Journaled on the worker: the consumer may not resume the
+        # generator before a crash, and the chunk must not be paid twice
+        if self._journal is not None:
+            self._journal.submitted(
+                number, JobJournal.digest(chunk), request_id)
+        return request_id
+
+    def _fetch(self, request_id: int, chunk: list) -> list:
+        records = self._merge(
+            chunk, list(self._client.iter_records(request_id=request_id)))
+        if self._include_failed:
+            records.extend(self._client.iter_records(
+                request_id=request_id, return_failed=True))
+        return records
+
+    def _merge(self, chunk: list, records: list) -> list:
+        if self._client.cache is None:
+            return records
+        return self._client._merge_records(chunk, records).data
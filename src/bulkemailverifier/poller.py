@@ -0,0 +1,337 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+
+import asyncio
+
+from .exceptions.error import ParameterError
+from .models.response import BulkRequest
+
+
+class _Tracked:
+    __slots__ = ('id', 'due', 'interval', 'processed', 'checked')
+
+    def __init__(self, request_id: int, due: float, interval: float):
+        self.id = request_id
+        self.due = due
+        self.interval = interval
+        self.processed = None
+        self.checked = None
+
+
+class RequestPoller:
+    """
+    Waits for many bulk requests at once.
+
+    Requests that are due are checked together with as few `get_status`
+    calls as possible, the batches are sent concurrently. The polling
+    interval of every request adapts to its progress: it is set to the
+    estimated time left while `processed_emails` grows and increases
+    exponentially while it stalls.
+    Ready requests are dropped from the poll set and yielded in the order
+    they finish.
+
+        for bulk_request in client.wait_for_requests(request_ids=ids):
+            records = client.get_records(request_id=bulk_request.id)
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_MIN_INTERVAL = 2.0
+    DEFAULT_MAX_INTERVAL = 60.0
+    DEFAULT_BACKOFF = 2.0
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self, client, request_ids: list, **kwargs):
+        """
+        :param client: `Client` instance
+        :param request_ids: list[int]. Request IDs to wait for
+        :key batch_size: Optional. Max IDs per `get_status` call.
+                `RequestPoller.DEFAULT_BATCH_SIZE` by default
+        :key min_interval: Optional. Seconds between checks of a request
+                at least. `RequestPoller.DEFAULT_MIN_INTERVAL` by default
+        :key max_interval: Optional. Seconds between checks of a request
+                at most. `RequestPoller.DEFAULT_MAX_INTERVAL` by default
+        :key backoff: Optional. Interval multiplier for stalled requests.
+                `RequestPoller.DEFAULT_BACKOFF` by default
+        :key max_workers: Optional. Maximum number of concurrent
+                `get_status` calls.
+                `RequestPoller.DEFAULT_MAX_WORKERS` by default
+        :key timeout: Optional. Stop waiting after this many seconds.
+                Unfinished requests remain in `pending`. No limit by default
+        :key callback: Optional. Called with every ready `BulkRequest`
+        :raises ParameterError: invalid parameter value
+        """
+        self._client = client
+        self._batch_size = RequestPoller.DEFAULT_BATCH_SIZE
+        self._min_interval = RequestPoller.DEFAULT_MIN_INTERVAL
+        self._max_interval = RequestPoller.DEFAULT_MAX_INTERVAL
+        self._backoff = RequestPoller.DEFAULT_BACKOFF
+        self._max_workers = RequestPoller.DEFAULT_MAX_WORKERS
+        self._timeout = None
+        self._callback = None
+
+        if 'batch_size' in kwargs:
+            self._batch_size = _validate_positive(
+                kwargs['batch_size'], 'Batch size', (int,))
+        if 'min_interval' in kwargs:
+            self._min_interval = _validate_positive(
+                kwargs['min_interval'], 'Min interval')
+        if 'max_interval' in kwargs:
+            self._max_interval = _validate_positive(
+                kwargs['max_interval'], 'Max interval')
+        if 'backoff' in kwargs:
+            self._backoff = _validate_positive(kwargs['backoff'], 'Backoff')
+        if 'max_workers' in kwargs:
+            self._max_workers = _validate_positive(
+                kwargs['max_workers'], 'Max workers', (int,))
+        if kwargs.get('timeout') is not None:
+            self._timeout = _validate_positive(kwargs['timeout'], 'Timeout')
+        if kwargs.get('callback') is not None:
+            if not callable(kwargs['callback']):
+                raise ParameterError('Callback must be callable')
+            self._callback = kwargs['callback']
+
+        if self._max_interval < self._min_interval:
+            raise ParameterError('Max interval is less than min interval')
+
+        self._pending = {}
+        # Ready requests not returned yet because a later batch failed
+        self._ready = []
+        if request_ids:
+            self.add(request_ids)
+
+    @property
+    def pending(self) -> list:
+        """IDs of the requests that are not ready yet"""
+        return list(self._pending)
+
+    @property
+    def next_due(self) -> float or None:
+        """
+        `time.monotonic()` value of the next status check. None if there
+        are no pending requests
+        """
+        if not self._pending:
+            return None
+        return min(t.due for t in self._pending.values())
+
+    def add(self, request_ids: list):
+        """
+        Start waiting for more requests. They are checked on the next poll
+        :param request_ids: list[int]
+        :raises ParameterError: invalid request ID
+        """
+        now = monotonic()
+        for request_id in self._client._validate_request_ids(request_ids):
+            if request_id not in self._pending:
+                self._pending[request_id] = \
+                    _Tracked(request_id, now, self._min_interval)
+
+    def poll(self) -> list:
+        """
+        Check the requests that are due without waiting
+        :return: list[BulkRequest]. Requests that became ready
+        """
+        if self._ready:
+            return self._take_ready()
+
+        now = monotonic()
+        next_due = self.next_due
+        if next_due is None or next_due > now:
+            return []
+        return self._poll(now)
+
+    def __iter__(self):
+        """
+        :return: Iterator[BulkRequest]. Requests in the order they finish
+        """
+        deadline = None
+        if self._timeout is not None:
+            deadline = monotonic() + self._timeout
+
+        for bulk_request in self._take_ready():
+            yield bulk_request
+
+        while self._pending:
+            now = monotonic()
+            if deadline is not None and now >= deadline:
+                return
+
+            due_time = self.next_due
+            if due_time > now:
+                if deadline is not None:
+                    due_time = min(due_time, deadline)
+                sleep(due_time - now)
+                continue
+
+            for bulk_request in self._poll(now):
+                yield bulk_request
+
+    def run(self) -> list:
+        """
+        Wait until all requests are ready or the timeout expires
+        :return: list[BulkRequest]. Ready requests
+        """
+        return list(self)
+
+    def _poll(self, now: float) -> list:
+        batches = self._due_batches(now)
+        if len(batches) == 1:
+            batch = batches[0]
+            self._update(batch, self._client._get_status_batch(batch))
+            return self._take_ready()
+
+        error = None
+        workers = min(self._max_workers, len(batches))
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [executor.submit(self._client._get_status_batch, batch)
+                       for batch in batches]
+            for batch, future in zip(batches, futures):
+                try:
+                    self._update(batch, future.result())
+                except Exception as e:
+                    error = error or e
+
+        if error is not None:
+            raise error
+        return self._take_ready()
+
+    def _due_batches(self, now: float) -> list:
+        # Requests due soon are checked together with the due ones
+        horizon = now + self._min_interval / 2
+        due = [t.id for t in self._pending.values() if t.due <= horizon]
+
+        return [due[i:i + self._batch_size]
+                for i in range(0, len(due), self._batch_size)]
+
+    def _take_ready(self) -> list:
+        ready, self._ready = self._ready, []
+        return ready
+
+    def _update(self, batch: list, statuses: dict):
+        checked = monotonic()
+
+        for request_id in batch:
+            tracked = self._pending.get(request_id)
+            if tracked is None:
+                continue
+
+            bulk_request = statuses.get(request_id)
+            if bulk_request is not None and bulk_request.ready:
+                del self._pending[request_id]
+                self._ready.append(bulk_request)
+                if self._callback is not None:
+                    self._callback(bulk_request)
+            else:
+                # None if not in the response
+                self._reschedule(tracked, bulk_request, checked)
+
+    def _reschedule(self, tracked: _Tracked, bulk_request: BulkRequest or None,
+                    now: float):
+        processed = None if bulk_request is None \
+            else bulk_request.processed_emails
+
+        interval = tracked.interval * self._backoff
+        if processed is not None and tracked.processed is not None \
+                and processed > tracked.processed:
+            elapsed = max(now - tracked.checked, 1e-6)
+            rate = (processed - tracked.processed) / elapsed
+            left = max(bulk_request.total_emails - processed, 0)
+            interval = left / rate
+
+        tracked.interval = \
+            min(max(interval, self._min_interval), self._max_interval)
+        tracked.due = now + tracked.interval
+        tracked.checked = now
+        if processed is not None:
+            tracked.processed = processed
+
+
+class AsyncRequestPoller(RequestPoller):
+    """
+    asyncio version of `RequestPoller` for `AsyncClient`. `poll` and
+    `run` are coroutines and the ready requests are iterated with
+    `async for`, the event loop is not blocked between the checks.
+
+        async for bulk_request in client.wait_for_requests(request_ids=ids):
+            records = await client.get_records(request_id=bulk_request.id)
+    """
+
+    def __iter__(self):
+        raise TypeError('Use "async for" instead')
+
+    async def __aiter__(self):
+        """
+        :return: AsyncIterator[BulkRequest]. Requests in the order they
+                finish
+        """
+        deadline = None
+        if self._timeout is not None:
+            deadline = monotonic() + self._timeout
+
+        for bulk_request in self._take_ready():
+            yield bulk_request
+
+        while self._pending:
+            now = monotonic()
+            if deadline is not None and now >= deadline:
+                return
+
+            due_time = self.next_due
+            if due_time > now:
+                if deadline is not None:
+                    due_time = min(due_time, deadline)
+                await asyncio.sleep(due_time - now)
+                continue
+
+            for bulk_request in await self._poll(now):
+                yield bulk_request
+
+    async def poll(self) -> list:
+        """
+        Check the requests that are due without waiting
+        :return: list[BulkRequest]. Requests that became ready
+        """
+        if self._ready:
+            return self._take_ready()
+
+        now = monotonic()
+        next_due = self.next_due
+        if next_due is None or next_due > now:
+            return []
+        return await self._poll(now)
+
+    async def run(self) -> list:
+        """
+        Wait until all requests are ready or the timeout expires
+        :return: list[BulkRequest]. Ready requests
+        """
+        return [bulk_request async for bulk_request in self]
+
+    async def _poll(self, now: float) -> list:
+        batches = self._due_batches(now)
+        semaphore = asyncio.Semaphore(self._max_workers)
+
+        async def get_batch(request_ids):
+            async with semaphore:
+                return await self._client._get_status_batch(request_ids)
+
+        results = await asyncio.gather(
+            *map(get_batch, batches), return_exceptions=True)
+
+        error = None
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                error = error or result
+            else:
+                self._update(batch, result)
+
+        if error is not None:
+            raise error
+        return self._take_ready()
+
+
+def _validate_positive(value, name: str, types: tuple = (int, float)):
+    if type(value) in types and value > 0:
+        return value
+
+    raise ParameterError(f'{name} must be a positive number')
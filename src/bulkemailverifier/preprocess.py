@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import re
+
+from .models.response import Record
+
+_re_email = re.compile(
+    r'^(?!\.)(?!.*\.\.)[^\s@"(),:;<>\[\]\\]{1,64}(?<!\.)'
+    r'@(?=.{1,253}$)(?:(?!-)[\w-]{1,63}(?<!-)\.)+'
+    r'(?:[^\W\d_]{2,63}|xn--[a-z0-9-]{1,59})$'
+)
+
+
+def normalize_email(value: str) -> str or None:
+    """
+    Trim whitespace and lowercase the domain part of an address.
+    The local part is kept as is, it may be case-sensitive.
+    :return: str. Normalized address or None if it cannot be valid
+    """
+    if type(value) is not str:
+        return None
+
+    value = value.strip()
+    local, at, domain = value.rpartition('@')
+    if not at:
+        return None
+
+    value = local + '@' + domain.rstrip('.').lower()
+    if _re_email.match(value) is None:
+        return None
+    return value
+
+
+def iter_unique_emails(emails, window: int = None):
+    """
+    Normalize, filter and deduplicate addresses on the fly
+    :param emails: Iterable[str]
+    :param window: Optional. Remember only this many recent addresses to
+            bound memory. Repeats further apart than `window` are passed
+            through again. All addresses are remembered by default
+    :return: Iterator[str]. Unique normalized addresses in input order
+    """
+    if window is None:
+        seen = set()
+        for value in emails:
+            email = normalize_email(value)
+            if email is not None and email not in seen:
+                seen.add(email)
+                yield email
+        return
+
+    if type(window) is not int or window < 1:
+        raise ValueError('Window should be a positive integer')
+
+    recent = OrderedDict()
+    for value in emails:
+        email = normalize_email(value)
+        if email is None:
+            continue
+        if email in recent:
+            recent.move_to_end(email)
+            continue
+
+        recent[email] = None
+        if len(recent) > window:
+            recent.popitem(last=False)
+        yield email
+
+
+class PreparedEmails:
+    """
+    Result of `prepare_emails`: unique normalized addresses to submit
+    plus the data required to map verification results back to the
+    original input.
+    """
+
+    def __init__(self):
+        self.emails = []
+        self.rejected = []
+        self.mapping = {}
+
+    @property
+    def duplicates(self) -> int:
+        """Number of valid input addresses removed as duplicates"""
+        return sum(len(v) for v in self.mapping.values()) - len(self.emails)
+
+    def fan_out(self, records) -> dict:
+        """
+        Map results of the unique addresses back to the original input
+        :param records: Iterable[Record]
+        :return: dict. Original input value -> `Record`. Rejected values
+                get a `Record` with the 'Invalid format' error
+        """
+        result = {}
+        for record in records:
+            for original in self.mapping.get(record.email_address, ()):
+                result[original] = record
+        for original in self.rejected:
+            result[original] = _rejected_record(original)
+        return result
+
+
+def prepare_emails(emails) -> PreparedEmails:
+    """
+    Normalize and deduplicate addresses before creating a request.
+    Addresses that cannot be valid are not sent to the API.
+    :param emails: Iterable[str]
+    :return: `PreparedEmails` instance
+    """
+    prepared = PreparedEmails()
+
+    for value in emails:
+        email = normalize_email(value)
+        if email is None:
+            prepared.rejected.append(value)
+            continue
+
+        originals = prepared.mapping.get(email)
+        if originals is None:
+            originals = prepared.mapping[email] = []
+            prepared.emails.append(email)
+        originals.append(value)
+
+    return prepared
+
+
+def _rejected_record(value) -> Record:
+    record = Record(None)
+    record.email_address = str(value)
+    record.format_check = False
+    record.error = 'Invalid format'
+    return record
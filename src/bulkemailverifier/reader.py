@@ -0,0 +1,325 @@
+from array import array
+
+import csv
+import io
+import mmap
+import os
+import re
+import struct
+import zlib
+
+from .cache import ResultCache
+from .exceptions.error import FileError
+from .models.response import Record
+from .models.table import RecordTable
+
+# CSV header (lowercase, letters and digits only) -> `Record` API key
+_COLUMNS = {
+    'email': 'emailAddress',
+    'emailaddress': 'emailAddress',
+    'formatcheck': 'formatCheck',
+    'smtpcheck': 'smtpCheck',
+    'dnscheck': 'dnsCheck',
+    'freecheck': 'freeCheck',
+    'disposablecheck': 'disposableCheck',
+    'catchallcheck': 'catchAllCheck',
+    'mxrecords': 'mxRecords',
+    'result': 'result',
+    'error': 'error',
+}
+
+_HEADER_CHARS = re.compile(r'[^a-z0-9]')
+_MX_RECORDS = re.compile(r'[^\s,;|]+')
+
+_BOM = b'\xef\xbb\xbf'
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# Sidecar index: magic, CSV size, CSV mtime (ns), rows, hash table slots,
+# followed by rows + 1 row offsets and the hash table, all native uint64
+_INDEX_MAGIC = b'BEVIDX1\n'
+_INDEX_HEADER = struct.Struct('=8sQQQQ')
+
+_BATCH_SIZE = 10000
+_BLOCK_SIZE = 1 << 20
+
+
+def _key_hash(key: str) -> int:
+    # Stable across processes, unlike hash()
+    return zlib.crc32(key.encode('UTF-8'))
+
+
+class RecordFileReader:
+    """
+    Reader for the CSV files written by `Client.download`.
+
+    The file is memory-mapped and only the offsets of its rows are kept
+    in memory, so rows are decoded on demand: one by one, by row number
+    or in batches. Lookups by email address use a hash table of row
+    numbers, which can be saved in a sidecar index file next to the CSV
+    and mapped back on the next open instead of being rebuilt.
+
+        client.download(filename='emails.csv', request_id=request_id)
+
+        with RecordFileReader('emails.csv', index='emails.csv.idx') as f:
+            print(len(f), f[0].result)
+            record = f.find('foo@example.com')
+            for table in f.iter_tables(batch_size=50000):
+                print(table.group_count('result'))
+    """
+
+    def __init__(self, filename: str, **kwargs):
+        """
+        :param filename: Uncompressed CSV file name
+        :key index: Optional. Sidecar index file name. Created, or
+                replaced if the CSV file has changed since. By default
+                the lookup table is built in memory on the first `find`
+        :raises FileError: the file cannot be read or is not a results CSV
+        """
+        self._filename = filename
+        self._index_filename = kwargs.get('index')
+        self._index_map = None
+        self._table = None
+
+        try:
+            with open(filename, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                self._stat = (stat.st_size, stat.st_mtime_ns)
+                if stat.st_size:
+                    self._map = mmap.mmap(
+                        f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self._map = b''
+        except (OSError, ValueError):
+            raise FileError('Cannot read file: {}'.format(filename))
+
+        if self._map[:2] == _GZIP_MAGIC:
+            self.close()
+            raise FileError('Compressed files are not supported')
+
+        start = len(_BOM) if self._map[:3] == _BOM else 0
+        if self._index_filename is not None \
+                and self._load_index(self._index_filename):
+            header = self._parse(start, self._offsets[0])
+        else:
+            offsets = self._index_rows(start)
+            header = self._parse(start, offsets[1]) if len(offsets) > 1 \
+                else []
+            self._offsets = offsets[1:]
+
+        self._keys = [_COLUMNS.get(_HEADER_CHARS.sub('', c.lower()))
+                      for c in (header[0] if header else ())]
+        if 'emailAddress' not in self._keys:
+            self.close()
+            raise FileError('No email address column in {}'.format(filename))
+        self._email_column = self._keys.index('emailAddress')
+
+        if self._index_filename is not None and self._index_map is None:
+            self._build_table()
+            self._save_index(self._index_filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Record:
+        return self.record(index)
+
+    def __iter__(self):
+        """
+        :return: Iterator[Record]
+        """
+        for batch in self._iter_batches(_BATCH_SIZE):
+            for record in batch:
+                yield record
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def close(self):
+        self._offsets = self._table = None
+        for resource in (self._index_map, self._map):
+            if isinstance(resource, mmap.mmap):
+                resource.close()
+
+    def record(self, index: int) -> Record:
+        """
+        :return: `Record` of the row `index`, header excluded
+        :raises IndexError: no such row
+        """
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('Row index out of range')
+
+        return self._records(index, index + 1)[0]
+
+    def records(self, start: int = 0, stop: int = None) -> list:
+        """
+        :return: list[Record]. Rows from `start` up to `stop`
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return self._records(start, stop) if start < stop else []
+
+    def iter_tables(self, batch_size: int = _BATCH_SIZE):
+        """
+        :param batch_size: Rows per table
+        :return: Iterator[RecordTable]
+        """
+        for batch in self._iter_batches(batch_size):
+            yield RecordTable(batch)
+
+    def find(self, email: str) -> Record or None:
+        """
+        Look up an address, compared in its normalized form
+        :return: `Record` or None if the address is not in the file
+        """
+        if self._table is None:
+            self._build_table()
+
+        key = ResultCache.key(email)
+        table = self._table
+        mask = len(table) - 1
+        slot = _key_hash(key) & mask
+        while table[slot]:
+            index = table[slot] - 1
+            row = self._parse(self._offsets[index], self._offsets[index + 1])
+            if row and len(row[0]) > self._email_column \
+                    and ResultCache.key(row[0][self._email_column]) == key:
+                return self._record(row[0])
+            slot = (slot + 1) & mask
+        return None
+
+    def _iter_batches(self, batch_size: int):
+        if type(batch_size) is not int or batch_size < 1:
+            raise ValueError('Batch size should be a positive integer')
+
+        for start in range(0, len(self), batch_size):
+            yield self._records(start, min(start + batch_size, len(self)))
+
+    def _records(self, start: int, stop: int) -> list:
+        rows = self._parse(self._offsets[start], self._offsets[stop])
+        return [self._record(row) for row in rows]
+
+    def _record(self, row: list) -> Record:
+        # Unknown columns end up under the None key, which Record ignores
+        values = dict(zip(self._keys, row))
+        mx_records = values.get('mxRecords')
+        if mx_records is not None:
+            values['mxRecords'] = _MX_RECORDS.findall(mx_records)
+        return Record(values)
+
+    def _parse(self, start: int, stop: int) -> list:
+        text = self._map[start:stop].decode('UTF-8', 'replace')
+        return [row for row in csv.reader(io.StringIO(text)) if row]
+
+    def _index_rows(self, position: int) -> array:
+        """
+        Start offsets of the non-blank rows and the end of the last one.
+        Newlines inside quoted fields are skipped: a row ends at the first
+        newline after an even number of quotes. The file is scanned in
+        blocks as mmap has no count() before Python 3.13.
+        """
+        data = self._map
+        size = len(data)
+        offsets = array('Q')
+        start = position
+        quotes = 0
+
+        while position < size:
+            block_start = position
+            block = data[position:position + _BLOCK_SIZE]
+            find, count = block.find, block.count
+            position = 0
+            while True:
+                end = find(b'\n', position)
+                if end < 0:
+                    break
+                end += 1
+                quotes += count(b'"', position, end)
+                position = end
+                if quotes % 2:
+                    continue
+                quotes = 0
+                end += block_start
+                if end - start > 2 or data[start:end].strip():
+                    offsets.append(start)
+                start = end
+            quotes += count(b'"', position)
+            position = block_start + len(block)
+
+        if data[start:size].strip():
+            offsets.append(start)
+        offsets.append(size)
+        return offsets
+
+    def _build_table(self):
+        """
+        Open addressing hash table of row number + 1 (0 is an empty slot)
+        with at least twice as many slots as rows
+        """
+        slots = 1
+        while slots < 2 * len(self):
+            slots *= 2
+        table = array('Q', bytes(8 * slots))
+        mask = slots - 1
+
+        column = self._email_column
+        index = 0
+        for start in range(0, len(self), _BATCH_SIZE):
+            stop = min(start + _BATCH_SIZE, len(self))
+            for row in self._parse(self._offsets[start], self._offsets[stop]):
+                email = row[column] if column < len(row) else ''
+                slot = _key_hash(ResultCache.key(email)) & mask
+                while table[slot]:
+                    slot = (slot + 1) & mask
+                index += 1
+                table[slot] = index
+
+        self._table = table
+
+    def _load_index(self, filename: str) -> bool:
+        """
+        Map the sidecar index. False if it is missing or outdated
+        """
+        try:
+            with open(filename, 'rb') as f:
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            magic, size, mtime, rows, slots = \
+                _INDEX_HEADER.unpack_from(index_map)
+        except struct.error:
+            magic = None
+        expected = _INDEX_HEADER.size + 8 * (rows + 1 + slots) \
+            if magic == _INDEX_MAGIC else None
+        if expected != len(index_map) or (size, mtime) != self._stat:
+            index_map.close()
+            return False
+
+        self._index_map = index_map
+        view = memoryview(index_map)[_INDEX_HEADER.size:].cast('Q')
+        self._offsets = view[:rows + 1]
+        self._table = view[rows + 1:]
+        return True
+
+    def _save_index(self, filename: str):
+        temp_filename = filename + '.tmp'
+        try:
+            with open(temp_filename, 'wb') as f:
+                f.write(_INDEX_HEADER.pack(
+                    _INDEX_MAGIC, self._stat[0], self._stat[1],
+                    len(self), len(self._table)))
+                self._offsets.tofile(f)
+                self._table.tofile(f)
+            os.replace(temp_filename, filename)
+        except OSError:
+            raise FileError('Cannot write index file: {}'.format(filename))
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from bulkemailverifier import AsyncClient, BulkRequest, ParameterError, \
+    Record
+from bulkemailverifier.net.async_http import aiohttp
+
+from tests.stub import StubApiServer
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncClient(unittest.TestCase):
+    """
+    AsyncClient tests against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.server = StubApiServer()
+        self.server.start()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        self.server.stop()
+
+    def _run(self, coroutine):
+        async def wrapper():
+            async with AsyncClient(
+                    self.api_key, base_url=self.server.base_url) as client:
+                return await coroutine(client)
+
+        return self.loop.run_until_complete(wrapper())
+
+    def test_create_request(self):
+        request_id = self._run(
+            lambda c: c.create_request(emails=['foo@example.com']))
+
+        self.assertEqual(request_id, 1)
+
+    def test_concurrent_status(self):
+        async def poll(client):
+            return await asyncio.gather(
+                *[client.get_status(request_ids=[i]) for i in range(1, 51)])
+
+        responses = self._run(poll)
+
+        self.assertEqual(len(responses), 50)
+        self.assertIsInstance(responses[0].data[0], BulkRequest)
+        self.assertEqual(responses[49].data[0].id, 50)
+
+    def test_download(self):
+        filename = os.path.join(tempfile.mkdtemp(), 'result.csv')
+
+        self._run(lambda c: c.download(filename=filename, request_id=1))
+
+        self.assertGreater(os.path.getsize(filename), 0)
+        os.remove(filename)
+
+    def test_get_records(self):
+        response = self._run(lambda c: c.get_records(request_id=1))
+
+        self.assertIsInstance(response.data[0], Record)
+        self.assertEqual(response.data[0].email_address, 'foo@example.com')
+
+    def test_get_requests(self):
+        response = self._run(lambda c: c.get_requests())
+
+        self.assertEqual(response.last_page, 1)
+
+    def test_raw_status(self):
+        response = self._run(lambda c: c.get_status_raw(request_ids=[1]))
+
+        self.assertTrue(response.startswith('{"response"'))
+
+    def test_validation(self):
+        with self.assertRaises(ParameterError):
+            self._run(lambda c: c.get_records(request_id='foo'))
+
+    def test_verify(self):
+        client = AsyncClient(self.api_key, base_url=self.server.base_url)
+
+        with self.assertRaises(TypeError):
+            client.verify(emails=['foo@example.com'])
+        self.assertEqual(self.server.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks import suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_check(self):
+        results = {'a': 1.0, 'b': 5.0, 'c': 100.0}
+        thresholds = {'a': 2.0, 'b': 4.0}
+
+        self.assertEqual(suite.check(results, thresholds),
+                         [('b', 5.0, 4.0)])
+        self.assertEqual(suite.check(results, thresholds, 1.5), [])
+        self.assertEqual(suite.check(results, thresholds, 0.25),
+                         [('a', 1.0, 0.5), ('b', 5.0, 1.0)])
+
+    def test_thresholds(self):
+        with open(suite.THRESHOLDS) as file:
+            thresholds = json.load(file)
+
+        results = suite.run(quick=True)
+        self.assertTrue(set(results) <= set(thresholds))
+        self.assertTrue(all(v > 0 for v in results.values()))
+
+    def test_output(self):
+        directory = tempfile.mkdtemp()
+        try:
+            output = os.path.join(directory, 'results.json')
+            limits = os.path.join(directory, 'thresholds.json')
+            with open(limits, 'w') as file:
+                json.dump({'poll.us_per_request': 0.0}, file)
+
+            code = suite.main(['--quick', '--check', '--output', output,
+                               '--thresholds', limits])
+
+            with open(output) as file:
+                report = json.load(file)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(code, 1)
+        self.assertTrue(report['quick'])
+        self.assertEqual(report['exceeded'], ['poll.us_per_request'])
+        self.assertIn('records_1000.decode_us_per_record', report['results'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import os
+import tempfile
+import time
+import unittest
+
+from bulkemailverifier import Client, ParameterError, Record, ResultCache
+
+from tests.stub import StubApiServer
+
+
+def _record(email: str, result: str = 'ok') -> Record:
+    return Record({
+        'emailAddress': email,
+        'formatCheck': 'true',
+        'smtpCheck': 'true',
+        'dnsCheck': 'true',
+        'freeCheck': 'false',
+        'disposableCheck': 'false',
+        'catchAllCheck': 'null',
+        'mxRecords': ['mx.example.com'],
+        'result': result
+    })
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_round_trip(self):
+        with ResultCache() as cache:
+            record = _record('foo@example.com')
+            cache.put(record)
+
+            self.assertEqual(cache.get(' foo@EXAMPLE.com'), record)
+            self.assertIsNone(cache.get('bar@example.com'))
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertIsNone(cache.get('foo@example.com').catch_all_check)
+
+    def test_misses(self):
+        with ResultCache() as cache:
+            cache.put_many([_record('a@x.com'), _record('b@x.com')])
+
+            misses = cache.filter_misses(
+                ['a@x.com', 'c@x.com', 'b@X.com', 'c@X.com', 'd@x.com'])
+
+            self.assertEqual(misses, ['c@x.com', 'd@x.com'])
+            self.assertEqual((cache.hits, cache.misses), (2, 2))
+            self.assertEqual(
+                list(cache.iter_misses(['a@x.com', 'c@x.com'], 1)),
+                ['c@x.com'])
+
+    def test_lookup(self):
+        with ResultCache() as cache:
+            cache.put(_record('a@X.com'))
+
+            found = cache.lookup(['a@x.com', 'b@x.com'])
+
+            self.assertEqual(list(found), ['a@x.com'])
+            self.assertEqual(found['a@x.com'].email_address, 'a@X.com')
+            self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_ttl(self):
+        with ResultCache(ttl=lambda r: 0 if r.result == 'unknown' else 60) \
+                as cache:
+            cache.put_many([_record('a@x.com'), _record('b@x.com', 'unknown')])
+            cache.put(_record('c@x.com'), ttl=0)
+
+            self.assertEqual(list(cache.get_many(
+                ['a@x.com', 'b@x.com', 'c@x.com'])), ['a@x.com'])
+            self.assertEqual(cache.purge(), 2)
+            self.assertEqual(len(cache), 1)
+
+    def test_eviction(self):
+        with ResultCache(max_entries=2) as cache:
+            cache.put(_record('a@x.com'))
+            time.sleep(0.01)
+            cache.put(_record('b@x.com'))
+            time.sleep(0.01)
+            cache.get('a@x.com')
+            time.sleep(0.01)
+            cache.put(_record('c@x.com'))
+
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache.get('b@x.com'))
+            self.assertIsNotNone(cache.get('a@x.com'))
+
+    def test_persistence(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'cache.sqlite')
+        try:
+            with ResultCache(path) as cache:
+                cache.put(_record('a@x.com'))
+            with ResultCache(path) as cache:
+                self.assertIsNotNone(cache.get('a@x.com'))
+        finally:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            ResultCache(ttl=-1)
+        with self.assertRaises(ValueError):
+            ResultCache(max_entries=0)
+
+
+class TestClientCache(unittest.TestCase):
+    """
+    Cached request creation against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.server = StubApiServer({'/request/completed': self._records})
+        self.server.start()
+        self.cache = ResultCache()
+        self.client = Client(self.api_key, base_url=self.server.base_url,
+                             cache=self.cache)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.cache.close()
+        self.server.stop()
+
+    def _records(self, payload, headers):
+        emails = self.server.calls[0][1]['emails']
+        return 200, {'response': [
+            {'emailAddress': e, 'formatCheck': 'true', 'result': 'ok'}
+            for e in emails
+        ]}, None
+
+    def test_create_and_merge(self):
+        self.cache.put(_record('a@x.com', 'cached'))
+        emails = ['b@x.com', 'a@X.com', 'c@x.com']
+
+        request_id = self.client.create_request(emails=emails)
+        self.assertEqual(self.server.calls[0][1]['emails'],
+                         ['b@x.com', 'c@x.com'])
+
+        result = self.client.get_records_merged(
+            emails=emails, request_id=request_id)
+
+        self.assertEqual([r.email_address for r in result.data],
+                         ['b@x.com', 'a@x.com', 'c@x.com'])
+        self.assertEqual(result.data[1].result, 'cached')
+        self.assertEqual(len(self.cache), 3)
+
+    def test_all_cached(self):
+        self.cache.put(_record('a@x.com'))
+
+        self.assertIsNone(self.client.create_request(emails=['a@x.com']))
+        self.assertEqual(self.client.create_requests_chunked(
+            emails=['a@x.com']), {})
+        self.assertEqual(self.server.calls, [])
+
+        result = self.client.get_records_merged(emails=['a@x.com'])
+        self.assertEqual(len(result.data), 1)
+
+    def test_chunked(self):
+        self.cache.put(_record('user1@x.com'))
+
+        self.client.create_requests_chunked(
+            emails=('user{}@x.com'.format(i) for i in range(5)),
+            chunk_size=2)
+
+        submitted = sorted(e for _, payload in self.server.calls
+                           for e in payload['emails'])
+        self.assertEqual(submitted, ['user0@x.com', 'user2@x.com',
+                                     'user3@x.com', 'user4@x.com'])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 4))
+
+    def test_incorrect_emails(self):
+        with self.assertRaises(ParameterError):
+            self.client.create_requests_chunked(emails=[1, 2])
+        with self.assertRaises(ParameterError):
+            self.client.create_request(emails=['a@x.com', None])
+        with self.assertRaises(ParameterError):
+            self.cache.get(1)
+        self.assertEqual(self.server.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
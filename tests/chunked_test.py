@@ -0,0 +1,70 @@
+import itertools
+import threading
+import unittest
+
+from bulkemailverifier import Client, ParameterError
+
+from tests.stub import ConcurrencyRoute, StubApiServer
+
+
+class TestChunkedCreate(unittest.TestCase):
+    """
+    Chunked request creation against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.concurrency = ConcurrencyRoute(self._create, 0.02)
+        self.server = StubApiServer({'/request': self.concurrency})
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def _create(self, payload, headers):
+        with self.lock:
+            request_id = next(self.ids)
+        return 200, {'response': {'id': request_id}}, None
+
+    def test_chunks(self):
+        emails = ('user{}@example.com'.format(i) for i in range(25))
+
+        result = self.client.create_requests_chunked(
+            emails=emails, chunk_size=10, max_workers=2)
+
+        self.assertEqual(list(result.keys()), [0, 1, 2])
+        self.assertEqual(sorted(result.values()), [1, 2, 3])
+
+        sizes = sorted(len(payload['emails'])
+                       for _, payload in self.server.calls)
+        self.assertEqual(sizes, [5, 10, 10])
+
+    def test_parallelism_cap(self):
+        emails = ['user{}@example.com'.format(i) for i in range(40)]
+
+        self.client.create_requests_chunked(
+            emails=emails, chunk_size=2, max_workers=3)
+
+        self.assertEqual(len(self.server.calls), 20)
+        self.assertLessEqual(self.concurrency.max_active, 3)
+
+    def test_empty(self):
+        with self.assertRaises(ParameterError):
+            self.client.create_requests_chunked(emails=iter([]))
+
+    def test_incorrect_values(self):
+        with self.assertRaises(ParameterError):
+            self.client.create_requests_chunked(emails='foo@example.com')
+        with self.assertRaises(ParameterError):
+            self.client.create_requests_chunked(emails=['a'], chunk_size=0)
+        with self.assertRaises(ParameterError):
+            self.client.create_requests_chunked(emails=[1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from bulkemailverifier import Client, MetricsRecorder, RetryPolicy
+
+from tests.stub import StubApiServer
+
+_THREADS = 64
+_ITERATIONS = 5
+
+
+def _routes() -> dict:
+    """
+    Routes echoing the request, so that a response delivered to the
+    wrong thread is detected
+    """
+    def create(payload, headers):
+        return 200, {'response': {
+            'id': int(payload['emails'][0].split('@')[0][1:])}}, None
+
+    def status(payload, headers):
+        return 200, {'response': [
+            {'id': i, 'total_emails': i, 'processed_emails': i, 'ready': 1}
+            for i in payload['ids']
+        ]}, None
+
+    def records(payload, headers):
+        if payload['format'] == 'csv':
+            return 200, '"Email Address"\n"u{}@example.com"\n'.format(
+                payload['id']), None
+        return 200, {'response': [
+            {'emailAddress': 'u{}@example.com'.format(payload['id']),
+             'result': 'ok'}
+        ]}, None
+
+    def requests(payload, headers):
+        return 200, {'response': {
+            'current_page': payload['page'],
+            'data': [{'id': payload['page']}],
+            'last_page': 1000,
+            'per_page': payload.get('perPage', 10),
+            'total': 1000,
+        }}, None
+
+    return {
+        '/request': create,
+        '/request/status': status,
+        '/request/completed': records,
+        '/request/list': requests,
+    }
+
+
+class TestSharedClient(unittest.TestCase):
+    """
+    One client shared by many threads against local stub servers.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.servers = [StubApiServer(_routes()), StubApiServer(_routes())]
+        for server in self.servers:
+            server.start()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        for server in self.servers:
+            server.stop()
+        shutil.rmtree(self.directory)
+
+    def _run_threads(self, target, count: int = _THREADS) -> list:
+        errors = []
+        barrier = threading.Barrier(count)
+
+        def run(number):
+            barrier.wait()
+            try:
+                target(number)
+            except BaseException as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=run, args=(i,))
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def _work(self, client: Client, number: int):
+        for i in range(_ITERATIONS):
+            key = number * 1000 + i + 1
+
+            request_id = client.create_request(
+                emails=['u{}@example.com'.format(key)])
+            self.assertEqual(request_id, key)
+
+            status = client.get_status(request_ids=[key, key + 500000])
+            self.assertEqual([s.id for s in status.data],
+                             [key, key + 500000])
+
+            records = client.get_records(request_id=key).data
+            self.assertEqual(records[0].email_address,
+                             'u{}@example.com'.format(key))
+
+            streamed = list(client.iter_records(request_id=key))
+            self.assertEqual(streamed[0].email_address,
+                             'u{}@example.com'.format(key))
+
+            page = key % 1000 + 1
+            self.assertEqual(client.get_requests(page=page).current_page,
+                             page)
+
+            filename = os.path.join(self.directory, '{}.csv'.format(key))
+            client.download(filename=filename, request_id=key)
+            with open(filename) as file:
+                self.assertIn('u{}@example.com'.format(key), file.read())
+
+    def test_shared_client(self):
+        metrics = MetricsRecorder()
+        client = Client(self.api_key, base_url=self.servers[0].base_url,
+                        pool_maxsize=16, pool_block=True,
+                        observers=[metrics])
+
+        with client:
+            errors = self._run_threads(lambda n: self._work(client, n))
+
+        self.assertEqual(errors, [])
+        calls = _THREADS * _ITERATIONS * 6
+        self.assertEqual(len(self.servers[0].calls), calls)
+        self.assertLessEqual(self.servers[0].connections, 16)
+        self.assertEqual(
+            sum(metrics.snapshot()['attempts'].values()), calls)
+
+    def test_reconfigure(self):
+        client = Client(self.api_key, base_url=self.servers[0].base_url,
+                        pool_maxsize=_THREADS)
+        urls = [server.base_url for server in self.servers]
+        policies = [None, RetryPolicy()]
+        done = threading.Event()
+
+        def reconfigure():
+            i = 0
+            while not done.is_set():
+                i += 1
+                client.base_url = urls[i % 2]
+                client.timeout = 10 + i % 20
+                client.api_requester.retry_policy = policies[i % 2]
+                client.api_requester.observers = \
+                    [MetricsRecorder()] if i % 3 else None
+                client.api_key = self.api_key
+
+        def work(number):
+            if number == 0:
+                reconfigure()
+                return
+            try:
+                self._work(client, number)
+            finally:
+                if number == 1:
+                    done.set()
+
+        with client:
+            errors = self._run_threads(work, 16)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sum(len(s.calls) for s in self.servers),
+                         15 * _ITERATIONS * 6)
+
+    def test_options_not_modified(self):
+        client = Client(self.api_key, base_url=self.servers[0].base_url)
+        options = {'request_id': 7, 'response_format': 'xml'}
+        emails = ['u7@example.com']
+
+        def work(number):
+            for _ in range(_ITERATIONS):
+                client.get_records(**options)
+                client.create_request(emails=emails, preprocess=True)
+
+        with client:
+            errors = self._run_threads(work, 8)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(options, {'request_id': 7, 'response_format': 'xml'})
+        self.assertEqual(emails, ['u7@example.com'])
+        formats = set(p['format'] for _, p in self.servers[0].calls)
+        self.assertEqual(formats, {'json'})
+
+
+if __name__ == '__main__':
+    unittest.main()
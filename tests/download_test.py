@@ -0,0 +1,93 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from bulkemailverifier import Client, FileError, HttpApiError
+
+from tests.stub import StubApiServer
+
+
+_csv_header = '"Email Address","Result"\n'
+_csv_rows = ''.join(
+    '"user{}@example.com","ok"\n'.format(i) for i in range(20000))
+
+
+class TestDownload(unittest.TestCase):
+    """
+    Streaming download tests against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.server = StubApiServer({
+            '/request/completed':
+                lambda p, h: (200, _csv_header + _csv_rows, None),
+            '/request/failed':
+                lambda p, h: (500, 'Internal error', None),
+        })
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'result.csv')
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def test_download(self):
+        written = self.client.download(
+            filename=self.filename, request_id=1, chunk_size=1024)
+
+        with open(self.filename) as f:
+            content = f.read()
+
+        self.assertEqual(content, _csv_header + _csv_rows)
+        self.assertEqual(written, os.path.getsize(self.filename))
+        self.assertEqual(os.listdir(self.directory), ['result.csv'])
+
+    @unittest.skipIf(os.name == 'nt', 'POSIX permissions')
+    def test_file_mode(self):
+        reference = os.path.join(self.directory, 'reference')
+        open(reference, 'w').close()
+
+        self.client.download(filename=self.filename, request_id=1)
+
+        self.assertEqual(os.stat(self.filename).st_mode,
+                         os.stat(reference).st_mode)
+
+    def test_download_compressed(self):
+        written = self.client.download(
+            filename=self.filename, request_id=1, compress=True)
+
+        with gzip.open(self.filename, 'rt') as f:
+            content = f.read()
+
+        self.assertEqual(content, _csv_header + _csv_rows)
+        self.assertEqual(written, os.path.getsize(self.filename))
+        self.assertLess(written, len(content))
+
+    def test_failed_download_keeps_file(self):
+        with open(self.filename, 'w') as f:
+            f.write('previous')
+
+        with self.assertRaises(HttpApiError):
+            self.client.download(
+                filename=self.filename, request_id=1, return_failed=True)
+
+        with open(self.filename) as f:
+            self.assertEqual(f.read(), 'previous')
+        self.assertEqual(os.listdir(self.directory), ['result.csv'])
+
+    def test_incorrect_filename(self):
+        with self.assertRaises(FileError):
+            self.client.download(
+                filename=os.path.join(self.directory, 'missing', 'x.csv'),
+                request_id=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
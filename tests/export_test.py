@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from bulkemailverifier import FileError, Record, RecordFileReader, \
+    ResponseRecords, iter_record_batches, record_schema, write_parquet
+from bulkemailverifier.export import pyarrow
+
+
+def _record(i: int) -> Record:
+    return Record({
+        'emailAddress': 'user{}@example.com'.format(i),
+        'formatCheck': 'true',
+        'smtpCheck': ['true', 'false', 'null'][i % 3],
+        'mxRecords': ['mx1.example.com', 'mx2.example.com'][:i % 3],
+        'result': ['ok', 'smtp-failed', 'unknown'][i % 3],
+    })
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestExport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.records = [_record(i) for i in range(2500)]
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'result.parquet')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_schema(self):
+        schema = record_schema()
+
+        self.assertEqual(schema.names, list(Record.__slots__))
+        self.assertEqual(schema.field('smtp_check').type, pyarrow.bool_())
+        self.assertTrue(schema.field('smtp_check').nullable)
+        self.assertEqual(schema.field('mx_records').type,
+                         pyarrow.list_(pyarrow.string()))
+        self.assertTrue(pyarrow.types.is_dictionary(
+            schema.field('result').type))
+
+    def test_record_batches(self):
+        batches = list(iter_record_batches(iter(self.records), 1000))
+
+        self.assertEqual([b.num_rows for b in batches], [1000, 1000, 500])
+        self.assertTrue(all(b.schema.equals(record_schema())
+                            for b in batches))
+
+        rows = batches[0].slice(0, 3).to_pylist()
+        self.assertEqual(rows[0]['mx_records'], [])
+        self.assertEqual(rows[1]['smtp_check'], False)
+        self.assertIsNone(rows[2]['smtp_check'])
+        self.assertEqual(rows[2]['mx_records'],
+                         ['mx1.example.com', 'mx2.example.com'])
+        self.assertEqual(rows[2]['result'], 'unknown')
+
+        response = ResponseRecords({'response': [
+            {'emailAddress': 'foo@example.com', 'result': 'ok'}]})
+        batch, = iter_record_batches(response)
+        self.assertEqual(batch.column('email_address').to_pylist(),
+                         ['foo@example.com'])
+
+        self.assertEqual(list(iter_record_batches([])), [])
+        with self.assertRaises(ValueError):
+            list(iter_record_batches(self.records, 0))
+
+    def test_write_parquet(self):
+        import pyarrow.parquet
+
+        written = write_parquet(
+            iter(self.records), self.filename, row_group_size=1000)
+
+        parquet = pyarrow.parquet.ParquetFile(self.filename)
+        self.assertEqual(written, 2500)
+        self.assertEqual(parquet.metadata.num_rows, 2500)
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+
+        table = parquet.read()
+        self.assertEqual(table.column('email_address')[7].as_py(),
+                         'user7@example.com')
+        self.assertEqual(table.column('result').to_pylist(),
+                         [r.result for r in self.records])
+        self.assertEqual(os.listdir(self.directory), ['result.parquet'])
+
+    @unittest.skipIf(os.name == 'nt', 'POSIX permissions')
+    def test_file_mode(self):
+        reference = os.path.join(self.directory, 'reference')
+        open(reference, 'w').close()
+
+        write_parquet(self.records[:10], self.filename)
+
+        self.assertEqual(os.stat(self.filename).st_mode,
+                         os.stat(reference).st_mode)
+
+    def test_csv_to_parquet(self):
+        csv_filename = os.path.join(self.directory, 'result.csv')
+        with open(csv_filename, 'w') as f:
+            f.write('"Email Address","SMTP Check","MX Records","Result"\n')
+            f.write('"a@example.com","true","mx.example.com","ok"\n')
+            f.write('"b@example.com","","","unknown"\n')
+
+        with RecordFileReader(csv_filename) as reader:
+            self.assertEqual(write_parquet(reader, self.filename), 2)
+
+        import pyarrow.parquet
+        rows = pyarrow.parquet.read_table(self.filename).to_pylist()
+        self.assertEqual(rows[0]['mx_records'], ['mx.example.com'])
+        self.assertIs(rows[1]['smtp_check'], False)
+
+    def test_incorrect_filename(self):
+        with self.assertRaises(FileError):
+            write_parquet(self.records,
+                          os.path.join(self.directory, 'missing', 'x'))
+
+
+if __name__ == '__main__':
+    unittest.main()
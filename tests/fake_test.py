@@ -0,0 +1,210 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from bulkemailverifier import ApiConnectionError, ApiRequester, \
+    AsyncClient, Client, FakeApi, FakeTransport, HttpApiError, \
+    RecordFileReader, RequestsTransport, RetryPolicy, Transport
+from bulkemailverifier.net.async_http import aiohttp
+from bulkemailverifier.net.fake import AsyncFakeTransport
+
+
+def _emails(count: int) -> list:
+    return ['user{}@example.com'.format(i) for i in range(count)]
+
+
+class TestTransport(unittest.TestCase):
+
+    def test_default_transport(self):
+        requester = ApiRequester(base_url='http://localhost:1')
+        self.assertIsInstance(requester.transport, RequestsTransport)
+
+        transport = FakeTransport(FakeApi())
+        requester = ApiRequester(base_url='http://localhost:1',
+                                 transport=transport)
+        self.assertIs(requester.transport, transport)
+
+        with self.assertRaises(ValueError):
+            ApiRequester(transport=object())
+        with self.assertRaises(NotImplementedError):
+            Transport().post('http://localhost:1', b'{}', {}, (1, 1), False)
+
+
+class TestFakeApi(unittest.TestCase):
+    """
+    Client calls answered by the in-process fake API.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def _client(self, api: FakeApi, **kwargs) -> Client:
+        return Client(self.api_key, transport=FakeTransport(api), **kwargs)
+
+    def test_processing(self):
+        api = FakeApi(emails_per_second=2000)
+        client = self._client(api)
+
+        request_id = client.create_request(emails=_emails(100))
+        status = client.get_status(request_ids=[request_id]).data[0]
+        self.assertEqual(status.total_emails, 100)
+        self.assertFalse(status.ready)
+
+        time.sleep(0.06)
+        status = client.get_status(request_ids=[request_id]).data[0]
+        self.assertTrue(status.ready)
+        self.assertEqual(status.processed_emails, 100)
+
+        records = client.get_records(request_id=request_id).data
+        self.assertEqual([r.email_address for r in records], _emails(100))
+        self.assertEqual(api.calls['/request/status'], 2)
+
+    def test_deterministic_results(self):
+        first = FakeApi(invalid_rate=0.2)
+        second = FakeApi(invalid_rate=0.2)
+
+        results = []
+        for api in (first, second):
+            client = self._client(api)
+            request_id = client.create_request(emails=_emails(500))
+            results.append((
+                [r.result for r in client.iter_records(
+                    request_id=request_id)],
+                [r.email_address for r in client.iter_records(
+                    request_id=request_id, return_failed=True)]))
+
+        self.assertEqual(results[0], results[1])
+        completed, failed = results[0]
+        self.assertEqual(len(completed) + len(failed), 500)
+        self.assertTrue(50 < len(failed) < 150)
+        self.assertIn('ok', completed)
+        self.assertIn('smtp-failed', completed)
+
+    def test_errors(self):
+        api = FakeApi(error_rate=0.3, connection_error_rate=0.2, seed=1)
+
+        with self._client(api) as client:
+            failures = 0
+            for _ in range(50):
+                try:
+                    client.get_requests()
+                except (ApiConnectionError, HttpApiError):
+                    failures += 1
+        self.assertTrue(10 < failures < 40)
+
+        policy = RetryPolicy(max_attempts=20, backoff_factor=0.001,
+                             max_backoff=0.001)
+        with self._client(api, retry_policy=policy) as client:
+            for _ in range(50):
+                client.get_requests()
+
+    def test_latency(self):
+        client = self._client(FakeApi(latency=(0.01, 0.02)))
+
+        started = time.monotonic()
+        for _ in range(5):
+            client.get_requests()
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+    def test_list_and_download(self):
+        client = self._client(FakeApi())
+        for _ in range(25):
+            client.create_request(emails=_emails(3))
+
+        ids = list(client.iter_requests(per_page=10, only_ids=True))
+        self.assertEqual(ids, list(range(25, 0, -1)))
+        self.assertEqual(client.get_requests(page=3).data[0].id, 5)
+
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'result.csv')
+            client.download(filename=filename, request_id=1)
+            with RecordFileReader(filename) as reader:
+                self.assertEqual(len(reader), 3)
+                self.assertEqual(reader.find('user2@example.com').result,
+                                 client.get_records(
+                                     request_id=1).data[2].result)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_verify(self):
+        api = FakeApi(latency=0.001, emails_per_second=20000,
+                      error_rate=0.05)
+        policy = RetryPolicy(
+            max_attempts=10, backoff_factor=0.001, max_backoff=0.001,
+            idempotent_paths=FakeApi.PATHS)
+        client = self._client(api, retry_policy=policy)
+
+        records = client.verify(
+            emails=_emails(5000), chunk_size=500, min_interval=0.01,
+            max_interval=0.05).run()
+
+        self.assertEqual(sorted(r.email_address for r in records),
+                         sorted(_emails(5000)))
+        self.assertGreaterEqual(api.calls['/request'], 10)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            FakeApi(latency=-1)
+        with self.assertRaises(ValueError):
+            FakeApi(latency=(0.2, 0.1))
+        with self.assertRaises(ValueError):
+            FakeApi(emails_per_second=0)
+        with self.assertRaises(ValueError):
+            FakeApi(error_rate=1.5)
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncFakeApi(unittest.TestCase):
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def test_async_client(self):
+        api = FakeApi(latency=0.01)
+
+        async def run():
+            async with AsyncClient(
+                    self.api_key, transport=AsyncFakeTransport(api)) as c:
+                request_ids = await asyncio.gather(
+                    *[c.create_request(emails=_emails(10))
+                      for _ in range(20)])
+                statuses = await c.get_status_bulk(request_ids=request_ids)
+                records = [r async for r in c.iter_records(request_id=1)]
+                return statuses, records
+
+        loop = asyncio.new_event_loop()
+        try:
+            statuses, records = loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+        self.assertEqual(sorted(statuses), list(range(1, 21)))
+        self.assertEqual(len(records), 10)
+
+    def test_async_chunked(self):
+        api = FakeApi(latency=0.01)
+
+        async def run():
+            async with AsyncClient(
+                    self.api_key, transport=AsyncFakeTransport(api)) as c:
+                request_ids = await c.create_requests_chunked(
+                    emails=iter(_emails(95)), chunk_size=10, max_workers=3)
+                records = [r async for r in c.iter_records(request_id=10)]
+                return request_ids, records
+
+        loop = asyncio.new_event_loop()
+        try:
+            request_ids, records = loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+        self.assertEqual(sorted(request_ids), list(range(10)))
+        self.assertEqual(sorted(request_ids.values()), list(range(1, 11)))
+        self.assertEqual(api.calls['/request'], 10)
+        self.assertEqual(len(records), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
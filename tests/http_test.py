@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+from bulkemailverifier import ApiRequester, Client
+
+from tests.stub import StubApiServer
+
+
+class TestApiRequester(unittest.TestCase):
+    """
+    Connection pooling tests against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.server = StubApiServer()
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_connection_reused(self):
+        with Client(self.api_key, base_url=self.server.base_url) as client:
+            for _ in range(5):
+                client.get_status(request_ids=[1])
+
+        self.assertEqual(len(self.server.calls), 5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_close_reopens_pool(self):
+        requester = ApiRequester(base_url=self.server.base_url)
+
+        requester.post('/request', {})
+        requester.close()
+        requester.post('/request', {})
+        requester.close()
+
+        self.assertEqual(self.server.connections, 2)
+
+    def test_pool_limits(self):
+        requester = ApiRequester(
+            base_url=self.server.base_url,
+            pool_maxsize=2,
+            pool_block=True
+        )
+
+        with requester, ThreadPoolExecutor(8) as executor:
+            list(executor.map(
+                lambda _: requester.post('/request', {}), range(32)))
+
+        self.assertEqual(len(self.server.calls), 32)
+        self.assertLessEqual(self.server.connections, 2)
+
+    def test_invalid_pool_size(self):
+        with self.assertRaises(ValueError):
+            ApiRequester(pool_maxsize=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+
+from bulkemailverifier import AsyncClient, BulkRequest, Client, \
+    ParameterError
+from bulkemailverifier.net.async_http import aiohttp
+
+from tests.stub import ConcurrencyRoute, StubApiServer
+
+
+class _RequestList:
+    """
+    Paginated /request/list route over `count` requests
+    """
+
+    def __init__(self, count: int):
+        self.ids = list(range(count, 0, -1))
+
+    def __call__(self, payload, headers):
+        page = payload.get('page', 1)
+        per_page = payload.get('perPage', 10)
+        ids = self.ids if payload.get('sort') != 'asc' else self.ids[::-1]
+        data = ids[(page - 1) * per_page:page * per_page]
+        if not payload.get('onlyIds'):
+            data = [{'id': i, 'total_emails': i, 'ready': 1} for i in data]
+
+        return 200, {'response': {
+            'current_page': page,
+            'data': data,
+            'last_page': max((len(ids) - 1) // per_page + 1, 1),
+            'per_page': per_page,
+            'total': len(ids),
+        }}, None
+
+
+class TestIterRequests(unittest.TestCase):
+    """
+    Paginated request listing against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.route = _RequestList(123)
+        self.concurrency = ConcurrencyRoute(self.route, 0.02)
+        self.server = StubApiServer({'/request/list': self.concurrency})
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_all_pages(self):
+        requests = list(self.client.iter_requests(max_workers=3))
+
+        self.assertIsInstance(requests[0], BulkRequest)
+        self.assertEqual([r.id for r in requests], list(range(123, 0, -1)))
+        self.assertEqual(len(self.server.calls), 3)
+        self.assertLessEqual(self.concurrency.max_active, 3)
+
+        pages = sorted(p['page'] for _, p in self.server.calls)
+        self.assertEqual(pages, [1, 2, 3])
+
+    def test_prefetch_window(self):
+        ids = list(self.client.iter_requests(
+            per_page=10, sort=Client.SORT_ASC, only_ids=True, max_workers=4))
+
+        self.assertEqual(ids, list(range(1, 124)))
+        self.assertEqual(len(self.server.calls), 13)
+        self.assertGreater(self.concurrency.max_active, 1)
+        self.assertLessEqual(self.concurrency.max_active, 4)
+        self.assertTrue(all(p['onlyIds'] for _, p in self.server.calls))
+
+    def test_filter(self):
+        ids = list(self.client.iter_requests(
+            only_ids=True, filter=lambda i: i % 50 == 0))
+        self.assertEqual(ids, [100, 50])
+
+        requests = list(self.client.iter_requests(
+            filter=lambda r: r.total_emails > 120))
+        self.assertEqual([r.id for r in requests], [123, 122, 121])
+
+    def test_shifted_pages(self):
+        requests = self.client.iter_requests(per_page=10, max_workers=1)
+        first = [next(requests) for _ in range(10)]
+
+        # New requests push the listed ones to the next pages
+        self.route.ids[:0] = [125, 124]
+        rest = list(requests)
+
+        ids = [r.id for r in first + rest]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(sorted(ids), list(range(1, 124)))
+
+    def test_single_page(self):
+        self.route.ids = []
+        self.assertEqual(list(self.client.iter_requests()), [])
+        self.assertEqual(len(self.server.calls), 1)
+
+    def test_validation(self):
+        with self.assertRaises(ParameterError):
+            self.client.iter_requests(per_page=100)
+        with self.assertRaises(ParameterError):
+            self.client.iter_requests(sort='random')
+        with self.assertRaises(ParameterError):
+            self.client.iter_requests(only_ids=1)
+        with self.assertRaises(ParameterError):
+            self.client.iter_requests(filter=True)
+        with self.assertRaises(ParameterError):
+            self.client.iter_requests(max_workers=0)
+        self.assertEqual(self.server.calls, [])
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncIterRequests(unittest.TestCase):
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.route = _RequestList(75)
+        self.server = StubApiServer({'/request/list': self.route})
+        self.server.start()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        self.server.stop()
+
+    def test_all_pages(self):
+        async def collect():
+            async with AsyncClient(
+                    self.api_key, base_url=self.server.base_url) as client:
+                return [r.id async for r in client.iter_requests(
+                    per_page=10, max_workers=3)]
+
+        ids = self.loop.run_until_complete(collect())
+
+        self.assertEqual(ids, list(range(75, 0, -1)))
+        self.assertEqual(len(self.server.calls), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import itertools
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from bulkemailverifier import Client, FileError, JobJournal, ParameterError
+
+from tests.stub import StubApiServer
+
+
+class TestJobJournal(unittest.TestCase):
+    """
+    Resuming interrupted verification runs against a local stub server
+    where every request is ready on the first status check.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.ids = itertools.count(1)
+        self.emails = {}
+        self.lock = threading.Lock()
+        self.server = StubApiServer({
+            '/request': self._create,
+            '/request/completed': self._completed,
+        })
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'job.jsonl')
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def _create(self, payload, headers):
+        with self.lock:
+            request_id = next(self.ids)
+            self.emails[request_id] = payload['emails']
+        return 200, {'response': {'id': request_id}}, None
+
+    def _completed(self, payload, headers):
+        with self.lock:
+            emails = self.emails[payload['id']]
+        return 200, {'response': [
+            {'emailAddress': e, 'result': 'ok'} for e in emails
+        ]}, None
+
+    def _verify(self, emails, journal, **kwargs):
+        return self.client.verify(
+            emails=emails, journal=journal, chunk_size=3, max_pending=2,
+            min_interval=0.01, **kwargs)
+
+    def test_resume(self):
+        emails = ['user{}@example.com'.format(i) for i in range(10)]
+
+        seen = []
+        with JobJournal(self.path, checkpoint=1) as journal:
+            for record in self._verify(emails, journal):
+                seen.append(record.email_address)
+                if len(seen) == 4:
+                    break
+            created = len(self.emails)
+
+        with JobJournal(self.path, checkpoint=1) as journal:
+            pipeline = self._verify(emails, journal)
+            seen.extend(r.email_address for r in pipeline)
+
+            self.assertEqual(pipeline.request_ids, journal.request_ids)
+
+        # The record being consumed when the run stopped is yielded again
+        self.assertEqual(sorted(set(seen)), sorted(emails))
+        self.assertEqual(len(seen), len(emails) + 1)
+        # Requests created before the restart are not created again
+        self.assertEqual(len(self.emails), 4)
+        self.assertEqual(
+            sum(len(v) for v in self.emails.values()), len(emails))
+        self.assertGreater(created, 1)
+
+        with JobJournal(self.path) as journal:
+            self.assertEqual(list(self._verify(emails, journal)), [])
+        self.assertEqual(len(self.emails), 4)
+
+    def test_submitted_while_paused(self):
+        emails = ['user{}@example.com'.format(i) for i in range(6)]
+        create = self.server.routes['/request']
+
+        def slow_create(payload, headers):
+            if payload['emails'][0] == emails[3]:
+                time.sleep(0.2)
+            return create(payload, headers)
+
+        self.server.routes['/request'] = slow_create
+
+        with JobJournal(self.path) as journal:
+            pipeline = iter(self.client.verify(
+                emails=emails, journal=journal, chunk_size=3,
+                min_interval=0.01))
+            next(pipeline)
+            # The consumer is busy while the second request is created
+            time.sleep(0.5)
+
+            with JobJournal(self.path) as resumed:
+                self.assertEqual(sorted(resumed.request_ids.values()),
+                                 sorted(self.emails))
+            pipeline.close()
+
+    def test_checkpoint(self):
+        emails = ['user{}@example.com'.format(i) for i in range(3)]
+
+        seen = []
+        with JobJournal(self.path, checkpoint=2) as journal:
+            for record in self._verify(emails, journal):
+                seen.append(record.email_address)
+                if len(seen) == 2:
+                    break
+
+        with JobJournal(self.path, checkpoint=2) as journal:
+            seen.extend(r.email_address for r in self._verify(emails, journal))
+
+        # Nothing was checkpointed before the run stopped
+        self.assertEqual(seen, emails[:2] + emails)
+
+    def test_truncated_entry(self):
+        with JobJournal(self.path) as journal:
+            journal.submitted(0, JobJournal.digest(['a@x.com']), 7)
+
+        with open(self.path, 'ab') as f:
+            f.write(b'{"event":"rea')
+
+        with JobJournal(self.path) as journal:
+            self.assertEqual(journal.request_ids, {0: 7})
+            self.assertFalse(journal.chunk(0).ready)
+            journal.ready(0)
+
+        with JobJournal(self.path) as journal:
+            self.assertTrue(journal.chunk(0).ready)
+
+    def test_corrupted(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'{"event":"ready","chunk":0}\n')
+
+        with self.assertRaises(FileError):
+            JobJournal(self.path)
+
+    def test_input_changed(self):
+        with JobJournal(self.path) as journal:
+            list(self._verify(['a@x.com'], journal))
+
+        with JobJournal(self.path) as journal:
+            with self.assertRaises(ParameterError):
+                list(self._verify(['b@x.com'], journal))
+
+
+if __name__ == '__main__':
+    unittest.main()
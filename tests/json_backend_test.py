@@ -0,0 +1,70 @@
+import unittest
+
+from json import JSONDecodeError
+
+from bulkemailverifier import ApiRequester, Client, \
+    UnparsableApiResponseError, json_backend
+
+from tests.stub import StubApiServer
+
+
+class TestJsonBackend(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.default = json_backend.get_backend()
+
+    def tearDown(self) -> None:
+        json_backend.set_backend(self.default)
+
+    def test_default(self):
+        available = json_backend.available_backends()
+
+        self.assertEqual(available[-1], json_backend.STDLIB)
+        self.assertEqual(self.default, available[0])
+
+    def test_backends(self):
+        document = '{"response": [{"emailAddress": "ü@example.com"}]}'
+
+        for name in json_backend.available_backends():
+            json_backend.set_backend(name)
+
+            self.assertEqual(json_backend.get_backend(), name)
+            for data in [document, document.encode('UTF-8')]:
+                self.assertEqual(
+                    json_backend.loads(data)['response'][0]['emailAddress'],
+                    'ü@example.com')
+            with self.assertRaises(JSONDecodeError):
+                json_backend.loads(b'{"response": [')
+            with self.assertRaises(UnparsableApiResponseError):
+                Client._parse_response(b'<xml/>')
+
+    def test_custom(self):
+        calls = []
+
+        def custom(data):
+            calls.append(data)
+            raise ValueError('Not supported')
+
+        json_backend.set_backend(custom)
+
+        self.assertEqual(json_backend.get_backend(), 'custom')
+        with self.assertRaises(JSONDecodeError):
+            json_backend.loads(b'{}')
+        self.assertEqual(calls, [b'{}'])
+
+    def test_unavailable(self):
+        with self.assertRaises(ValueError):
+            json_backend.set_backend('simplejson')
+
+    def test_post_bytes(self):
+        with StubApiServer() as server, \
+                ApiRequester(base_url=server.base_url) as requester:
+            content = requester.post_bytes('/request', {})
+
+        self.assertIsInstance(content, bytes)
+        self.assertEqual(json_backend.loads(content),
+                         {'response': {'id': 1}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,10 @@ from json import loads
 
 import unittest
 
-from bulkemailverifier import BulkRequest, ErrorMessage, Record, \
+from bulkemailverifier import BulkRequest, ErrorMessage, LazyRecord, Record, \
     ResponseRecords, ResponseRequests, ResponseStatus
+from bulkemailverifier.models.response import _bool_value, _string_value, \
+    _tuple_value
 
 
 _json_response_error = '''{
@@ -126,6 +128,20 @@ class TestModel(unittest.TestCase):
         self.assertIsInstance(parsed.data, list)
         self.assertIsInstance(parsed.data[0], Record)
 
+    def test_record_model(self):
+        response = loads(_json_response_records)
+        record = ResponseRecords(response).data[0]
+
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(record.mx_records, ('.',))
+        self.assertEqual(record['email_address'], 'foo@example.com')
+        self.assertEqual(record, Record(response['response'][0]))
+        self.assertNotEqual(record, Record(None))
+        self.assertNotEqual(record, object())
+
+        with self.assertRaises(KeyError):
+            record['emailAddress']
+
     def test_response_records_failed_parsing(self):
         response = loads(_json_response_records_failed)
         parsed = ResponseRecords(response)
@@ -188,3 +204,70 @@ class TestModel(unittest.TestCase):
                          response['response'][0]['invalid_emails'])
 
         self.assertIsInstance(parsed.data[0].date_start, datetime.datetime)
+
+    def test_field_conversions(self):
+        checks = ['formatCheck', 'smtpCheck', 'dnsCheck', 'freeCheck',
+                  'disposableCheck', 'catchAllCheck']
+        samples = ['true', 'TRUE', 'True', '1', 'false', '0', 'no', '',
+                   'null', 'NULL', None, True, False, 0, 1, 2, 0.0, [], [1],
+                   {}]
+
+        for value in samples:
+            for values in [{}, {c: value for c in checks},
+                           {'formatCheck': value, 'smtpCheck': 'null'}]:
+                values.update({'emailAddress': value, 'mxRecords': value,
+                               'result': value})
+                record = Record(values)
+
+                for name, key in zip(Record.__slots__[1:7], checks):
+                    self.assertIs(getattr(record, name),
+                                  _bool_value(values, key), (key, value))
+                self.assertEqual(record.email_address,
+                                 _string_value(values, 'emailAddress'))
+                self.assertEqual(record.mx_records,
+                                 _tuple_value(values, 'mxRecords'))
+                self.assertEqual(record.result,
+                                 _string_value(values, 'result'))
+                self.assertEqual(record.error, '')
+
+            if type(value) in (list, dict):
+                continue
+            values = {'ready': value, 'id': '5',
+                      'total_emails': 3, 'failed_emails': None}
+            bulk_request = BulkRequest(values)
+            self.assertIs(bulk_request.ready, _bool_value(values, 'ready'))
+            self.assertEqual(bulk_request.id, 5)
+            self.assertEqual(bulk_request.total_emails, 3)
+            self.assertEqual(bulk_request.failed_emails, 0)
+            self.assertIsNone(bulk_request.date_start)
+
+    def test_lazy_record(self):
+        response = loads(_json_response_records)
+        values = response['response'][0]
+
+        parsed = ResponseRecords(response, lazy=True)
+        record = parsed.data[0]
+
+        self.assertIsInstance(record, LazyRecord)
+        self.assertIsInstance(record, Record)
+        self.assertFalse(hasattr(record, '__dict__'))
+
+        # Fields are read from the parsed dict on access
+        values['result'] = 'changed'
+        self.assertEqual(record.result, 'changed')
+        values['result'] = 'ok'
+
+        self.assertEqual(record.mx_records, ('.',))
+        # The tuple is built once
+        self.assertIs(record.mx_records, record.mx_records)
+        self.assertIs(record.smtp_check, False)
+        self.assertEqual(record, Record(values))
+        self.assertEqual(record['email_address'], 'foo@example.com')
+        self.assertEqual(LazyRecord(None), Record(None))
+
+        with self.assertRaises(AttributeError):
+            record.unknown
+
+        record.result = 'set'
+        self.assertEqual(record.result, 'set')
+        self.assertEqual(values['result'], 'ok')
@@ -0,0 +1,237 @@
+from json import loads
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from bulkemailverifier import ApiRequester, AsyncClient, Client, FakeApi, \
+    FakeTransport, Histogram, MetricsRecorder, Observer, RetryPolicy, \
+    TokenBucketRateLimiter
+from bulkemailverifier.net.async_http import aiohttp
+from bulkemailverifier.net.fake import AsyncFakeTransport
+
+from tests.stub import StubApiServer
+
+
+class _EventLog(Observer):
+    def __init__(self):
+        self.events = []
+
+    def on_span(self, path, phase, seconds):
+        self.events.append(('span', path, phase))
+
+    def on_attempt(self, path, attempt, status_code, request_bytes,
+                   response_bytes):
+        self.events.append(('attempt', path, attempt, status_code,
+                            request_bytes, response_bytes))
+
+    def on_transfer(self, path, response_bytes):
+        self.events.append(('transfer', path, response_bytes))
+
+    def on_retry(self, path, attempt, delay, reason):
+        self.events.append(('retry', path, attempt, reason))
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_observe(self):
+        histogram = Histogram((1, 2, 4))
+        for value in (0.5, 1, 1.5, 3, 3, 10):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [2, 1, 2])
+        self.assertEqual(histogram.cumulative(), [2, 3, 5])
+        self.assertEqual(histogram.count, 6)
+        self.assertEqual(histogram.sum, 19.0)
+
+        self.assertEqual(histogram.quantile(0.25), 0.75)
+        self.assertEqual(histogram.quantile(0.75), 3.5)
+        self.assertEqual(histogram.quantile(1), 4)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+
+class TestObservers(unittest.TestCase):
+    """
+    Instrumentation of requester and client calls.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def test_phases(self):
+        log = _EventLog()
+        metrics = MetricsRecorder()
+        with StubApiServer() as server:
+            with Client(self.api_key, base_url=server.base_url,
+                        observers=[log, metrics]) as client:
+                client.get_status(request_ids=[1, 2])
+
+        path = '/request/status'
+        self.assertEqual([e[2] for e in log.events if e[0] == 'span'],
+                         ['wait', 'transfer', 'decode', 'build'])
+        attempt = [e for e in log.events if e[0] == 'attempt'][0]
+        self.assertEqual(attempt[:4], ('attempt', path, 1, 200))
+        self.assertEqual(attempt[4], len('{"apiKey": "' + self.api_key +
+                                         '", "format": "json", '
+                                         '"ids": [1, 2]}'))
+        self.assertGreater(attempt[5], 100)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['attempts'], {(path, '200'): 1})
+        self.assertEqual(snapshot['response_bytes'][path], attempt[5])
+        self.assertEqual(metrics.histogram(path, Observer.DECODE).count, 1)
+        self.assertIsNone(metrics.histogram(path, Observer.RETRY_WAIT))
+
+    def test_request_bytes(self):
+        sent = []
+
+        class Recording(FakeTransport):
+            def post(self, url, body, headers, timeout, stream):
+                sent.append((body, headers['Content-Type']))
+                return super().post(url, body, headers, timeout, stream)
+
+        log = _EventLog()
+        client = Client(self.api_key, transport=Recording(FakeApi()),
+                        observers=[log])
+        client.create_request(emails=['jos\u00e9@example.com'])
+
+        body, content_type = sent[0]
+        attempt = [e for e in log.events if e[0] == 'attempt'][0]
+        self.assertEqual(attempt[4], len(body))
+        self.assertEqual(loads(body), {
+            'apiKey': self.api_key, 'format': 'json',
+            'emails': ['jos\u00e9@example.com']})
+        self.assertEqual(content_type, 'application/json')
+
+    def test_retries(self):
+        api = FakeApi(error_rate=0.5, connection_error_rate=0.2, seed=3)
+        metrics = MetricsRecorder()
+        policy = RetryPolicy(max_attempts=50, backoff_factor=0.001,
+                             max_backoff=0.001)
+        limiter = TokenBucketRateLimiter(1000, burst=1000)
+
+        with Client(self.api_key, transport=FakeTransport(api),
+                    retry_policy=policy, rate_limiter=limiter,
+                    observers=[metrics]) as client:
+            for _ in range(20):
+                client.get_requests()
+
+        path = '/request/list'
+        snapshot = metrics.snapshot()
+        attempts = snapshot['attempts']
+        retries = snapshot['retries']
+        self.assertEqual(attempts[(path, '200')], 20)
+        self.assertEqual(attempts[(path, '500')], retries[(path, '500')])
+        self.assertEqual(attempts[(path, 'error')],
+                         retries[(path, RetryPolicy.TRANSPORT_ERROR)])
+        self.assertEqual(
+            metrics.histogram(path, Observer.RETRY_WAIT).count,
+            sum(retries.values()))
+        self.assertEqual(
+            metrics.histogram(path, Observer.RATE_LIMIT).count,
+            sum(attempts.values()))
+        self.assertEqual(api.calls[path], sum(attempts.values()))
+
+    def test_stream(self):
+        log = _EventLog()
+        directory = tempfile.mkdtemp()
+        try:
+            client = Client(self.api_key, transport=FakeTransport(FakeApi()),
+                            observers=[log])
+            client.create_request(emails=['a@example.com', 'b@example.com'])
+            log.events.clear()
+
+            size = client.download(
+                filename=os.path.join(directory, 'result.csv'),
+                request_id=1)
+        finally:
+            shutil.rmtree(directory)
+
+        path = '/request/completed'
+        self.assertEqual(log.events, [
+            ('span', path, 'wait'),
+            ('attempt', path, 1, 200, 72, None),
+            ('span', path, 'transfer'),
+            ('transfer', path, size),
+        ])
+
+    def test_prometheus(self):
+        metrics = MetricsRecorder(buckets=(0.1, 1))
+        metrics.on_span('/request', 'wait', 0.05)
+        metrics.on_span('/request', 'wait', 0.5)
+        metrics.on_attempt('/request', 1, None, 10, None)
+        metrics.on_attempt('/request', 2, 200, 10, 20)
+        metrics.on_retry('/request', 1, 0.5, 'connect')
+
+        text = metrics.to_prometheus()
+        for line in (
+                '# TYPE bulkemailverifier_phase_seconds histogram',
+                'bulkemailverifier_phase_seconds_bucket'
+                '{path="/request",phase="wait",le="0.1"} 1',
+                'bulkemailverifier_phase_seconds_bucket'
+                '{path="/request",phase="wait",le="+Inf"} 2',
+                'bulkemailverifier_phase_seconds_sum'
+                '{path="/request",phase="wait"} 0.55',
+                'bulkemailverifier_attempts_total'
+                '{path="/request",status="error"} 1',
+                'bulkemailverifier_retries_total'
+                '{path="/request",reason="connect"} 1',
+                'bulkemailverifier_request_bytes_total{path="/request"} 20',
+                'bulkemailverifier_response_bytes_total{path="/request"} 20',
+        ):
+            self.assertIn(line + '\n', text)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()['attempts'], {})
+
+    def test_validation(self):
+        requester = ApiRequester(base_url='http://localhost:1')
+        self.assertEqual(requester.observers, ())
+
+        requester.observers = [MetricsRecorder()]
+        self.assertEqual(len(requester.observers), 1)
+        requester.observers = None
+        self.assertEqual(requester.observers, ())
+
+        with self.assertRaises(ValueError):
+            requester.observers = MetricsRecorder()
+        with self.assertRaises(ValueError):
+            requester.observers = [object()]
+        with self.assertRaises(ValueError):
+            ApiRequester(observers=1)
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncObservers(unittest.TestCase):
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def test_phases(self):
+        metrics = MetricsRecorder()
+
+        async def run():
+            async with AsyncClient(
+                    self.api_key, transport=AsyncFakeTransport(FakeApi()),
+                    observers=[metrics]) as client:
+                await client.create_request(emails=['a@example.com'])
+                await client.get_records(request_id=1)
+                return [r async for r in client.iter_records(request_id=1)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            records = loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+        self.assertEqual(len(records), 1)
+        snapshot = metrics.snapshot()
+        path = '/request/completed'
+        self.assertEqual(snapshot['attempts'][(path, '200')], 2)
+        self.assertEqual(sorted(p for s, p in snapshot['spans']
+                                if s == path),
+                         ['build', 'decode', 'transfer', 'wait'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import itertools
+import threading
+import unittest
+
+from bulkemailverifier import Client, ParameterError, Record, ResultCache
+
+from tests.stub import StubApiServer
+
+
+class TestVerificationPipeline(unittest.TestCase):
+    """
+    End to end verification against a local stub server where every
+    request is ready after two status checks.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.ids = itertools.count(1)
+        self.emails = {}
+        self.checks = {}
+        self.events = []
+        self.lock = threading.Lock()
+        self.server = StubApiServer({
+            '/request': self._create,
+            '/request/status': self._status,
+            '/request/completed': self._completed,
+            '/request/failed': self._failed,
+        })
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def _create(self, payload, headers):
+        with self.lock:
+            request_id = next(self.ids)
+            self.emails[request_id] = payload['emails']
+            self.events.append(('create', request_id))
+        return 200, {'response': {'id': request_id}}, None
+
+    def _status(self, payload, headers):
+        data = []
+        with self.lock:
+            for request_id in payload['ids']:
+                checks = self.checks[request_id] = \
+                    self.checks.get(request_id, 0) + 1
+                data.append({
+                    'id': request_id,
+                    'total_emails': 2,
+                    'processed_emails': min(checks, 2),
+                    'ready': checks >= 2
+                })
+        return 200, {'response': data}, None
+
+    def _completed(self, payload, headers):
+        with self.lock:
+            self.events.append(('fetch', payload['id']))
+            emails = self.emails[payload['id']]
+        return 200, {'response': [
+            {'emailAddress': e, 'result': 'ok'} for e in emails
+            if not e.startswith('fail')
+        ]}, None
+
+    def _failed(self, payload, headers):
+        with self.lock:
+            emails = self.emails[payload['id']]
+        return 200, {'response': [
+            {'emailAddress': e, 'result': 'failed'} for e in emails
+            if e.startswith('fail')
+        ]}, None
+
+    def _verify(self, emails, **kwargs):
+        return self.client.verify(
+            emails=emails, min_interval=0.01, max_interval=0.02, **kwargs)
+
+    def test_verify(self):
+        emails = ['user{}@example.com'.format(i) for i in range(25)]
+
+        pipeline = self._verify(iter(emails), chunk_size=4, max_pending=3)
+        records = list(pipeline)
+
+        self.assertEqual(sorted(r.email_address for r in records),
+                         sorted(emails))
+        self.assertEqual(list(pipeline.request_ids), list(range(7)))
+
+        outstanding = 0
+        for event, _ in self.events:
+            outstanding += 1 if event == 'create' else -1
+            self.assertLessEqual(outstanding, 3)
+        # Later chunks are submitted after earlier ones are fetched
+        self.assertLess(self.events.index(('fetch', 1)),
+                        self.events.index(('create', 7)))
+
+    def test_include_failed(self):
+        emails = ['user@example.com', 'fail@example.com']
+
+        records = self._verify(emails).run()
+        self.assertEqual([r.email_address for r in records],
+                         ['user@example.com'])
+
+        records = self._verify(emails, include_failed=True).run()
+        self.assertEqual([r.result for r in records], ['ok', 'failed'])
+
+    def test_cache(self):
+        cached = Record({'emailAddress': 'a@x.com', 'result': 'cached'})
+        with ResultCache() as cache:
+            cache.put(cached)
+            self.client.cache = cache
+
+            records = self._verify(
+                ['a@x.com', 'b@x.com', 'a@x.com'], chunk_size=1).run()
+
+            self.assertEqual([r.result for r in records].count('cached'), 2)
+            self.assertEqual(len(records), 3)
+            self.assertEqual(self.emails, {1: ['b@x.com']})
+
+    def test_close_early(self):
+        emails = ('user{}@example.com'.format(i) for i in range(1000))
+
+        for record in self._verify(emails, chunk_size=2, max_pending=2):
+            break
+
+        self.assertLessEqual(len(self.emails), 3)
+
+    def test_validation(self):
+        with self.assertRaises(ParameterError):
+            self.client.verify(emails='test@example.com')
+        with self.assertRaises(ParameterError):
+            self.client.verify(emails=[], max_pending=0)
+        with self.assertRaises(ParameterError):
+            self.client.verify(emails=[], min_interval=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import unittest
+
+from bulkemailverifier import AsyncClient, AsyncFakeTransport, Client, \
+    FakeApi, HttpApiError, ParameterError
+from bulkemailverifier.net.async_http import aiohttp
+
+from tests.stub import ConcurrencyRoute, StubApiServer
+
+
+class TestRequestPoller(unittest.TestCase):
+    """
+    Status polling against a local stub server where every status call
+    moves a request forward by `id` emails out of 4.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.processed = {}
+        self.lock = threading.Lock()
+        self.concurrency = ConcurrencyRoute(self._status, 0.02)
+        self.server = StubApiServer({'/request/status': self.concurrency})
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def _status(self, payload, headers):
+        data = []
+        with self.lock:
+            if 404 in payload['ids']:
+                return 404, {'error': 'Not found'}, None
+            for request_id in payload['ids']:
+                if request_id > 100:
+                    continue
+                processed = min(
+                    self.processed.get(request_id, 0) + request_id, 4)
+                self.processed[request_id] = processed
+                data.append({
+                    'id': request_id,
+                    'total_emails': 4,
+                    'processed_emails': processed,
+                    'ready': processed == 4
+                })
+        return 200, {'response': data}, None
+
+    def test_wait(self):
+        ready = []
+        poller = self.client.wait_for_requests(
+            request_ids=[1, 2, 3, 4],
+            batch_size=3,
+            min_interval=0.01,
+            max_interval=0.05,
+            callback=ready.append)
+
+        finished = [r.id for r in poller]
+
+        self.assertEqual(sorted(finished), [1, 2, 3, 4])
+        self.assertEqual(finished[-1], 1)
+        self.assertEqual([r.id for r in ready], finished)
+        self.assertEqual(poller.pending, [])
+        for _, payload in self.server.calls:
+            self.assertLessEqual(len(payload['ids']), 3)
+
+    def test_concurrent_batches(self):
+        poller = self.client.wait_for_requests(
+            request_ids=[1, 2, 3, 4, 101],
+            batch_size=1,
+            max_workers=3,
+            min_interval=0.01)
+
+        self.assertEqual([r.id for r in poller.poll()], [4])
+        self.assertEqual(len(self.server.calls), 5)
+        self.assertGreater(self.concurrency.max_active, 1)
+        self.assertLessEqual(self.concurrency.max_active, 3)
+
+    def test_timeout(self):
+        poller = self.client.wait_for_requests(
+            request_ids=[4, 101],
+            min_interval=0.01,
+            max_interval=0.02,
+            timeout=0.2)
+
+        self.assertEqual([r.id for r in poller.run()], [4])
+        self.assertEqual(poller.pending, [101])
+
+    def test_failed_batch(self):
+        ready = []
+        poller = self.client.wait_for_requests(
+            request_ids=[4, 404, 3],
+            batch_size=1,
+            min_interval=0.01,
+            callback=ready.append)
+
+        with self.assertRaises(HttpApiError):
+            poller.poll()
+
+        self.assertEqual([r.id for r in ready], [4])
+        self.assertEqual(poller.pending, [404, 3])
+        self.assertEqual([r.id for r in poller.poll()], [4])
+        self.assertEqual(len(self.server.calls), 3)
+
+    def test_incorrect_values(self):
+        with self.assertRaises(ParameterError):
+            self.client.wait_for_requests(request_ids=[])
+        with self.assertRaises(ParameterError):
+            self.client.wait_for_requests(request_ids=[1], min_interval=0)
+        with self.assertRaises(ParameterError):
+            self.client.wait_for_requests(
+                request_ids=[1], min_interval=5, max_interval=1)
+        with self.assertRaises(ParameterError):
+            self.client.wait_for_requests(request_ids=[1], max_workers=0)
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncRequestPoller(unittest.TestCase):
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def _run(self, coroutine):
+        api = FakeApi(emails_per_second=1000)
+
+        async def wrapper():
+            async with AsyncClient(
+                    self.api_key, transport=AsyncFakeTransport(api)) as c:
+                request_ids = [
+                    await c.create_request(emails=['a@example.com'] * size)
+                    for size in (50, 10, 200)]
+                return await coroutine(c, request_ids)
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(wrapper())
+        finally:
+            loop.close()
+
+    def test_wait(self):
+        async def wait(client, request_ids):
+            poller = client.wait_for_requests(
+                request_ids=request_ids, min_interval=0.01,
+                max_interval=0.05)
+            with self.assertRaises(TypeError):
+                iter(poller)
+            return [r.id async for r in poller], poller.pending
+
+        finished, pending = self._run(wait)
+
+        self.assertEqual(finished, [2, 1, 3])
+        self.assertEqual(pending, [])
+
+    def test_timeout(self):
+        async def wait(client, request_ids):
+            poller = client.wait_for_requests(
+                request_ids=request_ids, min_interval=0.01, timeout=0.1)
+            return [r.id for r in await poller.run()], poller.pending
+
+        finished, pending = self._run(wait)
+
+        self.assertEqual(sorted(finished), [1, 2])
+        self.assertEqual(pending, [3])
+
+    def test_failed_batch(self):
+        def status(payload, headers):
+            if 404 in payload['ids']:
+                return 404, {'error': 'Not found'}, None
+            return 200, {'response': [
+                {'id': i, 'total_emails': 1, 'processed_emails': 1,
+                 'ready': True} for i in payload['ids']]}, None
+
+        server = StubApiServer({'/request/status': status})
+        server.start()
+
+        async def wait():
+            async with AsyncClient(
+                    self.api_key, base_url=server.base_url) as client:
+                poller = client.wait_for_requests(
+                    request_ids=[1, 404, 2], batch_size=1,
+                    min_interval=0.01)
+                with self.assertRaises(HttpApiError):
+                    await poller.poll()
+                pending = poller.pending
+                return [r.id for r in await poller.poll()], pending
+
+        loop = asyncio.new_event_loop()
+        try:
+            finished, pending = loop.run_until_complete(wait())
+        finally:
+            loop.close()
+            server.stop()
+
+        self.assertEqual(sorted(finished), [1, 2])
+        self.assertEqual(pending, [404])
+
+
+if __name__ == '__main__':
+    unittest.main()
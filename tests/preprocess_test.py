@@ -0,0 +1,89 @@
+import unittest
+
+from bulkemailverifier import Client, ParameterError, Record, \
+    iter_unique_emails, normalize_email, prepare_emails
+
+from tests.stub import StubApiServer
+
+
+class TestPreprocess(unittest.TestCase):
+
+    def test_normalize(self):
+        self.assertEqual(normalize_email('  Foo@Example.COM. '),
+                         'Foo@example.com')
+        self.assertEqual(normalize_email('ü@bücher.de'), 'ü@bücher.de')
+        self.assertEqual(normalize_email('a@b.xn--p1ai'), 'a@b.xn--p1ai')
+
+        for value in ['test', 'a..b@x.com', '.a@x.com', 'a@x', 'a b@x.com',
+                      'a@-x.com', 'a@@x.com', 'a' * 65 + '@x.com', None, 1]:
+            self.assertIsNone(normalize_email(value), value)
+
+    def test_prepare(self):
+        prepared = prepare_emails([
+            'foo@example.com', 'foo@EXAMPLE.com ', 'bar@example.org',
+            'test', 'foo@example.com'
+        ])
+
+        self.assertEqual(prepared.emails,
+                         ['foo@example.com', 'bar@example.org'])
+        self.assertEqual(prepared.rejected, ['test'])
+        self.assertEqual(prepared.duplicates, 2)
+
+        record = Record({'emailAddress': 'foo@example.com', 'result': 'ok'})
+        results = prepared.fan_out([record])
+
+        self.assertIs(results['foo@EXAMPLE.com '], record)
+        self.assertIs(results['foo@example.com'], record)
+        self.assertEqual(results['test'].error, 'Invalid format')
+        self.assertNotIn('bar@example.org', results)
+
+    def test_streaming(self):
+        emails = ['a@x.com', 'b@x.com', 'a@x.com', 'c@x.com', 'a@x.com',
+                  'bad', 'd@x.com', 'b@x.com']
+
+        self.assertEqual(list(iter_unique_emails(emails)),
+                         ['a@x.com', 'b@x.com', 'c@x.com', 'd@x.com'])
+        self.assertEqual(list(iter_unique_emails(emails, 2)),
+                         ['a@x.com', 'b@x.com', 'c@x.com', 'd@x.com',
+                          'b@x.com'])
+
+
+class TestClientPreprocess(unittest.TestCase):
+    """
+    Preprocessing in request creation against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.server = StubApiServer()
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_create(self):
+        self.client.create_request(
+            emails=['Foo@Example.com', 'foo@example.com', 'test'],
+            preprocess=True)
+
+        self.assertEqual(self.server.calls[0][1]['emails'],
+                         ['Foo@example.com', 'foo@example.com'])
+
+    def test_create_chunked(self):
+        emails = ('user{}@Example.com'.format(i % 5) for i in range(100))
+
+        result = self.client.create_requests_chunked(
+            emails=emails, chunk_size=2, preprocess=True)
+
+        self.assertEqual(len(result), 3)
+
+    def test_nothing_left(self):
+        with self.assertRaises(ParameterError):
+            self.client.create_request(emails=['test'], preprocess=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
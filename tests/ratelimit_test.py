@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from bulkemailverifier import ApiRequester, AsyncApiRequester, \
+    AsyncFakeTransport, FakeApi, FileRateLimiter, TokenBucketRateLimiter
+from bulkemailverifier.net.async_http import aiohttp
+
+from tests.stub import StubApiServer
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_token_bucket(self):
+        limiter = TokenBucketRateLimiter(10, burst=2)
+
+        delays = [limiter.reserve('/request/status') for _ in range(4)]
+
+        self.assertEqual(delays[:2], [0, 0])
+        self.assertAlmostEqual(delays[2], 0.1, delta=0.01)
+        self.assertAlmostEqual(delays[3], 0.2, delta=0.01)
+        self.assertEqual(limiter.reserve('/request'), 0)
+
+    def test_wall_clock_jump(self):
+        limiter = TokenBucketRateLimiter(1)
+        wall_clock = iter(range(0, 36000, 3600))
+
+        with mock.patch('bulkemailverifier.net.ratelimit.time',
+                        lambda: next(wall_clock)):
+            limiter.reserve('/request')
+            delay = limiter.reserve('/request')
+
+        self.assertAlmostEqual(delay, 1, delta=0.01)
+
+    def test_per_key_rates(self):
+        limiter = TokenBucketRateLimiter(1000, rates={'/request': 1})
+
+        limiter.reserve('/request')
+
+        self.assertAlmostEqual(limiter.reserve('/request'), 1, delta=0.01)
+        self.assertEqual(limiter.reserve('/request/list'), 0)
+
+    def test_threads(self):
+        limiter = TokenBucketRateLimiter(50)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: limiter.acquire('k'), range(11)))
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    def test_shared_file(self):
+        path = os.path.join(self.directory, 'limits.json')
+        first = FileRateLimiter(path, 1)
+        second = FileRateLimiter(path, 1)
+
+        self.assertEqual(first.reserve('/request'), 0)
+        self.assertAlmostEqual(second.reserve('/request'), 1, delta=0.05)
+        self.assertAlmostEqual(first.reserve('/request'), 2, delta=0.05)
+
+    def test_requester(self):
+        limiter = TokenBucketRateLimiter(20)
+
+        with StubApiServer() as server, ApiRequester(
+                base_url=server.base_url, rate_limiter=limiter) as requester:
+            started = time.monotonic()
+            for _ in range(5):
+                requester.post('/request/status', {'ids': [1]})
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    @unittest.skipIf(os.name == 'nt', 'uses fcntl')
+    def test_async_file_limiter(self):
+        import fcntl
+
+        path = os.path.join(self.directory, 'limits.json')
+        requester = AsyncApiRequester(
+            base_url='http://localhost:1',
+            transport=AsyncFakeTransport(FakeApi()),
+            rate_limiter=FileRateLimiter(path, 100))
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            ticker = asyncio.ensure_future(tick())
+            try:
+                await requester.post('/request/list', {
+                    'apiKey': 'at_00000000000000000000000000000'})
+            finally:
+                ticker.cancel()
+            await requester.close()
+
+        # Another process holding the state file lock
+        with open(path, 'a+b') as state_file:
+            fcntl.flock(state_file.fileno(), fcntl.LOCK_EX)
+            threading.Timer(0.2, fcntl.flock,
+                            (state_file.fileno(), fcntl.LOCK_UN)).start()
+
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(run())
+            finally:
+                loop.close()
+
+        self.assertGreater(len(ticks), 5)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import gzip
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from bulkemailverifier import Client, FileError, Record, RecordFileReader
+
+from tests.stub import StubApiServer
+
+_header = '"Email Address","Format Check","SMTP Check","MX Records",' \
+          '"Result","Error"\r\n'
+
+
+def _row(i: int) -> str:
+    return '"user{}@example.com","true","{}","mx1.example.com,' \
+           'mx2.example.com","{}",""\r\n'.format(
+               i, ['true', 'false', 'null'][i % 3],
+               ['ok', 'smtp-failed', 'unknown'][i % 3])
+
+
+def _expected(i: int) -> Record:
+    return Record({
+        'emailAddress': 'user{}@example.com'.format(i),
+        'formatCheck': 'true',
+        'smtpCheck': ['true', 'false', 'null'][i % 3],
+        'mxRecords': ['mx1.example.com', 'mx2.example.com'],
+        'result': ['ok', 'smtp-failed', 'unknown'][i % 3],
+    })
+
+
+class TestRecordFileReader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'result.csv')
+        self.index = self.filename + '.idx'
+        self._write(_header + ''.join(_row(i) for i in range(2500)))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def _write(self, content: str):
+        with open(self.filename, 'w', newline='') as f:
+            f.write(content)
+
+    def test_rows(self):
+        with RecordFileReader(self.filename) as reader:
+            self.assertEqual(len(reader), 2500)
+            self.assertEqual(reader[0], _expected(0))
+            self.assertEqual(reader[1234], _expected(1234))
+            self.assertEqual(reader[-1], _expected(2499))
+            self.assertEqual(reader.records(10, 13),
+                             [_expected(i) for i in range(10, 13)])
+            self.assertEqual(list(reader),
+                             [_expected(i) for i in range(2500)])
+
+            with self.assertRaises(IndexError):
+                reader.record(2500)
+
+    def test_tables(self):
+        with RecordFileReader(self.filename) as reader:
+            tables = list(reader.iter_tables(batch_size=1000))
+
+        self.assertEqual([len(t) for t in tables], [1000, 1000, 500])
+        self.assertEqual(tables[1][0], _expected(1000))
+        self.assertEqual(tables[0].group_count('smtp_check'),
+                         {True: 334, False: 333, None: 333})
+
+    def test_find(self):
+        with RecordFileReader(self.filename) as reader:
+            self.assertEqual(reader.find(' user42@EXAMPLE.com'),
+                             _expected(42))
+            self.assertIsNone(reader.find('missing@example.com'))
+
+    def test_sidecar_index(self):
+        with RecordFileReader(self.filename, index=self.index) as reader:
+            self.assertEqual(reader.find('user7@example.com'), _expected(7))
+        self.assertTrue(os.path.exists(self.index))
+
+        with RecordFileReader(self.filename, index=self.index) as reader:
+            self.assertIsNotNone(reader._index_map)
+            self.assertEqual(len(reader), 2500)
+            self.assertEqual(reader[2499], _expected(2499))
+            self.assertEqual(reader.find('user2499@example.com'),
+                             _expected(2499))
+
+        # A changed file gets a new index
+        time.sleep(0.01)
+        self._write(_header + _row(5))
+        with RecordFileReader(self.filename, index=self.index) as reader:
+            self.assertEqual(len(reader), 1)
+            self.assertEqual(reader.find('user5@example.com'), _expected(5))
+            self.assertIsNone(reader.find('user7@example.com'))
+
+    def test_quoted_newlines(self):
+        self._write('﻿email,result,error\n'
+                    'a@example.com,ok,\n'
+                    '\n'
+                    '"b@example.com",unknown,"line one\nline ""two"""\n'
+                    'c@example.com,ok,')
+
+        with RecordFileReader(self.filename) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(reader[1].error, 'line one\nline "two"')
+            self.assertEqual(reader[2].email_address, 'c@example.com')
+            self.assertEqual(reader.find('b@example.com').result, 'unknown')
+
+    def test_invalid_files(self):
+        with self.assertRaises(FileError):
+            RecordFileReader(os.path.join(self.directory, 'missing.csv'))
+
+        self._write('"Result"\n"ok"\n')
+        with self.assertRaises(FileError):
+            RecordFileReader(self.filename)
+
+        with gzip.open(self.filename, 'wt') as f:
+            f.write(_header)
+        with self.assertRaises(FileError):
+            RecordFileReader(self.filename)
+
+    def test_empty_file(self):
+        self._write('')
+        with self.assertRaises(FileError):
+            RecordFileReader(self.filename)
+
+        self._write(_header)
+        with RecordFileReader(self.filename, index=self.index) as reader:
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(list(reader), [])
+            self.assertIsNone(reader.find('user1@example.com'))
+
+    def test_download(self):
+        server = StubApiServer({
+            '/request/completed':
+                lambda p, h: (200, _header + _row(1) + _row(2), None),
+        })
+        server.start()
+        try:
+            with Client('at_00000000000000000000000000000',
+                        base_url=server.base_url) as client:
+                client.download(filename=self.filename, request_id=1)
+        finally:
+            server.stop()
+
+        with RecordFileReader(self.filename) as reader:
+            self.assertEqual(list(reader), [_expected(1), _expected(2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
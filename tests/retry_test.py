@@ -0,0 +1,216 @@
+from email.utils import formatdate
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+import asyncio
+import socket
+import threading
+import time
+import unittest
+
+from bulkemailverifier import ApiConnectionError, ApiRequester, \
+    AsyncApiRequester, HttpApiError, RetryPolicy, Transport
+from bulkemailverifier.net.async_http import aiohttp
+
+from tests.stub import StubApiServer
+
+
+class _Faults:
+    """Fails the first `count` calls of a route with `status`"""
+
+    def __init__(self, count: int, status: int, headers: dict = None):
+        self.count = count
+        self.status = status
+        self.headers = headers
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, payload, headers):
+        with self.lock:
+            self.calls += 1
+            failed = self.calls <= self.count
+        if failed:
+            return self.status, {'error': 'failure'}, self.headers
+        return 200, {'response': []}, None
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_delays(self):
+        policy = RetryPolicy(max_attempts=4, backoff_factor=1, jitter=False)
+
+        delays = [policy.next_delay('/request/status', a, 0, status_code=503)
+                  for a in range(1, 5)]
+
+        self.assertEqual(delays, [1, 2, 4, None])
+
+    def test_non_idempotent(self):
+        policy = RetryPolicy()
+
+        self.assertIsNone(
+            policy.next_delay('/request', 1, 0, status_code=503))
+        self.assertIsNone(policy.next_delay(
+            '/request', 1, 0, error_kind=RetryPolicy.TRANSPORT_ERROR))
+        self.assertIsNotNone(policy.next_delay(
+            '/request', 1, 0, error_kind=RetryPolicy.CONNECT_ERROR))
+        self.assertIsNone(
+            policy.next_delay('/request/status', 1, 0, status_code=400))
+
+    def test_retry_after(self):
+        policy = RetryPolicy(max_backoff=10)
+
+        self.assertEqual(policy.next_delay(
+            '/request/list', 1, 0, status_code=429, retry_after='7'), 7)
+        self.assertEqual(policy.next_delay(
+            '/request/list', 1, 0, status_code=429,
+            retry_after='Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+
+    def test_retry_after_above_max_backoff(self):
+        policy = RetryPolicy(max_backoff=10)
+        tomorrow = formatdate(time.time() + 86400, usegmt=True)
+
+        self.assertIsNone(policy.next_delay(
+            '/request/list', 1, 0, status_code=429, retry_after='86400'))
+        self.assertIsNone(policy.next_delay(
+            '/request/list', 1, 0, status_code=503, retry_after=tomorrow))
+
+    def test_deadline(self):
+        policy = RetryPolicy(deadline=5)
+
+        self.assertEqual(policy.next_delay(
+            '/request/list', 1, 1, status_code=429, retry_after='3'), 3)
+        self.assertIsNone(policy.next_delay(
+            '/request/list', 1, 1, status_code=429, retry_after='10'))
+
+
+class TestRetries(unittest.TestCase):
+    """
+    Retries against a local fault-injecting stub server.
+    """
+
+    def setUp(self) -> None:
+        self.status = _Faults(2, 503, {'Retry-After': '0'})
+        self.create = _Faults(1, 503)
+        self.server = StubApiServer({
+            '/request/status': self.status,
+            '/request': self.create,
+        })
+        self.server.start()
+        self.policy = RetryPolicy(max_attempts=3, backoff_factor=0.01)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_retry_idempotent(self):
+        with ApiRequester(base_url=self.server.base_url,
+                          retry_policy=self.policy) as requester:
+            requester.post('/request/status', {'ids': [1]})
+
+        self.assertEqual(self.status.calls, 3)
+
+    def test_give_up(self):
+        requester = ApiRequester(
+            base_url=self.server.base_url,
+            retry_policy=RetryPolicy(max_attempts=2, backoff_factor=0))
+
+        with requester, self.assertRaises(HttpApiError) as context:
+            requester.post('/request/status', {'ids': [1]})
+
+        self.assertEqual(context.exception.code, 503)
+        self.assertEqual(self.status.calls, 2)
+
+    def test_no_retry_create(self):
+        requester = ApiRequester(
+            base_url=self.server.base_url, retry_policy=self.policy)
+
+        with requester, self.assertRaises(HttpApiError):
+            requester.post('/request', {'emails': ['foo@example.com']})
+
+        self.assertEqual(self.create.calls, 1)
+
+    def test_no_policy(self):
+        with ApiRequester(base_url=self.server.base_url) as requester:
+            with self.assertRaises(HttpApiError):
+                requester.post('/request/status', {'ids': [1]})
+
+        self.assertEqual(self.status.calls, 1)
+
+    def test_connect_error(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        requester = ApiRequester(
+            base_url='http://127.0.0.1:{}/api'.format(port),
+            retry_policy=RetryPolicy(max_attempts=3, backoff_factor=0.05,
+                                     jitter=False))
+
+        started = time.monotonic()
+        with requester, self.assertRaises(ApiConnectionError) as context:
+            requester.post('/request', {})
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        self.assertIsInstance(
+            context.exception.__cause__, RequestsConnectionError)
+
+    def test_unclassified_errors(self):
+        class _Failing(Transport):
+            def __init__(self, error):
+                self.error = error
+
+            def post(self, url, body, headers, timeout, stream):
+                raise self.error
+
+        with ApiRequester(transport=_Failing(ConnectionResetError()),
+                          retry_policy=self.policy) as requester:
+            with self.assertRaises(ApiConnectionError) as context:
+                requester.post('/request', {})
+        self.assertIsInstance(
+            context.exception.__cause__, ConnectionResetError)
+
+        with ApiRequester(transport=_Failing(KeyError('x')),
+                          retry_policy=self.policy) as requester:
+            with self.assertRaises(KeyError):
+                requester.post('/request', {})
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async_connect_error(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        async def call():
+            async with AsyncApiRequester(
+                    base_url='http://127.0.0.1:{}/api'.format(port),
+                    retry_policy=RetryPolicy(
+                        max_attempts=2, backoff_factor=0.01)) as requester:
+                return await requester.post('/request', {})
+
+        loop = asyncio.new_event_loop()
+        try:
+            with self.assertRaises(ApiConnectionError) as context:
+                loop.run_until_complete(call())
+        finally:
+            loop.close()
+
+        self.assertIsInstance(
+            context.exception.__cause__, aiohttp.ClientConnectorError)
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async_retry(self):
+        async def call():
+            async with AsyncApiRequester(
+                    base_url=self.server.base_url,
+                    retry_policy=self.policy) as requester:
+                return await requester.post('/request/status', {'ids': [1]})
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(call())
+        finally:
+            loop.close()
+
+        self.assertEqual(self.status.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
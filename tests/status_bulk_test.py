@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+
+from bulkemailverifier import ApiAuthError, AsyncClient, BulkRequest, \
+    Client, HttpApiError, ParameterError
+from bulkemailverifier.net.async_http import aiohttp
+
+from tests.stub import ConcurrencyRoute, StubApiServer
+
+
+class _Status:
+    """
+    /request/status route rejecting more than `limit` IDs per call
+    """
+
+    def __init__(self, limit: int, code: int = 413):
+        self.limit = limit
+        self.code = code
+
+    def __call__(self, payload, headers):
+        ids = payload['ids']
+        if len(ids) > self.limit:
+            return self.code, {'error': 'Too many IDs'}, None
+
+        return 200, {'response': [
+            {'id': i, 'total_emails': 1, 'processed_emails': 1, 'ready': 1}
+            for i in ids if i % 100 != 0
+        ]}, None
+
+
+class TestStatusBulk(unittest.TestCase):
+    """
+    Batched status requests against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.route = _Status(1000)
+        self.concurrency = ConcurrencyRoute(self.route, 0.02)
+        self.server = StubApiServer({'/request/status': self.concurrency})
+        self.server.start()
+        self.client = Client(self.api_key, base_url=self.server.base_url)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_batches(self):
+        statuses = self.client.get_status_bulk(
+            request_ids=list(range(1, 1001)), batch_size=100, max_workers=4)
+
+        self.assertEqual(len(statuses), 990)
+        self.assertIsInstance(statuses[1], BulkRequest)
+        self.assertEqual(statuses[999].id, 999)
+        self.assertNotIn(100, statuses)
+
+        self.assertEqual(len(self.server.calls), 10)
+        self.assertGreater(self.concurrency.max_active, 1)
+        self.assertLessEqual(self.concurrency.max_active, 4)
+
+    def test_duplicates(self):
+        statuses = self.client.get_status_bulk(
+            request_ids=(i % 10 + 1 for i in range(500)))
+
+        self.assertEqual(sorted(statuses), list(range(1, 11)))
+        self.assertEqual(len(self.server.calls), 1)
+        self.assertEqual(self.server.calls[0][1]['ids'], list(range(1, 11)))
+
+    def test_split_rejected_batches(self):
+        for code in (400, 413, 422):
+            self.server.calls.clear()
+            self.route.limit, self.route.code = 30, code
+
+            statuses = self.client.get_status_bulk(
+                request_ids=list(range(1, 201)), batch_size=100)
+
+            self.assertEqual(len(statuses), 198)
+            sizes = [len(p['ids']) for _, p in self.server.calls]
+            # 2 rejected batches of 100, 4 of 50, then 8 accepted of 25
+            self.assertEqual(len(sizes), 14)
+            self.assertEqual(sorted(sizes)[:8], [25] * 8)
+
+    def test_errors(self):
+        self.route.limit = 0
+        with self.assertRaises(HttpApiError) as context:
+            self.client.get_status_bulk(request_ids=[1, 2])
+        self.assertEqual(context.exception.code, 413)
+
+        self.server.routes['/request/status'] = \
+            lambda p, h: (401, {'error': 'Access restricted'}, None)
+        with self.assertRaises(ApiAuthError):
+            self.client.get_status_bulk(request_ids=list(range(1, 300)))
+
+    def test_validation(self):
+        with self.assertRaises(ParameterError):
+            self.client.get_status_bulk(request_ids=[])
+        with self.assertRaises(ParameterError):
+            self.client.get_status_bulk(request_ids=[1, '2'])
+        with self.assertRaises(ParameterError):
+            self.client.get_status_bulk(request_ids=[True])
+        with self.assertRaises(ParameterError):
+            self.client.get_status_bulk(request_ids='123')
+        with self.assertRaises(ParameterError):
+            self.client.get_status_bulk(request_ids=[1], batch_size=0)
+        with self.assertRaises(ParameterError):
+            self.client.get_status_bulk(request_ids=[1], max_workers=0)
+        self.assertEqual(self.server.calls, [])
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncStatusBulk(unittest.TestCase):
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.route = _Status(20)
+        self.server = StubApiServer({'/request/status': self.route})
+        self.server.start()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        self.server.stop()
+
+    def test_batches(self):
+        async def get():
+            async with AsyncClient(
+                    self.api_key, base_url=self.server.base_url) as client:
+                return await client.get_status_bulk(
+                    request_ids=list(range(1, 251)), batch_size=40)
+
+        statuses = self.loop.run_until_complete(get())
+
+        self.assertEqual(len(statuses), 248)
+        self.assertEqual(statuses[250].id, 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+from json import dumps, loads, JSONDecodeError
+import unittest
+
+from bulkemailverifier import AsyncClient, Client, LazyRecord, Record, \
+    UnparsableApiResponseError
+from bulkemailverifier.models.stream import JsonArrayParser
+from bulkemailverifier.net.async_http import aiohttp
+
+from tests.stub import StubApiServer
+
+
+_records = [
+    {
+        'emailAddress': 'user{}@example.com'.format(i),
+        'formatCheck': 'true',
+        'smtpCheck': 'false',
+        'dnsCheck': 'true',
+        'mxRecords': ['mx{}.example.com'.format(i)],
+        'result': 'smtp-failed'
+    } for i in range(5000)
+]
+
+
+class TestJsonArrayParser(unittest.TestCase):
+
+    def _parse(self, document: bytes, size: int) -> list:
+        parser = JsonArrayParser('response')
+        items = []
+        for i in range(0, len(document), size):
+            items.extend(parser.feed(document[i:i + size]))
+        items.extend(parser.close())
+        return items
+
+    def test_split_parts(self):
+        document = dumps({
+            'meta': {'total': 1.5e3},
+            'response': [{'a': 'ü€'}, None, 12345, -0.25e-3, [1, 2]],
+            'tail': 7
+        }, ensure_ascii=False).encode('UTF-8')
+
+        expected = loads(document.decode('UTF-8'))['response']
+
+        for size in range(1, 17):
+            self.assertEqual(self._parse(document, size), expected)
+
+    def test_root_not_found(self):
+        parser = JsonArrayParser('response')
+        parser.feed(b'{"error": "Access denied"}')
+        parser.close()
+
+        self.assertFalse(parser.found)
+
+    def test_malformed(self):
+        for document in [b'[1]', b'{"response": [1 2]}',
+                         b'{"response": [1, 2', b'{"response": []} 1']:
+            with self.assertRaises(JSONDecodeError):
+                self._parse(document, 4)
+
+
+class TestIterRecords(unittest.TestCase):
+    """
+    Streaming record iteration against a local stub server.
+    """
+
+    api_key = 'at_00000000000000000000000000000'
+
+    def setUp(self) -> None:
+        self.server = StubApiServer({
+            '/request/completed':
+                lambda p, h: (200, {'response': _records}, None),
+            '/request/failed':
+                lambda p, h: (200, '{"response": [{"emailAddress": ', None),
+        })
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_iter_records(self):
+        with Client(self.api_key, base_url=self.server.base_url) as client:
+            records = list(client.iter_records(request_id=1, chunk_size=512))
+
+        self.assertEqual(len(records), len(_records))
+        self.assertIsInstance(records[0], Record)
+        self.assertEqual(records[-1].email_address, 'user4999@example.com')
+        self.assertEqual(records[-1].mx_records, ('mx4999.example.com',))
+
+    def test_lazy(self):
+        with Client(self.api_key, base_url=self.server.base_url) as client:
+            records = list(client.iter_records(request_id=1, lazy=True))
+            table = client.get_records(request_id=1, lazy=True).to_table()
+
+        self.assertIsInstance(records[0], LazyRecord)
+        self.assertEqual(records[-1].mx_records, ('mx4999.example.com',))
+        self.assertEqual(table.email(len(_records) - 1),
+                         'user4999@example.com')
+
+    def test_truncated(self):
+        with Client(self.api_key, base_url=self.server.base_url) as client:
+            with self.assertRaises(UnparsableApiResponseError):
+                list(client.iter_records(request_id=1, return_failed=True))
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async_iter_records(self):
+        async def collect():
+            async with AsyncClient(
+                    self.api_key, base_url=self.server.base_url) as client:
+                return [r async for r in client.iter_records(request_id=1)]
+
+        loop = asyncio.new_event_loop()
+        try:
+            records = loop.run_until_complete(collect())
+        finally:
+            loop.close()
+
+        self.assertEqual(len(records), len(_records))
+        self.assertEqual(records[0].email_address, 'user0@example.com')
+
+
+if __name__ == '__main__':
+    unittest.main()
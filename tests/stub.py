@@ -0,0 +1,180 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from json import dumps, loads
+from socketserver import ThreadingMixIn
+
+import threading
+import time
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.stub.connection_opened()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        try:
+            payload = loads(body.decode('UTF-8')) if body else {}
+        except ValueError:
+            payload = {}
+
+        status, content, headers = \
+            self.server.stub.dispatch(self.path, payload, self.headers)
+
+        if isinstance(content, (dict, list)):
+            content = dumps(content)
+        if isinstance(content, str):
+            content = content.encode('UTF-8')
+
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+class ConcurrencyRoute:
+    """
+    Wraps a route, holding every call for `delay` seconds first and
+    recording the highest number of calls served at once in `max_active`
+    """
+
+    def __init__(self, route, delay: float):
+        self.route = route
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, payload, headers):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.active -= 1
+        return self.route(payload, headers)
+
+
+class StubApiServer:
+    """
+    Local HTTP server answering API calls with canned responses.
+
+    A route is a callable (payload: dict, headers) -> (status, body, headers)
+    registered for the request path relative to `base_path`.
+    """
+
+    base_path = '/api/bevService'
+
+    def __init__(self, routes: dict = None):
+        self.routes = dict(_default_routes())
+        self.routes.update(routes or {})
+        self.connections = 0
+        self.calls = []
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self._server.stub = self
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return 'http://{}:{}{}'.format(host, port, self.base_path)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def dispatch(self, path: str, payload: dict, headers):
+        with self._lock:
+            self.calls.append((path, payload))
+
+        route = self.routes.get(path[len(self.base_path):])
+        if route is None:
+            return 404, {'error': 'Not found'}, None
+        return route(payload, headers)
+
+
+def _default_routes() -> dict:
+    def create(payload, headers):
+        return 200, {'response': {'id': 1}}, None
+
+    def status(payload, headers):
+        return 200, {'response': [
+            {
+                'id': request_id,
+                'date_start': 1642412278,
+                'total_emails': 1,
+                'invalid_emails': 0,
+                'processed_emails': 1,
+                'failed_emails': 0,
+                'ready': 1
+            } for request_id in payload.get('ids', [])
+        ]}, None
+
+    def records(payload, headers):
+        return 200, {'response': [
+            {
+                'emailAddress': 'foo@example.com',
+                'formatCheck': 'true',
+                'smtpCheck': 'true',
+                'dnsCheck': 'true',
+                'freeCheck': 'false',
+                'disposableCheck': 'false',
+                'catchAllCheck': 'false',
+                'mxRecords': ['mx.example.com'],
+                'result': 'ok'
+            }
+        ]}, None
+
+    def requests(payload, headers):
+        return 200, {'response': {
+            'current_page': 1,
+            'data': [],
+            'from': 0,
+            'last_page': 1,
+            'per_page': 10,
+            'to': 0,
+            'total': 0
+        }}, None
+
+    return {
+        '/request': create,
+        '/request/status': status,
+        '/request/completed': records,
+        '/request/failed': records,
+        '/request/list': requests,
+    }
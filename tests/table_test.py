@@ -0,0 +1,101 @@
+import unittest
+
+from bulkemailverifier import Record, RecordTable, ResponseRecords
+
+
+def _record(i: int) -> Record:
+    return Record({
+        'emailAddress': 'user{}@example.com'.format(i),
+        'formatCheck': 'true',
+        'smtpCheck': ['true', 'false', 'null'][i % 3],
+        'disposableCheck': 'true' if i % 4 == 0 else 'false',
+        'catchAllCheck': 'true' if i % 5 == 0 else 'false',
+        'mxRecords': ['mx.example.com'],
+        'result': ['ok', 'smtp-failed', 'unknown'][i % 3],
+    })
+
+
+class TestRecordTable(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.records = [_record(i) for i in range(1000)]
+        self.table = RecordTable(self.records)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.table), 1000)
+        self.assertEqual(self.table.record(7), self.records[7])
+        self.assertEqual(self.table[-1], self.records[-1])
+        self.assertEqual(self.table.email(3), 'user3@example.com')
+
+    def test_filters(self):
+        mask = self.table.where('disposable_check', True) \
+            | self.table.where('catch_all_check', True)
+
+        expected = [i for i in range(1000) if i % 4 == 0 or i % 5 == 0]
+
+        self.assertEqual(self.table.count(mask), len(expected))
+        self.assertEqual(list(self.table.indices(mask)), expected)
+        self.assertEqual(
+            self.table.count(~mask), 1000 - len(expected))
+        self.assertEqual(
+            self.table.count(self.table.where('free_check', None)), 1000)
+        self.assertEqual(self.table.where('result', 'missing'), 0)
+
+    def test_group_count(self):
+        self.assertEqual(self.table.group_count('smtp_check'),
+                         {True: 334, False: 333, None: 333})
+        self.assertEqual(self.table.group_count('result'),
+                         {'ok': 334, 'smtp-failed': 333, 'unknown': 333})
+
+        mask = self.table.where('disposable_check', True)
+        counts = self.table.group_count('result', mask)
+
+        self.assertEqual(sum(counts.values()), 250)
+        self.assertEqual(counts['ok'], len(range(0, 1000, 12)))
+
+    def test_many_categories(self):
+        records = [Record({'emailAddress': 'a', 'error': str(i)})
+                   for i in range(300)]
+        table = RecordTable(records)
+
+        self.assertEqual(table.count(table.where('error', '299')), 1)
+        self.assertEqual(table.record(299).error, '299')
+
+    def test_wide_categories(self):
+        count = 70000
+        table = RecordTable(
+            Record({'emailAddress': 'a', 'error': 'e{}'.format(i % count)})
+            for i in range(count + 10))
+
+        for value in ('e0', 'e255', 'e256', 'e65535', 'e65536', 'e69999'):
+            index = int(value[1:])
+            mask = table.where('error', value)
+            self.assertEqual(list(table.indices(mask)),
+                             [i for i in (index, index + count)
+                              if i < len(table)])
+            self.assertEqual(table.record(index).error, value)
+
+        # Codes sharing their low bytes with 'e65536'
+        self.assertEqual(table.count(table.where('error', 'e0')), 2)
+        self.assertEqual(table.count(table.where('error', 'e1')), 2)
+        self.assertEqual(table.group_count('error')['e69999'], 1)
+        self.assertEqual(
+            table.group_count('error', table.where('error', 'e65536')
+                              | table.where('error', 'e3')),
+            {'e3': 2, 'e65536': 1})
+        self.assertEqual(table.where('error', 'missing'), 0)
+
+    def test_response_records(self):
+        table = ResponseRecords({'response': [
+            {'emailAddress': 'foo@example.com', 'result': 'ok'}
+        ]}).to_table()
+
+        self.assertEqual(table.group_count('result'), {'ok': 1})
+
+    def test_invalid_column(self):
+        with self.assertRaises(KeyError):
+            self.table.where('email_address', 'foo')
+
+
+if __name__ == '__main__':
+    unittest.main()